@@ -3,6 +3,12 @@ ASGI config for ASSIST project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Served by an ASGI server (e.g. ``uvicorn ASSIST.asgi:application``), the
+live schedule feed at /api/live/stream/ streams Server-Sent Events from the
+event loop without holding a worker per open page. Under the WSGI
+entry point (the Procfile's gunicorn) pages poll /api/live/changes/
+instead; see hello/live.py.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
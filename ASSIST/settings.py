@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'hello.perf.PerfMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -71,6 +72,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'hello.activity.ActivityBufferMiddleware',
+    'hello.profiling.ProfileMiddleware',
 ]
 
 ROOT_URLCONF = 'ASSIST.urls'
@@ -190,4 +193,88 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER)
 BREVO_API_KEY = config('BREVO_API_KEY', default='')
+BREVO_API_URL = config('BREVO_API_URL', default='https://api.brevo.com/v3/smtp/email')
+
+# Email outbox (hello/outbox.py): views enqueue OutboundEmail rows and a worker
+# sends them in batches. AUTOSEND drains the outbox in a background thread after
+# each enqueue; disable it when running 'manage.py send_outbound_email --loop'.
+EMAIL_OUTBOX_AUTOSEND = config('EMAIL_OUTBOX_AUTOSEND', default=True, cast=bool)
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = config('EMAIL_OUTBOX_RETRY_BASE_SECONDS', default=60, cast=int)
+
+
+# Cache configuration. The default is a file cache under BASE_DIR/cache
+# (no external service) so every worker process and the management commands
+# that write (imports, seed_scale, archive_activity, the outbox worker) see
+# the same cache tag versions (hello/caching.py); with a per-process cache
+# their invalidations would never reach the web workers. With several
+# servers use django.core.cache.backends.db.DatabaseCache and a table name
+# as CACHE_LOCATION (create it with 'manage.py createcachetable').
+# django.core.cache.backends.locmem.LocMemCache only suits a single process
+# that makes every write itself.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+}
 
+# Tests run with a private local-memory cache (hello/test_runner.py)
+TEST_RUNNER = 'hello.test_runner.DiscoverRunner'
+
+# iCalendar feeds: weekly events repeat between these dates (YYYY-MM-DD).
+# When unset, the term starts with the current semester (the week of
+# January 1st or August 1st).
+CALENDAR_TERM_START = config('CALENDAR_TERM_START', default='')
+CALENDAR_TERM_END = config('CALENDAR_TERM_END', default='')
+CALENDAR_TERM_WEEKS = config('CALENDAR_TERM_WEEKS', default=18, cast=int)
+CALENDAR_FEED_CACHE_SECONDS = config('CALENDAR_FEED_CACHE_SECONDS', default=7 * 24 * 3600, cast=int)
+
+# Profile picture uploads above this many bytes are aborted while streaming.
+# Profile pictures are re-encoded to fit this many pixels per side; 64/128/256
+# thumbnails are rendered in a background thread unless ASYNC is off.
+PROFILE_PICTURE_MAX_UPLOAD_SIZE = config('PROFILE_PICTURE_MAX_UPLOAD_SIZE', default=15 * 1024 * 1024, cast=int)
+PROFILE_PICTURE_MAX_DIMENSION = config('PROFILE_PICTURE_MAX_DIMENSION', default=1024, cast=int)
+PROFILE_THUMBNAILS_ASYNC = config('PROFILE_THUMBNAILS_ASYNC', default=True, cast=bool)
+
+# Mobile /api/bootstrap/ payloads, cached per user and schedule version
+BOOTSTRAP_CACHE_SECONDS = config('BOOTSTRAP_CACHE_SECONDS', default=3600, cast=int)
+
+# Mobile delta sync (/api/sync/): tombstones for deleted rows are kept this
+# long; clients with an older token get a full sync instead. The overlap
+# re-sends rows changed just before the previous token was issued.
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=90, cast=int)
+SYNC_OVERLAP_SECONDS = config('SYNC_OVERLAP_SECONDS', default=5, cast=int)
+
+# Activity log archival (manage.py archive_activity): rows older than the
+# retention window are moved to gzip'd JSON Lines files in this directory.
+ACTIVITY_RETENTION_DAYS = config('ACTIVITY_RETENTION_DAYS', default=365, cast=int)
+ACTIVITY_ARCHIVE_DIR = config('ACTIVITY_ARCHIVE_DIR', default=str(BASE_DIR / 'archives'))
+
+# Per-view timing and query counts (hello/perf.py), shown at /admin/perf/.
+# Requests slower than the threshold are logged as warnings.
+PERF_METRICS_ENABLED = config('PERF_METRICS_ENABLED', default=True, cast=bool)
+PERF_SLOW_REQUEST_MS = config('PERF_SLOW_REQUEST_MS', default=1000, cast=int)
+
+# On-demand cProfile captures (hello/profiling.py): admins add ?profile=1 or
+# an X-Profile: 1 header; .prof files and top-N reports go to PROFILE_DIR,
+# of which the newest PROFILE_KEEP are kept.
+PROFILE_REQUESTS_ENABLED = config('PROFILE_REQUESTS_ENABLED', default=True, cast=bool)
+PROFILE_DIR = config('PROFILE_DIR', default=str(BASE_DIR / 'profiles'))
+PROFILE_TOP_N = config('PROFILE_TOP_N', default=40, cast=int)
+PROFILE_KEEP = config('PROFILE_KEEP', default=50, cast=int)
+
+# Cached dropdown lists for the admin pages and /api/reference/
+# (hello/reference.py); invalidated by tag when the rows change.
+REFERENCE_CACHE_SECONDS = config('REFERENCE_CACHE_SECONDS', default=24 * 3600, cast=int)
+
+# Live schedule change feed (hello/live.py). Under ASGI each open page holds
+# a Server-Sent Events stream that checks for changes every LIVE_POLL_SECONDS
+# and is reopened after LIVE_STREAM_SECONDS; under WSGI pages poll
+# /api/live/changes/ every LIVE_CLIENT_POLL_SECONDS instead.
+LIVE_POLL_SECONDS = config('LIVE_POLL_SECONDS', default=1.0, cast=float)
+LIVE_STREAM_SECONDS = config('LIVE_STREAM_SECONDS', default=300, cast=int)
+LIVE_CLIENT_POLL_SECONDS = config('LIVE_CLIENT_POLL_SECONDS', default=5, cast=int)
+LIVE_RETENTION_HOURS = config('LIVE_RETENTION_HOURS', default=24, cast=int)
@@ -0,0 +1,91 @@
+"""Benchmarked hot paths.
+
+Each case is ``setup(context) -> callable``: setup picks the objects to
+work on (the busiest section/faculty/room, so cost grows with the data)
+and the returned callable is what gets timed. Views are called directly
+with a RequestFactory request, which leaves middleware out of the numbers.
+"""
+from django.db.models import Count
+from django.test import RequestFactory
+
+from hello import views
+from hello.models import Faculty, Room, Schedule, Section
+
+CASES = {}
+
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def _request(context, path, **params):
+    request = RequestFactory().get(path, params)
+    request.user = context['admin']
+    request.session = {}
+    return request
+
+
+def _busiest(model, related):
+    return model.objects.annotate(n=Count(related)).order_by('-n', 'id').first()
+
+
+def _check(response):
+    if response.status_code >= 400:
+        raise AssertionError(f'{response.status_code}: {getattr(response, "content", b"")[:200]!r}')
+    if hasattr(response, 'render'):
+        response.render()
+    return response
+
+
+@case('schedule_clean')
+def schedule_clean(context):
+    """Conflict checks for a new schedule of the busiest faculty member in their busiest room"""
+    existing = Schedule.objects.filter(faculty=_busiest(Faculty, 'schedules')).select_related('course', 'section').first()
+    candidate = Schedule(
+        course=existing.course, section=existing.section, faculty=existing.faculty, room=existing.room,
+        day=existing.day, start_time='21:00', end_time='21:30',
+    )
+    return candidate.clean
+
+
+@case('available_resources')
+def available_resources(context):
+    day, start, end = Schedule.objects.values_list('day', 'start_time', 'end_time').first()
+
+    def run():
+        _check(views.get_available_resources(
+            _request(context, '/api/schedule/available-resources/', day=day, start_time=start, end_time=end)
+        ))
+    return run
+
+
+@case('section_print_grid')
+def section_print_grid(context):
+    section = _busiest(Section, 'schedules')
+    return lambda: _check(views.admin_section_schedule_print(_request(context, '/'), section.id))
+
+
+@case('faculty_print_grid')
+def faculty_print_grid(context):
+    member = _busiest(Faculty, 'schedules')
+    return lambda: _check(views.admin_faculty_schedule_print(_request(context, '/'), member.id))
+
+
+@case('room_print_grid')
+def room_print_grid(context):
+    room = _busiest(Room, 'schedules')
+    return lambda: _check(views.admin_room_schedule_print(_request(context, '/'), room.id))
+
+
+@case('section_schedule_json')
+def section_schedule_json(context):
+    section = _busiest(Section, 'schedules')
+    return lambda: _check(views.get_section_schedule(_request(context, '/'), section.id))
+
+
+@case('admin_dashboard')
+def admin_dashboard(context):
+    return lambda: _check(views.admin_dashboard(_request(context, '/admin/dashboard/')))
@@ -0,0 +1,338 @@
+"""HTTP load test against a running server (e.g. a local gunicorn).
+
+    python manage.py seed_scale --sections 400 --faculty 250 --rooms 200 \\
+        --schedules-per-section 8 --seed 3 --password Load1234!
+    python -m benchmarks.loadtest --spawn-gunicorn 4 --concurrency 16 --duration 60 \\
+        --admin-user admin --admin-password ... \\
+        --faculty-user scale3.f0@tip.edu.ph --faculty-password Load1234!
+
+Workers replay a weighted mix of endpoint calls: JWT-authenticated
+mobile APIs, schedule-data fetches, print pages and schedule writes
+(an edit that saves a schedule back unchanged, so it goes through the
+full validation and conflict checks without moving any class). The
+schedules stay as they were, but every write still logs an Activity row
+and a live-feed ScheduleChange row, and invalidates the cached
+timetables it touches; run against a scratch database (seed_scale), or
+set schedule_write to 0 in --mix against one you keep. Object ids are
+discovered from the API first. ``--mix`` takes a JSON file of
+``{"endpoint": weight}`` to change the weights (0 disables one).
+
+Reported per endpoint: requests, throughput, error rate (HTTP >= 300,
+connection errors and ``"success": false`` JSON bodies) and
+p50/p95/p99/max latency; ``--output`` also writes them as JSON.
+"""
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urljoin
+
+import requests
+
+DEFAULT_MIX = {
+    'api_my_schedule': 15,
+    'api_faculty_schedule': 10,
+    'api_bootstrap': 5,
+    'api_sync': 5,
+    'api_sections': 5,
+    'api_available_resources': 5,
+    'section_schedule_data': 20,
+    'faculty_schedule_data': 10,
+    'room_schedule_data': 10,
+    'section_print': 5,
+    'faculty_print': 3,
+    'admin_dashboard': 2,
+    'schedule_write': 5,
+}
+
+DAY_SLOTS = [(day, start, end) for day in range(6) for start, end in (('07:30', '09:00'), ('10:30', '12:00'), ('13:30', '15:00'))]
+
+
+class LoadTestError(Exception):
+    pass
+
+
+class Client:
+    """Per-worker HTTP sessions: one with the admin's login cookies for the
+    web pages, one cookie-less for the JWT mobile APIs"""
+
+    def __init__(self, base_url, cookies, token, timeout):
+        self.base_url = base_url
+        self.web = requests.Session()
+        self.web.cookies.update(cookies)
+        self.web.headers.update({'X-CSRFToken': cookies.get('csrftoken', ''), 'Referer': base_url})
+        self.api = requests.Session()
+        self.api.headers['Authorization'] = f'Bearer {token}'
+        self.timeout = timeout
+
+    def call(self, method, path, auth, data=None):
+        session = self.api if auth == 'jwt' else self.web
+        return session.request(method, urljoin(self.base_url, path), data=data,
+                               timeout=self.timeout, allow_redirects=False)
+
+
+def session_login(base_url, username, password, timeout):
+    session = requests.Session()
+    login_url = urljoin(base_url, '/admin/login/')
+    session.get(login_url, timeout=timeout)
+    response = session.post(login_url, data={
+        'username': username, 'password': password,
+        'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+    }, headers={'Referer': login_url}, timeout=timeout, allow_redirects=False)
+    if 'sessionid' not in session.cookies:
+        raise LoadTestError(f'Admin login failed for {username} (HTTP {response.status_code})')
+    return session.cookies.get_dict()
+
+
+def jwt_login(base_url, username, password, timeout):
+    response = requests.post(urljoin(base_url, '/api/auth/token/'),
+                             json={'username': username, 'password': password}, timeout=timeout)
+    if response.status_code != 200:
+        raise LoadTestError(f'JWT login failed for {username} (HTTP {response.status_code})')
+    return response.json()['access']
+
+
+def discover(client):
+    """Ids to spread the calls over"""
+    def ids(path):
+        response = client.call('GET', path, 'jwt')
+        response.raise_for_status()
+        return [row['id'] for row in response.json()['results']]
+
+    found = {
+        'sections': ids('/api/sections/?fields=id&limit=200'),
+        'faculty': ids('/api/faculty-list/?fields=id&limit=200'),
+        'rooms': ids('/api/rooms/?fields=id&limit=200'),
+        'schedules': [],
+    }
+    for section_id in found['sections'][:20]:
+        response = client.call('GET', f'/admin/section/{section_id}/schedule-data/', 'session')
+        if response.ok:
+            found['schedules'] += [row['id'] for row in response.json().get('schedules', [])]
+    missing = [key for key, values in found.items() if not values]
+    if missing:
+        raise LoadTestError(f"No {', '.join(missing)} found; seed data first (manage.py seed_scale)")
+    return found
+
+
+def request_for(name, ids, rng):
+    """``(method, path, auth)`` for one call of an endpoint"""
+    pick = lambda key: rng.choice(ids[key])  # noqa: E731
+    if name == 'api_my_schedule':
+        return 'GET', '/api/my-schedule/', 'jwt'
+    if name == 'api_faculty_schedule':
+        return 'GET', f"/api/faculty/{pick('faculty')}/schedule-data/", 'jwt'
+    if name == 'api_bootstrap':
+        return 'GET', '/api/bootstrap/', 'jwt'
+    if name == 'api_sync':
+        return 'GET', '/api/sync/', 'jwt'
+    if name == 'api_sections':
+        return 'GET', f"/api/sections/?limit=50&year={rng.randint(1, 4)}", 'jwt'
+    if name == 'api_available_resources':
+        day, start, end = rng.choice(DAY_SLOTS)
+        return 'GET', f'/api/schedule/available-resources/?day={day}&start_time={start}&end_time={end}', 'jwt'
+    if name == 'section_schedule_data':
+        return 'GET', f"/admin/section/{pick('sections')}/schedule-data/", 'session'
+    if name == 'faculty_schedule_data':
+        return 'GET', f"/admin/faculty/{pick('faculty')}/schedule-data/", 'session'
+    if name == 'room_schedule_data':
+        return 'GET', f"/admin/room/{pick('rooms')}/schedule-data/", 'session'
+    if name == 'section_print':
+        return 'GET', f"/admin/section/{pick('sections')}/schedule/print/", 'session'
+    if name == 'faculty_print':
+        return 'GET', f"/admin/faculty/{pick('faculty')}/schedule/print/", 'session'
+    if name == 'admin_dashboard':
+        return 'GET', '/admin/dashboard/', 'session'
+    if name == 'schedule_write':
+        return 'WRITE', f"/admin/schedule/edit/{pick('schedules')}/", 'session'
+    raise LoadTestError(f'Unknown endpoint {name}')
+
+
+def is_error(response):
+    # Redirects are not followed: for these endpoints they mean a lost login
+    if response.status_code >= 300:
+        return True
+    if response.headers.get('Content-Type', '').startswith('application/json'):
+        try:
+            body = response.json()
+        except ValueError:
+            return True
+        return isinstance(body, dict) and body.get('success') is False
+    return False
+
+
+def perform(client, method, path, auth):
+    if method != 'WRITE':
+        return client.call(method, path, auth)
+    # Save the schedule back unchanged: a real write through full validation
+    # (it still adds Activity and ScheduleChange rows, see module docstring)
+    current = client.call('GET', path, 'session')
+    if not current.ok:
+        return current
+    return client.call('POST', path, 'session', data=current.json())
+
+
+def worker(client, mix, ids, deadline, remaining, results, lock, seed):
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    while time.monotonic() < deadline:
+        if remaining is not None:
+            with lock:
+                if remaining[0] <= 0:
+                    return
+                remaining[0] -= 1
+        name = rng.choices(names, weights)[0]
+        method, path, auth = request_for(name, ids, rng)
+        start = time.perf_counter()
+        try:
+            error = is_error(perform(client, method, path, auth))
+        except requests.RequestException:
+            error = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            results.setdefault(name, []).append((elapsed, error))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results, wall_seconds):
+    def stats(samples):
+        latencies = sorted(latency for latency, _ in samples)
+        errors = sum(1 for _, error in samples if error)
+        return {
+            'requests': len(samples),
+            'throughput_rps': round(len(samples) / wall_seconds, 2),
+            'errors': errors,
+            'error_rate': round(errors / len(samples), 4) if samples else 0,
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+            'max_ms': round(latencies[-1] * 1000, 1),
+        }
+
+    endpoints = {name: stats(samples) for name, samples in sorted(results.items())}
+    everything = [sample for samples in results.values() for sample in samples]
+    return {'wall_seconds': round(wall_seconds, 2), 'total': stats(everything) if everything else None,
+            'endpoints': endpoints}
+
+
+def print_report(summary):
+    header = f"{'endpoint':<26}{'reqs':>7}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print('-' * len(header))
+    rows = list(summary['endpoints'].items())
+    if summary['total']:
+        rows.append(('TOTAL', summary['total']))
+    for name, s in rows:
+        print(f"{name:<26}{s['requests']:>7}{s['throughput_rps']:>9.1f}{s['error_rate'] * 100:>7.1f}"
+              f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}{s['max_ms']:>9.1f}")
+    print(f"(latencies in ms over {summary['wall_seconds']}s)")
+
+
+def spawn_gunicorn(base_url, workers):
+    match = re.match(r'https?://([^/:]+):?(\d+)?', base_url)
+    bind = f'{match.group(1)}:{match.group(2) or 80}'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'ASSIST.wsgi:application', '--bind', bind,
+         '--workers', str(workers), '--log-level', 'warning'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    for _ in range(100):
+        try:
+            requests.get(urljoin(base_url, '/admin/login/'), timeout=1)
+            return process
+        except requests.RequestException:
+            if process.poll() is not None:
+                raise LoadTestError('gunicorn exited during startup')
+            time.sleep(0.2)
+    process.terminate()
+    raise LoadTestError('gunicorn did not start within 20s')
+
+
+def run(args):
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        with open(args.mix) as fh:
+            overrides = json.load(fh)
+        unknown = set(overrides) - set(DEFAULT_MIX)
+        if unknown:
+            raise LoadTestError(f"Unknown endpoint(s) in mix: {', '.join(sorted(unknown))}")
+        mix.update(overrides)
+    mix = {name: weight for name, weight in mix.items() if weight > 0}
+    if not mix:
+        raise LoadTestError('The mix has no endpoints with a positive weight')
+
+    cookies = session_login(args.base_url, args.admin_user, args.admin_password, args.timeout)
+    token = jwt_login(args.base_url, args.faculty_user or args.admin_user,
+                      args.faculty_password or args.admin_password, args.timeout)
+    ids = discover(Client(args.base_url, cookies, token, args.timeout))
+
+    results, lock = {}, threading.Lock()
+    remaining = [args.requests] if args.requests else None
+    start = time.monotonic()
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=worker, daemon=True, args=(
+            Client(args.base_url, cookies, token, args.timeout), mix, ids, deadline, remaining, results, lock,
+            args.seed + i,
+        ))
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = summarize(results, time.monotonic() - start)
+    summary['config'] = {'base_url': args.base_url, 'concurrency': args.concurrency, 'mix': mix}
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent workers (default: 8)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run (default: 30)')
+    parser.add_argument('--requests', type=int, help='Stop after this many requests instead')
+    parser.add_argument('--admin-user', required=True, help='Admin login for the web pages')
+    parser.add_argument('--admin-password', required=True)
+    parser.add_argument('--faculty-user', help='Login for the JWT mobile APIs (default: the admin)')
+    parser.add_argument('--faculty-password')
+    parser.add_argument('--mix', help='JSON file of {"endpoint": weight} overrides')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the request sequence')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+    parser.add_argument('--spawn-gunicorn', type=int, metavar='WORKERS',
+                        help='Start gunicorn with this many workers on --base-url for the run')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+
+    server = spawn_gunicorn(args.base_url, args.spawn_gunicorn) if args.spawn_gunicorn else None
+    try:
+        summary = run(args)
+    except LoadTestError as e:
+        sys.exit(f'error: {e}')
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    print_report(summary)
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(summary, fh, indent=2)
+        print(f'Wrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Benchmark runner for the scheduling hot paths.
+
+    python -m benchmarks.run                         # small and medium scales
+    python -m benchmarks.run --scales large --rounds 5 --output bench.json
+    python -m benchmarks.run --compare before.json   # print ratios against an earlier run
+
+Each scale gets a fresh SQLite database (a temp file) filled by
+``hello.seeding.seed_scale``; every case in ``benchmarks.cases`` is then
+warmed up once and timed for ``--rounds`` rounds, with the cache cleared
+before each round. Results (min/median/mean/max seconds and queries per
+call) are written as JSON together with the git commit, so runs from
+different commits can be compared with ``--compare``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCALES = {
+    'small': {'sections': 40, 'faculty': 30, 'rooms': 25, 'schedules_per_section': 6},
+    'medium': {'sections': 400, 'faculty': 250, 'rooms': 200, 'schedules_per_section': 8},
+    'large': {'sections': 4000, 'faculty': 2000, 'rooms': 2000, 'schedules_per_section': 25},
+}
+
+
+def setup_django():
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    django.setup()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def use_database(path):
+    from django.core.management import call_command
+    from django.db import connections
+    connection = connections['default']
+    connection.close()
+    connection.settings_dict['NAME'] = path
+    call_command('migrate', verbosity=0, interactive=False)
+
+
+def time_case(fn, rounds):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        fn()  # warm-up, also counts the queries
+    timings = []
+    for _ in range(rounds):
+        cache.clear()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {
+        'rounds': rounds,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings),
+        'queries': len(queries),
+    }
+
+
+def run_scale(name, params, rounds, selected, seed):
+    from django.contrib.auth.models import User
+    from hello import seeding
+    from benchmarks.cases import CASES
+
+    fd, path = tempfile.mkstemp(prefix=f'bench-{name}-', suffix='.sqlite3')
+    os.close(fd)
+    try:
+        use_database(path)
+        started = time.perf_counter()
+        counts = seeding.seed_scale(seed=seed, **params)
+        seeded_in = time.perf_counter() - started
+        context = {'admin': User.objects.create_superuser('bench', 'bench@tip.edu.ph', 'Bench1234!')}
+
+        results = {}
+        for case_name, setup in CASES.items():
+            if selected and case_name not in selected:
+                continue
+            results[case_name] = time_case(setup(context), rounds)
+            print(f"  {case_name:<24} median {results[case_name]['median'] * 1000:9.2f} ms"
+                  f"  {results[case_name]['queries']:4d} queries", flush=True)
+        return {'dataset': counts, 'seed_seconds': round(seeded_in, 2), 'cases': results}
+    finally:
+        from django.db import connections
+        connections['default'].close()
+        os.remove(path)
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    print(f"\nMedian vs {baseline_path} ({baseline['meta'].get('commit')}):")
+    for scale, data in current['scales'].items():
+        previous = baseline['scales'].get(scale, {}).get('cases', {})
+        for case_name, result in data['cases'].items():
+            if case_name not in previous:
+                continue
+            ratio = result['median'] / previous[case_name]['median'] if previous[case_name]['median'] else float('inf')
+            query_delta = result['queries'] - previous[case_name]['queries']
+            print(f"  {scale:<7} {case_name:<24} x{ratio:5.2f}  queries {query_delta:+d}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"Comma-separated scales: {', '.join(SCALES)} (default: small,medium)")
+    parser.add_argument('--cases', default='', help='Comma-separated case names (default: all)')
+    parser.add_argument('--rounds', type=int, default=10, help='Timed rounds per case (default: 10)')
+    parser.add_argument('--seed', type=int, default=1, help='Dataset seed (default: 1)')
+    parser.add_argument('--output', default='benchmark-results.json', help='JSON results file')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"unknown scale(s): {', '.join(unknown)}")
+    if args.rounds < 1:
+        parser.error('--rounds must be at least 1')
+
+    setup_django()
+    import django
+    from benchmarks.cases import CASES
+    selected = {c.strip() for c in args.cases.split(',') if c.strip()}
+    if selected - set(CASES):
+        parser.error(f"unknown case(s): {', '.join(sorted(selected - set(CASES)))}")
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'rounds': args.rounds,
+            'seed': args.seed,
+        },
+        'scales': {},
+    }
+    for scale in scales:
+        print(f"{scale}: {SCALES[scale]}", flush=True)
+        report['scales'][scale] = run_scale(scale, SCALES[scale], args.rounds, selected, args.seed)
+
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2)
+    print(f'\nWrote {args.output}')
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == '__main__':
+    main()
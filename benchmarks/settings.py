@@ -0,0 +1,16 @@
+"""Project settings for benchmark runs: a throwaway SQLite file per scale
+(set by ``benchmarks.run``) and no request instrumentation or logging noise."""
+from ASSIST.settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+DEBUG = False
+PERF_METRICS_ENABLED = False
+PROFILE_THUMBNAILS_ASYNC = False
+EMAIL_OUTBOX_AUTOSEND = False
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmarks'}}
@@ -0,0 +1,264 @@
+"""Activity log queries and archival.
+
+Day filters use half-open ``[midnight, next midnight)`` ranges on the raw
+``timestamp`` column instead of ``timestamp__date``, which wraps the column
+in a date cast and defeats the ``(timestamp, id)`` index. With that index
+the dashboard reads only the rows it shows, however long the history is.
+
+``filter_activities`` backs ``/api/activity/``: equality filters and the
+date range all keep the newest-first ``(timestamp, id)`` order servable
+from an index, so a keyset page deep in the history costs the same as
+the first one.
+
+``record`` replaces one ``INSERT`` per logged mutation: inside a request
+(see ``ActivityBufferMiddleware``) entries are buffered and written with a
+single ``bulk_create`` when the response is ready. An entry only enters the
+buffer once the transaction it was logged in commits, so rolled-back
+changes leave no log. ``summarized`` folds the per-item entries of a bulk
+operation into one ("Generated 42 schedules for CPE31S1").
+
+``archive_rows`` moves rows older than a cutoff into a gzip'd JSON Lines
+file (``manage.py archive_activity``) so the table stays small.
+"""
+import contextvars
+import gzip
+import json
+import logging
+import os
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caching import bump_tags
+from .models import Activity
+from .pagination import ListQueryError, keyset_filter
+
+logger = logging.getLogger(__name__)
+
+_buffer = contextvars.ContextVar('activity_buffer', default=None)
+_summaries = contextvars.ContextVar('activity_summaries', default=())
+
+ARCHIVE_FIELDS = ('id', 'timestamp', 'user_id', 'user__username', 'action', 'entity_type', 'entity_name', 'message')
+
+
+def _write(entries):
+    try:
+        Activity.objects.bulk_create(entries)
+        bump_tags('activity')
+    except Exception:
+        # The logged changes are already committed; do not fail the response
+        logger.exception('Writing %d activity entries failed', len(entries))
+
+
+def record(user, action, entity_type, entity_name, message):
+    """Log an activity once the current transaction commits"""
+    for summary in reversed(_summaries.get()):
+        if summary.matches(action, entity_type):
+            summary.count += 1
+            return
+    entry = Activity(user=user, action=action, entity_type=entity_type,
+                     entity_name=entity_name, message=message)
+    entries = _buffer.get()
+    if entries is None:
+        transaction.on_commit(lambda: _write([entry]))
+    else:
+        transaction.on_commit(lambda: entries.append(entry))
+        entries.pending = True
+
+
+class _Entries(list):
+    pending = False
+
+
+class _Summary:
+    def __init__(self, action, entity_type, entity_name, message):
+        self.action = action
+        self.entity_type = entity_type
+        self.entity_name = entity_name
+        self.message = message
+        self.count = 0
+
+    def matches(self, action, entity_type):
+        return action == self.action and entity_type == self.entity_type
+
+
+@contextmanager
+def summarized(user, action, entity_type, entity_name, message):
+    """Collapse the entries of a bulk operation into one.
+
+    ``record`` calls for the same action and entity type inside the block
+    are only counted; on exit a single entry is logged with ``{count}`` in
+    ``entity_name`` and ``message`` replaced by the count. Callers that
+    know the count from a bulk write add to ``summary.count`` directly,
+    and may extend ``summary.message`` once they know the outcome. Nothing
+    is logged when the count is zero or the block raises.
+    """
+    summary = _Summary(action, entity_type, entity_name, message)
+    token = _summaries.set(_summaries.get() + (summary,))
+    try:
+        yield summary
+    finally:
+        _summaries.reset(token)
+    if summary.count:
+        count = str(summary.count)
+        record(user, action, entity_type,
+               summary.entity_name.replace('{count}', count), summary.message.replace('{count}', count))
+
+
+@contextmanager
+def buffered():
+    """Buffer activity entries logged in the block and write them in one query"""
+    if _buffer.get() is not None:
+        # Nested: the outer buffer writes them
+        yield
+        return
+    entries = _Entries()
+    token = _buffer.set(entries)
+    try:
+        yield
+    finally:
+        _buffer.reset(token)
+        if entries.pending:
+            # Runs after the entries' own on_commit callbacks, so rolled-back
+            # ones never reach the list
+            transaction.on_commit(lambda: entries and _write(entries))
+
+
+class ActivityBufferMiddleware:
+    """Write each request's activity log in a single ``bulk_create``"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
+
+
+def day_range(day):
+    """Aware ``(start, end)`` datetimes bounding a local calendar day"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+def activities_on(day, limit=10):
+    """Latest activities of one local day, newest first"""
+    start, end = day_range(day)
+    return (Activity.objects.filter(timestamp__gte=start, timestamp__lt=end)
+            .order_by('-timestamp', '-id')[:limit])
+
+
+def recent_activity_groups(limit=10, today=None):
+    """``{'Today': [...], 'Yesterday': [...]}`` for the dashboard, skipping empty days"""
+    today = today or timezone.localdate()
+    groups = {}
+    for label, day in (('Today', today), ('Yesterday', today - timedelta(days=1))):
+        activities = list(activities_on(day, limit))
+        if activities:
+            groups[label] = activities
+    return groups
+
+
+def _parse_day(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ListQueryError(f'{name} must be a date (YYYY-MM-DD)')
+
+
+def filter_activities(params):
+    """Activities matching the ``/api/activity/`` query parameters.
+
+    ``user`` (id), ``entity_type`` and ``action`` match exactly; ``from`` and
+    ``to`` are inclusive local dates; ``q`` searches entity names and messages.
+    Raises ListQueryError for invalid values.
+    """
+    activities = Activity.objects.all()
+
+    user = params.get('user')
+    if user:
+        if not user.isdigit():
+            raise ListQueryError('user must be a user id')
+        activities = activities.filter(user_id=int(user))
+
+    for name, choices in (('entity_type', Activity.ENTITY_CHOICES), ('action', Activity.ACTION_CHOICES)):
+        value = params.get(name)
+        if value:
+            allowed = [key for key, _ in choices]
+            if value not in allowed:
+                raise ListQueryError(f"{name} must be one of: {', '.join(allowed)}")
+            activities = activities.filter(**{name: value})
+
+    start, end = _parse_day(params, 'from'), _parse_day(params, 'to')
+    if start and end and start > end:
+        raise ListQueryError('from must not be after to')
+    if start:
+        activities = activities.filter(timestamp__gte=day_range(start)[0])
+    if end:
+        activities = activities.filter(timestamp__lt=day_range(end)[1])
+
+    search = (params.get('q') or '').strip()
+    if search:
+        activities = activities.filter(Q(entity_name__icontains=search) | Q(message__icontains=search))
+    return activities
+
+
+def _archive_record(row):
+    record = dict(row)
+    record['timestamp'] = row['timestamp'].isoformat()
+    record['username'] = record.pop('user__username')
+    return record
+
+
+def archive_rows(cutoff, directory, batch_size=1000, dry_run=False):
+    """Move activities older than ``cutoff`` into ``directory`` as JSON Lines + gzip.
+
+    Rows are read in ``(timestamp, id)`` keyset batches and the file is
+    completed (written under a temporary name, then renamed) before any
+    row is deleted, so an interrupted run never loses history. Returns
+    ``(count, path)``; ``path`` is None when nothing was written (no old
+    rows, or ``dry_run``, which only counts them).
+    """
+    old = Activity.objects.filter(timestamp__lt=cutoff)
+    if dry_run:
+        return old.count(), None
+    if not old.exists():
+        return 0, None
+
+    os.makedirs(directory, exist_ok=True)
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+    path = os.path.join(directory, f'activity-before-{cutoff:%Y%m%d}-{stamp}.jsonl.gz')
+    partial = path + '.partial'
+
+    count = 0
+    last = None
+    with gzip.open(partial, 'wt', encoding='utf-8') as fh:
+        while True:
+            batch = old.order_by('timestamp', 'id')
+            if last is not None:
+                batch = batch.filter(keyset_filter(('timestamp', 'id'), last))
+            rows = list(batch.values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                break
+            for row in rows:
+                fh.write(json.dumps(_archive_record(row), ensure_ascii=False) + '\n')
+            count += len(rows)
+            last = (rows[-1]['timestamp'], rows[-1]['id'])
+
+    os.replace(partial, path)
+
+    # Delete in batches to keep each statement (and its locks) short
+    while True:
+        ids = list(old.order_by('timestamp', 'id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        Activity.objects.filter(id__in=ids).delete()
+        bump_tags('activity')
+    return count, path
@@ -1,5 +1,12 @@
 # hello/admin.py
 from django.contrib import admin
-from .models import Faculty
+from .models import Faculty, OutboundEmail
 
-admin.site.register(Faculty)
\ No newline at end of file
+admin.site.register(Faculty)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipients')
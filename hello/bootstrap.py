@@ -0,0 +1,121 @@
+"""Composite mobile bootstrap payload (``GET /api/bootstrap/``).
+
+Bundles what the app used to fetch in separate calls on login: the user's
+faculty profile (``get_user_faculty_data``), own schedule and
+specializations (``api_my_schedule``), dashboard stats and curricula. It is
+built with a fixed number of ``values()`` queries, independent of how many
+schedules or specializations the user has, and cached per user under the
+``all-schedules`` tag.
+"""
+import hashlib
+
+from django.core.files.storage import default_storage
+from django.db.models import F
+
+from . import calendar_feeds, images
+from .caching import ALL_SCHEDULES, tagged_key
+from .models import Curriculum, Faculty, Schedule, Section
+
+
+def cache_key(request):
+    """Cache key for one user's payload at the current ``all-schedules`` version.
+
+    The host is part of the key because URLs in the payload are absolute;
+    the user's own name and email are hashed in so edits to the account
+    (not a scheduling model) still produce a fresh payload.
+    """
+    user = request.user
+    ident = f'{request.get_host()}|{user.first_name}|{user.last_name}|{user.email}'
+    digest = hashlib.sha1(ident.encode()).hexdigest()[:16]
+    return tagged_key('bootstrap', [ALL_SCHEDULES], user.pk, digest)
+
+
+def _profile(request, faculty):
+    if faculty is None:
+        user = request.user
+        return {
+            'faculty_id': None,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+            'gender': '',
+            'profile_picture_url': None,
+            'profile_picture_variants': None,
+            'total_units': 0,
+            'calendar_url': None,
+        }
+    picture = faculty['profile_picture']
+    return {
+        'faculty_id': faculty['id'],
+        'first_name': faculty['first_name'],
+        'last_name': faculty['last_name'],
+        'email': faculty['email'],
+        'gender': faculty['gender'] or '',
+        'profile_picture_url': request.build_absolute_uri(default_storage.url(picture)) if picture else None,
+        'profile_picture_variants': images.variant_urls(request, faculty['profile_picture_variants']),
+        'total_units': faculty['units_total'],
+        'calendar_url': calendar_feeds.feed_url(request, 'faculty', faculty['id']),
+    }
+
+
+def build_payload(request):
+    """Assemble the bootstrap response: six queries with a faculty profile, four without"""
+    faculty = (
+        Faculty.objects.filter(user=request.user)
+        .annotate(units_total=Faculty.total_units_annotation())
+        .values('id', 'first_name', 'last_name', 'email', 'gender', 'profile_picture', 'profile_picture_variants', 'units_total')
+        .first()
+    )
+
+    schedules = []
+    specializations = []
+    if faculty is not None:
+        rows = (
+            Schedule.objects.filter(faculty_id=faculty['id'])
+            .order_by('day', 'start_time')
+            .values_list(
+                'day', 'start_time', 'end_time', 'duration',
+                'course__course_code', 'course__descriptive_title', 'course__color',
+                'room__name', 'section__name',
+            )
+        )
+        schedules = [
+            {
+                'day': day,
+                'start_time': str(start_time),
+                'end_time': str(end_time),
+                'duration': duration,
+                'course_code': course_code,
+                'course_title': course_title,
+                'course_color': course_color,
+                'room': room_name or 'TBA',
+                'section_name': section_name,
+            }
+            for (day, start_time, end_time, duration, course_code, course_title,
+                 course_color, room_name, section_name) in rows
+        ]
+        specializations = list(
+            Faculty.specialization.through.objects.filter(faculty_id=faculty['id'])
+            .order_by('course__year_level', 'course__semester', 'course__course_code')
+            .values(
+                course_code=F('course__course_code'),
+                descriptive_title=F('course__descriptive_title'),
+                color=F('course__color'),
+            )
+        )
+
+    stats = {
+        'faculty_count': Faculty.objects.count(),
+        'section_count': Section.objects.count(),
+    }
+
+    curriculums = list(Curriculum.objects.order_by('-year').values('id', 'name', 'year'))
+
+    return {
+        'profile': _profile(request, faculty),
+        'schedules': schedules,
+        'specializations': specializations,
+        'total_units': faculty['units_total'] if faculty else 0,
+        'stats': stats,
+        'curriculums': curriculums,
+    }
@@ -0,0 +1,131 @@
+"""Tag-versioned caching for scheduling data.
+
+Every cached value is stored under a key that embeds the current version
+of each tag it depends on, for example ``faculty:12``, ``room:3``,
+``section:7``, ``curriculum:2`` or ``all-schedules``. Tag versions are
+random tokens kept in the cache itself; ``bump_tags()`` replaces them, so
+every key built from the old versions stops matching and simply expires.
+Nothing is deleted and the database is never touched.
+
+``hello/signals.py`` bumps the tags of whatever a saved or deleted row
+shows up in (see ``signals.tags_for``); a delete and its cascade bump
+theirs together once it commits. Code that writes with
+``bulk_create()`` or ``update()`` sends no signals and bumps tags itself.
+
+The tag versions have to be visible to every process, including the
+management commands that write, which is why the default backend is the
+file cache (settings.py); use the database cache across several servers.
+
+``get_or_build()`` counts hits and misses per cache name in process
+memory; ``stats()`` reports them with tag bump counts per tag kind and is
+shown on ``/admin/perf/``.
+"""
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+ALL_SCHEDULES = 'all-schedules'
+TAG_KEY_PREFIX = 'hello:tag:'
+
+_MISSING = object()
+_lock = threading.Lock()
+_hits = {}
+_misses = {}
+_bumps = {}
+_started = timezone.now()
+
+
+def tag(kind, pk):
+    return f'{kind}:{pk}'
+
+
+def tag_versions(tags):
+    """Current version of each tag, creating versions for new tags"""
+    keys = {TAG_KEY_PREFIX + t: t for t in tags}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        cache.add(key, uuid.uuid4().hex, None)
+        found[key] = cache.get(key)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def bump_tags(*tags):
+    """Invalidate every cache entry built with any of ``tags``"""
+    if not tags:
+        return
+    cache.set_many({TAG_KEY_PREFIX + t: uuid.uuid4().hex for t in tags}, None)
+    with _lock:
+        for t in tags:
+            kind = t.split(':', 1)[0]
+            _bumps[kind] = _bumps.get(kind, 0) + 1
+
+
+def schedule_tags(rows):
+    """Tags for schedules given as ``(section_id, faculty_id, room_id)`` rows"""
+    tags = {ALL_SCHEDULES}
+    for section_id, faculty_id, room_id in rows:
+        tags.add(tag('section', section_id))
+        if faculty_id:
+            tags.add(tag('faculty', faculty_id))
+        if room_id:
+            tags.add(tag('room', room_id))
+    return tags
+
+
+def tagged_key(name, tags, *parts):
+    """Cache key for ``name`` that changes whenever one of ``tags`` is bumped"""
+    versions = tag_versions(tags)
+    ident = '|'.join([*map(str, parts), *(f'{t}={versions[t]}' for t in sorted(tags))])
+    return f'hello:{name}:{hashlib.sha1(ident.encode()).hexdigest()}'
+
+
+def get_or_build(name, key, build, timeout):
+    """Return the cached value for ``key``, calling ``build()`` to fill it on a miss"""
+    value = cache.get(key, _MISSING)
+    hit = value is not _MISSING
+    with _lock:
+        counter = _hits if hit else _misses
+        counter[name] = counter.get(name, 0) + 1
+    if not hit:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+def get_schedule_version():
+    """Version of the ``all-schedules`` tag, for keys built by hand"""
+    return tag_versions([ALL_SCHEDULES])[ALL_SCHEDULES]
+
+
+def bump_schedule_version():
+    """Invalidate every cache entry that depends on ``all-schedules``"""
+    bump_tags(ALL_SCHEDULES)
+
+
+def stats():
+    """Hit rates per cache name and bumps per tag kind since start (or reset)"""
+    with _lock:
+        names = sorted(_hits.keys() | _misses.keys())
+        caches = {}
+        for name in names:
+            hits, misses = _hits.get(name, 0), _misses.get(name, 0)
+            caches[name] = {'hits': hits, 'misses': misses, 'hit_rate': round(hits / (hits + misses), 3)}
+        return {
+            'since': _started.isoformat(),
+            'backend': settings.CACHES['default']['BACKEND'],
+            'caches': caches,
+            'tag_bumps': dict(sorted(_bumps.items())),
+        }
+
+
+def reset_stats():
+    global _started
+    with _lock:
+        _hits.clear()
+        _misses.clear()
+        _bumps.clear()
+        _started = timezone.now()
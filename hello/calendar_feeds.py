@@ -0,0 +1,215 @@
+"""iCalendar (.ics) feeds for faculty, room and section schedules.
+
+Feed URLs carry a signed token (``faculty:12:<signature>``) so they can be
+subscribed to from a phone calendar without logging in. Rendered feeds are
+cached under the tag of the faculty, room or section (``faculty:12``), and
+the ETag is derived from the same key, so repeated polls are answered from
+the cache without a database query and edits elsewhere leave them cached.
+"""
+import hashlib
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
+from django.utils import timezone
+
+from .caching import tag, tagged_key
+from .models import Faculty, Room, Schedule, Section
+
+FEED_KINDS = {
+    'faculty': Faculty,
+    'room': Room,
+    'section': Section,
+}
+
+_signer = signing.Signer(salt='hello.calendar-feed')
+
+
+def make_feed_token(kind, obj_id):
+    """Return the signed token identifying a feed"""
+    if kind not in FEED_KINDS:
+        raise ValueError(f'Unknown calendar feed kind: {kind}')
+    return _signer.sign(f'{kind}:{obj_id}')
+
+
+def parse_feed_token(token):
+    """Return ``(kind, id)`` for a valid token, or None if it was tampered with"""
+    try:
+        value = _signer.unsign(token)
+        kind, obj_id = value.split(':')
+        obj_id = int(obj_id)
+    except (signing.BadSignature, ValueError):
+        return None
+    if kind not in FEED_KINDS:
+        return None
+    return kind, obj_id
+
+
+def feed_url(request, kind, obj_id):
+    """Absolute subscription URL for a feed"""
+    path = reverse('calendar_feed', kwargs={'token': make_feed_token(kind, obj_id)})
+    return request.build_absolute_uri(path)
+
+
+# The 2nd semester starts in January, the 1st in August; used when no term
+# start is configured
+SEMESTER_START_MONTHS = (1, 8)
+
+
+def semester_start(today):
+    """Monday of the week the current semester started in"""
+    month = max(m for m in SEMESTER_START_MONTHS if m <= today.month)
+    first = date(today.year, month, 1)
+    return first - timedelta(days=first.weekday())
+
+
+def term_range(today=None):
+    """Return ``(start, end)`` dates of the configured term.
+
+    Without CALENDAR_TERM_START the term starts with the current semester,
+    so the feed window (and its cache key) stays put for the whole semester
+    and past classes stay on subscribed calendars.
+    """
+    today = today or timezone.localdate()
+    start = _parse_date(settings.CALENDAR_TERM_START)
+    if start is None:
+        start = semester_start(today)
+    end = _parse_date(settings.CALENDAR_TERM_END)
+    if end is None or end < start:
+        end = start + timedelta(weeks=settings.CALENDAR_TERM_WEEKS)
+    return start, end
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def feed_cache_key(kind, obj_id, start, end):
+    return tagged_key('ics', [tag(kind, obj_id)], kind, obj_id, start.isoformat(), end.isoformat())
+
+
+def feed_etag(cache_key):
+    return '"' + hashlib.sha1(cache_key.encode()).hexdigest() + '"'
+
+
+def _escape(text):
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;')
+            .replace(',', '\\,').replace('\n', '\\n'))
+
+
+def _fold(line):
+    """Fold a content line to 75 octets as required by RFC 5545"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        # Do not split a multi-byte UTF-8 character
+        while cut > 0 and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _parse_hhmm(value):
+    h, m = map(int, str(value).split(':')[:2])
+    return time(h, m)
+
+
+def _feed_rows(kind, obj_id):
+    """Schedule rows for a feed as plain tuples (no model instances)"""
+    qs = Schedule.objects.filter(**{f'{kind}_id': obj_id}).order_by('day', 'start_time')
+    return qs.values_list(
+        'id', 'day', 'start_time', 'end_time',
+        'course__course_code', 'course__descriptive_title',
+        'section__name', 'room__name',
+        'faculty__first_name', 'faculty__last_name',
+    )
+
+
+def _feed_name(kind, obj_id):
+    model = FEED_KINDS[kind]
+    obj = model.objects.filter(id=obj_id).first()
+    if obj is None:
+        return None
+    if kind == 'faculty':
+        return f'{obj.first_name} {obj.last_name} - Teaching Schedule'
+    if kind == 'room':
+        return f'{obj.name} - Room Schedule'
+    return f'{obj.name} - Class Schedule'
+
+
+def build_feed(kind, obj_id, start, end):
+    """Render the .ics body for one faculty/room/section, or None if missing"""
+    name = _feed_name(kind, obj_id)
+    if name is None:
+        return None
+
+    tz_name = settings.TIME_ZONE
+    tz = ZoneInfo(tz_name)
+    offset = datetime.combine(start, time(12, 0), tzinfo=tz).utcoffset()
+    offset_minutes = int(offset.total_seconds() // 60)
+    sign = '+' if offset_minutes >= 0 else '-'
+    offset_str = f'{sign}{abs(offset_minutes) // 60:02d}{abs(offset_minutes) % 60:02d}'
+
+    until = datetime.combine(end, time(23, 59, 59), tzinfo=tz).astimezone(ZoneInfo('UTC'))
+    until_str = until.strftime('%Y%m%dT%H%M%SZ')
+    stamp = datetime.now(ZoneInfo('UTC')).strftime('%Y%m%dT%H%M%SZ')
+    rrule_days = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA']
+
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//ASSIST//Auto-Scheduling//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{_escape(name)}',
+        f'X-WR-TIMEZONE:{tz_name}',
+        'BEGIN:VTIMEZONE',
+        f'TZID:{tz_name}',
+        'BEGIN:STANDARD',
+        'DTSTART:19700101T000000',
+        f'TZOFFSETFROM:{offset_str}',
+        f'TZOFFSETTO:{offset_str}',
+        'END:STANDARD',
+        'END:VTIMEZONE',
+    ]
+
+    for (schedule_id, day, start_time, end_time, course_code, course_title,
+         section_name, room_name, faculty_first, faculty_last) in _feed_rows(kind, obj_id).iterator():
+        try:
+            starts_at = _parse_hhmm(start_time)
+            ends_at = _parse_hhmm(end_time)
+        except (TypeError, ValueError):
+            continue
+        first_day = start + timedelta(days=(day - start.weekday()) % 7)
+        if first_day > end:
+            continue
+
+        faculty_name = f'{faculty_first} {faculty_last}' if faculty_first or faculty_last else 'TBA'
+        description = f'{course_title}\nSection: {section_name}\nFaculty: {faculty_name}'
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:schedule-{schedule_id}@assist',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART;TZID={tz_name}:{datetime.combine(first_day, starts_at).strftime("%Y%m%dT%H%M%S")}',
+            f'DTEND;TZID={tz_name}:{datetime.combine(first_day, ends_at).strftime("%Y%m%dT%H%M%S")}',
+            f'RRULE:FREQ=WEEKLY;BYDAY={rrule_days[day]};UNTIL={until_str}',
+            f'SUMMARY:{_escape(f"{course_code} - {section_name}")}',
+            f'LOCATION:{_escape(room_name or "TBA")}',
+            f'DESCRIPTION:{_escape(description)}',
+            'END:VEVENT',
+        ])
+
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
@@ -0,0 +1,148 @@
+"""Compact columnar encoding of schedule blocks (``?format=compact``).
+
+The regular schedule JSON repeats every key and the course title, color,
+section and room names on every block. The compact form sends each course,
+section, room and faculty member once in a lookup table and the blocks as
+parallel integer arrays indexing into those tables::
+
+    {"format": "compact",
+     "tables": {"courses": {"id": [...], "code": [...], "title": [...], ...},
+                "sections": {"id": [...], "name": [...]}, ...},
+     "blocks": {"id": [...], "day": [...], "start_minute": [...],
+                "end_minute": [...], "course_idx": [...], "section_idx": [...],
+                "room_idx": [...], "faculty_idx": [...]}}
+
+A missing room or faculty is index ``-1``. The blocks are read with one
+``values_list()`` query. Add ``&encoding=msgpack`` (or send
+``Accept: application/msgpack``) for a MessagePack body; that needs the
+optional ``msgpack`` package.
+"""
+from django.http import HttpResponse, JsonResponse
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+
+try:
+    import msgpack
+except ImportError:  # optional; MessagePack requests get a 406
+    msgpack = None
+
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+
+BLOCK_COLUMNS = (
+    'id', 'day', 'start_minute', 'end_minute',
+    'course_idx', 'section_idx', 'room_idx', 'faculty_idx',
+)
+
+TABLE_COLUMNS = {
+    'courses': ('id', 'code', 'title', 'color', 'lecture_hours', 'laboratory_hours', 'credit_units'),
+    'sections': ('id', 'name'),
+    'rooms': ('id', 'name'),
+    'faculty': ('id', 'name'),
+}
+
+
+class CompactEncodingError(Exception):
+    """MessagePack was requested but the msgpack package is not installed"""
+
+
+def requested(request):
+    return request.GET.get('format') == 'compact'
+
+
+def wants_msgpack(request):
+    return (request.GET.get('encoding') == 'msgpack'
+            or MSGPACK_CONTENT_TYPE in request.headers.get('Accept', ''))
+
+
+def _minutes(value):
+    h, m = map(int, str(value).split(':')[:2])
+    return h * 60 + m
+
+
+def encode_schedules(queryset):
+    """Columnar ``{'format', 'tables', 'blocks'}`` payload for a Schedule queryset"""
+    rows = queryset.order_by('day', 'start_time', 'id').values_list(
+        'id', 'day', 'start_time', 'end_time',
+        'course_id', 'course__course_code', 'course__descriptive_title', 'course__color',
+        'course__lecture_hours', 'course__laboratory_hours', 'course__credit_units',
+        'section_id', 'section__name',
+        'room_id', 'room__name',
+        'faculty_id', 'faculty__first_name', 'faculty__last_name',
+    )
+
+    tables = {name: {column: [] for column in columns} for name, columns in TABLE_COLUMNS.items()}
+    indexes = {name: {} for name in TABLE_COLUMNS}
+    blocks = {column: [] for column in BLOCK_COLUMNS}
+
+    def intern(table, key, *values):
+        """Index of ``key`` in ``table``, appending its row the first time"""
+        if key is None:
+            return -1
+        idx = indexes[table].get(key)
+        if idx is None:
+            idx = indexes[table][key] = len(indexes[table])
+            for column, value in zip(TABLE_COLUMNS[table], (key,) + values):
+                tables[table][column].append(value)
+        return idx
+
+    for (schedule_id, day, start_time, end_time,
+         course_id, code, title, color, lecture_hours, laboratory_hours, credit_units,
+         section_id, section_name, room_id, room_name,
+         faculty_id, faculty_first, faculty_last) in rows:
+        try:
+            start_minute, end_minute = _minutes(start_time), _minutes(end_time)
+        except (TypeError, ValueError):
+            continue
+        blocks['id'].append(schedule_id)
+        blocks['day'].append(day)
+        blocks['start_minute'].append(start_minute)
+        blocks['end_minute'].append(end_minute)
+        blocks['course_idx'].append(intern(
+            'courses', course_id, code, title, color, lecture_hours, laboratory_hours, credit_units
+        ))
+        blocks['section_idx'].append(intern('sections', section_id, section_name))
+        blocks['room_idx'].append(intern('rooms', room_id, room_name))
+        blocks['faculty_idx'].append(intern('faculty', faculty_id, f'{faculty_first} {faculty_last}'))
+
+    return {'format': 'compact', 'tables': tables, 'blocks': blocks}
+
+
+def packb(payload):
+    if msgpack is None:
+        raise CompactEncodingError('MessagePack encoding requires the msgpack package')
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def render(request, payload, status=200):
+    """Encode a compact payload as MessagePack or minified JSON"""
+    if wants_msgpack(request):
+        try:
+            body = packb(payload)
+        except CompactEncodingError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=406)
+        return HttpResponse(body, content_type=MSGPACK_CONTENT_TYPE, status=status)
+    return JsonResponse(payload, status=status, json_dumps_params={'separators': (',', ':')})
+
+
+class CompactJSONRenderer(JSONRenderer):
+    """Lets DRF content negotiation accept ``?format=compact``"""
+    format = 'compact'
+
+
+class CompactMessagePackRenderer(BaseRenderer):
+    """``?format=compact`` with ``Accept: application/msgpack``"""
+    media_type = MSGPACK_CONTENT_TYPE
+    format = 'compact'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return packb(data)
+
+
+# Renderers for DRF schedule views that support ?format=compact. Without
+# msgpack the MessagePack renderer is left out, so DRF answers
+# ``Accept: application/msgpack`` with a 406 instead of failing to render
+# error responses.
+SCHEDULE_RENDERERS = [JSONRenderer, BrowsableAPIRenderer, CompactJSONRenderer]
+if msgpack is not None:
+    SCHEDULE_RENDERERS.append(CompactMessagePackRenderer)
@@ -0,0 +1,124 @@
+"""Streaming export of the master timetable.
+
+Rows are pulled with ``values_list(...).iterator()`` so no ``Schedule``
+instances are built and memory stays flat no matter how many rows are
+exported. Both the admin export view and the ``export_schedules``
+management command share these helpers.
+"""
+import csv
+
+from .models import Room, Schedule
+
+EXPORT_HEADER = [
+    'Day', 'Start Time', 'End Time', 'Course Code', 'Descriptive Title',
+    'Section', 'Faculty', 'Room', 'Campus', 'Units',
+]
+
+EXPORT_FIELDS = (
+    'day',
+    'start_time',
+    'end_time',
+    'course__course_code',
+    'course__descriptive_title',
+    'section__name',
+    'faculty__first_name',
+    'faculty__last_name',
+    'room__name',
+    'room__campus',
+    'course__credit_units',
+)
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _to_int(value):
+    """Return ``value`` as an int, or None when it is blank or invalid."""
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def export_queryset(curriculum=None, year_level=None, semester=None, campus=None):
+    """Build the filtered ``values_list`` queryset for the export.
+
+    Invalid or blank filters are ignored, mirroring how ``course_view``
+    treats its querystring filters.
+    """
+    qs = Schedule.objects.all()
+
+    curriculum = _to_int(curriculum)
+    if curriculum is not None:
+        qs = qs.filter(section__curriculum_id=curriculum)
+
+    year_level = _to_int(year_level)
+    if year_level is not None:
+        qs = qs.filter(section__year_level=year_level)
+
+    semester = _to_int(semester)
+    if semester is not None:
+        qs = qs.filter(section__semester=semester)
+
+    if campus:
+        qs = qs.filter(room__campus=campus)
+
+    return qs.order_by('day', 'start_time', 'id').values_list(*EXPORT_FIELDS)
+
+
+def iter_schedule_rows(**filters):
+    """Yield one formatted row (a list) per schedule matching ``filters``."""
+    day_names = dict(Schedule.DAY_CHOICES)
+    campus_names = dict(Room.CAMPUS_CHOICES)
+
+    for (day, start_time, end_time, course_code, course_title, section_name,
+         faculty_first, faculty_last, room_name, campus, units) in export_queryset(**filters).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE):
+        if faculty_first or faculty_last:
+            faculty_name = f"{faculty_first} {faculty_last}".strip()
+        else:
+            faculty_name = 'TBA'
+        yield [
+            day_names.get(day, day),
+            start_time,
+            end_time,
+            course_code,
+            course_title,
+            section_name,
+            faculty_name,
+            room_name or 'TBA',
+            campus_names.get(campus, campus or ''),
+            units,
+        ]
+
+
+class _Echo:
+    """File-like object whose ``write`` just hands the value back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, header=EXPORT_HEADER):
+    """Encode ``rows`` as CSV lines one at a time (for StreamingHttpResponse)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_xlsx(rows, target, header=EXPORT_HEADER):
+    """Write ``rows`` to ``target`` (path or binary file) as an XLSX workbook.
+
+    Requires ``openpyxl``; its write-only mode keeps memory bounded while
+    rows are appended. Raises ImportError when openpyxl is not installed.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Schedules')
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(target)
@@ -0,0 +1,158 @@
+"""Profile picture pipeline.
+
+Uploads are decoded with Pillow, rotated per their EXIF orientation,
+downscaled to ``PROFILE_PICTURE_MAX_DIMENSION`` and re-encoded as JPEG,
+which drops EXIF/GPS and other metadata before anything is stored.
+
+Square 64/128/256 px thumbnails are then rendered as WebP and JPEG in a
+background thread started after the saving transaction commits (or inline
+when ``PROFILE_THUMBNAILS_ASYNC`` is off), and their storage paths are
+recorded in ``Faculty.profile_picture_variants``. APIs return those URLs so
+list screens fetch a few KB instead of the original upload.
+``manage.py generate_profile_thumbnails`` backfills existing pictures.
+"""
+import io
+import logging
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from .caching import ALL_SCHEDULES, bump_tags, tag
+from .models import Faculty
+
+logger = logging.getLogger(__name__)
+
+VARIANT_SIZES = (64, 128, 256)
+VARIANT_DIR = 'profile_pictures/variants'
+
+
+class ImageProcessingError(ValueError):
+    """The upload is not an image Pillow can decode safely"""
+
+
+def variant_formats():
+    """WebP when this Pillow build supports it, always JPEG as the fallback"""
+    return ('webp', 'jpeg') if features.check('webp') else ('jpeg',)
+
+
+def _open(fileobj, max_dimension=None):
+    try:
+        image = Image.open(fileobj)
+        if max_dimension:
+            # Let the JPEG decoder scale down while decoding (much faster for big photos)
+            image.draft('RGB', (max_dimension, max_dimension))
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise ImageProcessingError(f'Could not read image: {e}')
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=80, method=4)
+    else:
+        image.save(buffer, 'JPEG', quality=85, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def normalize_upload(uploaded_file):
+    """Re-encode an upload as a metadata-free JPEG; returns a ContentFile"""
+    max_dimension = settings.PROFILE_PICTURE_MAX_DIMENSION
+    image = _open(uploaded_file, max_dimension)
+    image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    return ContentFile(_encode(image, 'jpeg'), name=f'{uuid.uuid4().hex}.jpg')
+
+
+def render_variants(source_name):
+    """Write every thumbnail of a stored picture; returns ``{size: {format: path}}``"""
+    with default_storage.open(source_name, 'rb') as fh:
+        image = _open(fh, max(VARIANT_SIZES))
+    stem = os.path.splitext(os.path.basename(source_name))[0]
+    variants = {}
+    for size in VARIANT_SIZES:
+        thumb = ImageOps.fit(image, (size, size), Image.LANCZOS)
+        variants[str(size)] = {
+            fmt: default_storage.save(
+                f'{VARIANT_DIR}/{stem}_{size}.{"jpg" if fmt == "jpeg" else fmt}',
+                ContentFile(_encode(thumb, fmt)),
+            )
+            for fmt in variant_formats()
+        }
+    return variants
+
+
+def delete_variants(variants):
+    for formats in (variants or {}).values():
+        for path in formats.values():
+            try:
+                default_storage.delete(path)
+            except OSError:
+                pass
+
+
+def generate_variants(faculty_id):
+    """Render and record thumbnails for a faculty member's current picture"""
+    row = Faculty.objects.filter(id=faculty_id).values('profile_picture', 'profile_picture_variants').first()
+    if not row or not row['profile_picture']:
+        return None
+    source_name = row['profile_picture']
+    variants = render_variants(source_name)
+    # Only record them if the picture was not replaced while rendering
+    updated = Faculty.objects.filter(id=faculty_id, profile_picture=source_name).update(
+        profile_picture_variants=variants, updated_at=timezone.now()
+    )
+    if not updated:
+        delete_variants(variants)
+        return None
+    delete_variants(row['profile_picture_variants'])
+    # update() sends no post_save, so invalidate cached payloads here
+    bump_tags(ALL_SCHEDULES, tag('faculty', faculty_id))
+    return variants
+
+
+def schedule_variants(faculty_id):
+    """Generate thumbnails once the current transaction commits"""
+    if settings.PROFILE_THUMBNAILS_ASYNC:
+        transaction.on_commit(lambda: _start_thread(faculty_id))
+    else:
+        transaction.on_commit(lambda: generate_variants(faculty_id))
+
+
+def _start_thread(faculty_id):
+    thread = threading.Thread(
+        target=_generate_in_background, args=(faculty_id,), name='profile-thumbnails', daemon=True
+    )
+    thread.start()
+
+
+def _generate_in_background(faculty_id):
+    try:
+        generate_variants(faculty_id)
+    except Exception:
+        logger.exception('Generating thumbnails for faculty %s failed', faculty_id)
+    finally:
+        db_connection.close()
+
+
+def variant_urls(request, variants):
+    """Absolute ``{size: {format: url}}`` for stored variant paths (None when missing)"""
+    if not variants:
+        return None
+    return {
+        size: {fmt: request.build_absolute_uri(default_storage.url(path)) for fmt, path in formats.items()}
+        for size, formats in variants.items()
+    }
@@ -0,0 +1,729 @@
+"""Bulk import of curricula, courses, schedules and faculty rosters from CSV/XLSX files.
+
+Rows are read and validated in memory against data preloaded with a
+handful of queries, then written with ``bulk_create`` inside a single
+transaction instead of one ``save()`` (and its validation queries) per row.
+"""
+import bisect
+import csv
+import io
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from . import live
+from .caching import ALL_SCHEDULES, bump_tags, schedule_tags, tag
+from .profiling import Stages
+from .outbox import enqueue_emails, invitation_email
+from .models import Course, Curriculum, Faculty, Room, Schedule, Section
+
+HEADER_ALIASES = {
+    'code': 'course_code',
+    'title': 'descriptive_title',
+    'course_title': 'descriptive_title',
+    'lec_hours': 'lecture_hours',
+    'lab_hours': 'laboratory_hours',
+    'units': 'credit_units',
+    'year': 'year_level',
+    'sem': 'semester',
+    'curriculum_name': 'curriculum',
+    'section_name': 'section',
+    'start': 'start_time',
+    'end': 'end_time',
+    'room_name': 'room',
+    'faculty_email': 'faculty',
+    'employment_status': 'status',
+    'highest_degree': 'degree',
+    'specializations': 'specialization',
+    'prc': 'prc_licensed',
+}
+
+
+class ImportFileError(Exception):
+    """The uploaded file could not be read as a table of rows"""
+
+
+def _normalize_header(value):
+    key = str(value or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(key, key)
+
+
+def read_rows(fileobj, filename=''):
+    """Read a CSV or XLSX file into a list of dicts keyed by normalized header.
+
+    XLSX support needs the optional ``openpyxl`` package.
+    """
+    if filename.lower().endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportFileError('XLSX import requires the openpyxl package. Upload a CSV file instead.')
+        try:
+            workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        except Exception as e:
+            raise ImportFileError(f'Could not read XLSX file: {e}')
+        rows = workbook.active.iter_rows(values_only=True)
+        try:
+            header = [_normalize_header(h) for h in next(rows)]
+        except StopIteration:
+            return []
+        data = []
+        for values in rows:
+            if not any(v not in (None, '') for v in values):
+                continue
+            data.append({
+                key: ('' if value is None else str(value).strip())
+                for key, value in zip(header, values) if key
+            })
+        workbook.close()
+        return data
+
+    raw = fileobj.read()
+    if isinstance(raw, bytes):
+        try:
+            raw = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ImportFileError('CSV file must be UTF-8 encoded')
+    reader = csv.reader(io.StringIO(raw))
+    try:
+        header = [_normalize_header(h) for h in next(reader)]
+    except StopIteration:
+        return []
+    data = []
+    for values in reader:
+        if not any(v.strip() for v in values):
+            continue
+        data.append({
+            key: value.strip()
+            for key, value in zip(header, values) if key
+        })
+    return data
+
+
+def _parse_int(row, field, errors, default=None, choices=None, minimum=None):
+    value = row.get(field, '')
+    if value == '':
+        if default is None:
+            errors.append(f'{field} is required')
+        return default
+    try:
+        number = int(float(value))
+    except (ValueError, OverflowError):
+        errors.append(f'{field} must be a number (got "{value}")')
+        return None
+    if choices is not None and number not in choices:
+        errors.append(f'{field} must be one of {", ".join(str(c) for c in choices)} (got {number})')
+        return None
+    if minimum is not None and number < minimum:
+        errors.append(f'{field} must be at least {minimum} (got {number})')
+        return None
+    return number
+
+
+def import_courses(rows, curriculum=None, dry_run=False):
+    """Validate and insert course rows (all or nothing).
+
+    ``curriculum`` (a Curriculum instance) is used for every row when given;
+    otherwise each row names its curriculum with ``curriculum`` and
+    ``curriculum_year`` columns, and missing curricula are created.
+
+    Returns a dict with ``created``, ``curricula_created`` and ``errors``
+    (a list of "Row N: ..." strings). Nothing is written when there are
+    errors or when ``dry_run`` is set.
+    """
+    year_choices = [c[0] for c in Course.YEAR_CHOICES]
+    semester_choices = [c[0] for c in Course.SEMESTER_CHOICES]
+
+    errors = []
+    parsed = []
+    curriculum_keys = set()
+
+    for index, row in enumerate(rows, start=2):  # row 1 is the header
+        row_errors = []
+        course_code = row.get('course_code', '').upper()
+        descriptive_title = row.get('descriptive_title', '')
+        if not course_code:
+            row_errors.append('course_code is required')
+        elif len(course_code) > Course._meta.get_field('course_code').max_length:
+            row_errors.append(f'course_code "{course_code}" is too long')
+        if not descriptive_title:
+            row_errors.append('descriptive_title is required')
+
+        values = {
+            'course_code': course_code,
+            'descriptive_title': descriptive_title,
+            'lecture_hours': _parse_int(row, 'lecture_hours', row_errors, default=0, minimum=0),
+            'laboratory_hours': _parse_int(row, 'laboratory_hours', row_errors, default=0, minimum=0),
+            'credit_units': _parse_int(row, 'credit_units', row_errors, default=0, minimum=0),
+            'year_level': _parse_int(row, 'year_level', row_errors, choices=year_choices),
+            'semester': _parse_int(row, 'semester', row_errors, choices=semester_choices),
+        }
+
+        if curriculum is not None:
+            key = (curriculum.name, curriculum.year)
+        else:
+            name = row.get('curriculum', '')
+            year = _parse_int(row, 'curriculum_year', row_errors)
+            if not name:
+                row_errors.append('curriculum is required')
+            key = (name, year)
+
+        if row_errors:
+            errors.append((index, '; '.join(row_errors)))
+            continue
+        curriculum_keys.add(key)
+        parsed.append((index, key, values))
+
+    # Preload curricula and their existing course codes/colors (two queries)
+    if curriculum is not None:
+        curricula = {(curriculum.name, curriculum.year): curriculum}
+    else:
+        names = {name for name, _ in curriculum_keys}
+        curricula = {
+            (c.name, c.year): c
+            for c in Curriculum.objects.filter(name__in=names)
+            if (c.name, c.year) in curriculum_keys
+        }
+    existing_codes = set()
+    used_colors = {}
+    existing_ids = [c.id for c in curricula.values()]
+    if existing_ids:
+        for curriculum_id, code, color in Course.objects.filter(
+            curriculum_id__in=existing_ids
+        ).values_list('curriculum_id', 'course_code', 'color'):
+            existing_codes.add((curriculum_id, code))
+            used_colors.setdefault(curriculum_id, set()).add(color)
+
+    seen = {}
+    for index, key, values in parsed:
+        code = values['course_code']
+        existing = curricula.get(key)
+        if existing is not None and (existing.id, code) in existing_codes:
+            errors.append((index, f'course {code} already exists in {existing}'))
+        elif (key, code) in seen:
+            errors.append((index, f'duplicate course code {code} (also on row {seen[(key, code)]})'))
+        else:
+            seen[(key, code)] = index
+
+    result = {
+        'created': 0,
+        'curricula_created': 0,
+        'errors': [f'Row {index}: {message}' for index, message in sorted(errors)],
+    }
+    if errors:
+        return result
+
+    new_curricula = [
+        Curriculum(name=name, year=year)
+        for (name, year) in sorted(curriculum_keys - set(curricula))
+    ]
+    result['curricula_created'] = len(new_curricula)
+    result['created'] = len(parsed)
+    if dry_run:
+        return result
+
+    with transaction.atomic():
+        if new_curricula:
+            for created in Curriculum.objects.bulk_create(new_curricula):
+                curricula[(created.name, created.year)] = created
+
+        # Assign palette colors in one pass, the same way Course.save() does
+        courses = []
+        for index, key, values in parsed:
+            target = curricula[key]
+            used = used_colors.setdefault(target.id, set())
+            available = [c for c in Course.COLOR_PALETTE if c not in used]
+            color = random.choice(available or Course.COLOR_PALETTE)
+            used.add(color)
+            courses.append(Course(curriculum=target, color=color, **values))
+        Course.objects.bulk_create(courses)
+
+    # bulk_create does not send post_save, so invalidate cached data here
+    lists = ('list:courses', 'list:curricula', 'list:sections') if new_curricula else ('list:courses',)
+    bump_tags(ALL_SCHEDULES, *lists, *{tag('curriculum', course.curriculum_id) for course in courses})
+    return result
+
+
+# ===== SCHEDULE IMPORT =====
+
+# Allowed class window (07:30 - 21:30) and the institutional Friday break
+# (10:30 - 13:30), in minutes from midnight
+SCHEDULE_WINDOW = (7 * 60 + 30, 21 * 60 + 30)
+FRIDAY_BREAK = (10 * 60 + 30, 13 * 60 + 30)
+FRIDAY = 4
+
+DAY_LOOKUP = {}
+for _value, _name in Schedule.DAY_CHOICES:
+    DAY_LOOKUP[str(_value)] = _value
+    DAY_LOOKUP[_name.lower()] = _value
+    DAY_LOOKUP[_name[:3].lower()] = _value
+
+
+def _format_minutes(minutes):
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def parse_time(value):
+    """Parse "8:00", "08:00", "13:30" or "1:30 PM" into minutes from midnight"""
+    text = str(value or '').strip().upper()
+    suffix = None
+    if text.endswith(('AM', 'PM')):
+        text, suffix = text[:-2].strip(), text[-2:]
+    hours, minutes = map(int, text.split(':')[:2])
+    if suffix == 'PM' and hours < 12:
+        hours += 12
+    elif suffix == 'AM' and hours == 12:
+        hours = 0
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(value)
+    return hours * 60 + minutes
+
+
+class IntervalIndex:
+    """Disjoint, sorted time blocks per key (e.g. ``('room', 3, day)``).
+
+    Each key holds parallel ``starts``/``ends`` lists so an overlap check is
+    a binary search instead of a scan over every schedule of that resource.
+    Existing schedules are merged into blocks once, remembering the
+    schedules each block was merged from so a conflict names a real class;
+    each accepted import row is inserted so later rows are checked against
+    it as well.
+    """
+
+    def __init__(self):
+        self._blocks = {}
+
+    def load(self, key, intervals):
+        starts, ends, members = [], [], []
+        for start, end in sorted(intervals):
+            if end <= start:
+                # Malformed legacy row: it occupies no time
+                continue
+            if starts and start < ends[-1]:
+                ends[-1] = max(ends[-1], end)
+                members[-1].append((start, end))
+            else:
+                starts.append(start)
+                ends.append(end)
+                members.append([(start, end)])
+        self._blocks[key] = (starts, ends, members)
+
+    def find_overlap(self, key, start, end):
+        """Return the ``(start, end)`` of a schedule overlapping [start, end), if any"""
+        blocks = self._blocks.get(key)
+        if not blocks:
+            return None
+        starts, ends, members = blocks
+        i = bisect.bisect_right(starts, start)
+        if i > 0 and ends[i - 1] > start:
+            block = i - 1
+        elif i < len(starts) and starts[i] < end:
+            block = i
+        else:
+            return None
+        return next((m for m in members[block] if m[0] < end and start < m[1]), None)
+
+    def add(self, key, start, end):
+        starts, ends, members = self._blocks.setdefault(key, ([], [], []))
+        i = bisect.bisect_right(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+        members.insert(i, [(start, end)])
+
+
+def _name_key(value):
+    return ' '.join(str(value).replace(',', ' ').lower().split())
+
+
+def import_schedules(rows, curriculum=None, dry_run=False):
+    """Validate schedule rows and insert the valid ones.
+
+    Columns: section, course_code, day, start_time, end_time and optional
+    faculty (email or name) and room (name). References are resolved
+    through dictionaries built from one query per table, and conflicts are
+    checked for the whole file against an in-memory ``IntervalIndex`` of
+    existing schedules, so the cost no longer grows with one ``full_clean()``
+    per row.
+
+    Returns a dict with ``created`` and ``errors`` ("Row N: ..." strings).
+    Valid rows are created in one transaction unless ``dry_run`` is set.
+    The load, validate, index, search and commit stages are recorded as
+    ``import_schedules.*`` profiling spans.
+    """
+    day_names = dict(Schedule.DAY_CHOICES)
+    stages = Stages('import_schedules')
+
+    # --- Reference lookups (one query per table) ---
+    stages.enter('load')
+    section_names = {row.get('section', '').upper() for row in rows}
+    section_qs = Section.objects.filter(name__in=section_names)
+    if curriculum is not None:
+        section_qs = section_qs.filter(curriculum=curriculum)
+    sections = {}
+    for section in section_qs:
+        sections.setdefault(section.name, []).append(section)
+
+    course_codes = {row.get('course_code', '').upper() for row in rows}
+    courses = {
+        (course.curriculum_id, course.course_code): course
+        for course in Course.objects.filter(course_code__in=course_codes)
+    }
+
+    faculty_by_key = {}
+    for faculty in Faculty.objects.only('id', 'first_name', 'last_name', 'email'):
+        faculty_by_key.setdefault(faculty.email.lower(), []).append(faculty)
+        faculty_by_key.setdefault(_name_key(f'{faculty.first_name} {faculty.last_name}'), []).append(faculty)
+        faculty_by_key.setdefault(_name_key(f'{faculty.last_name} {faculty.first_name}'), []).append(faculty)
+
+    rooms_by_key = {}
+    for room in Room.objects.all():
+        rooms_by_key.setdefault(room.name.lower(), []).append(room)
+
+    errors = []
+    candidates = []
+
+    stages.enter('validate')
+    for index, row in enumerate(rows, start=2):  # row 1 is the header
+        row_errors = []
+
+        section = None
+        section_name = row.get('section', '').upper()
+        matches = sections.get(section_name, [])
+        if not section_name:
+            row_errors.append('section is required')
+        elif not matches:
+            row_errors.append(f'section {section_name} not found')
+        elif len(matches) > 1:
+            row_errors.append(f'section {section_name} exists in several curricula; choose a curriculum')
+        else:
+            section = matches[0]
+
+        course = None
+        course_code = row.get('course_code', '').upper()
+        if not course_code:
+            row_errors.append('course_code is required')
+        elif section is not None:
+            course = courses.get((section.curriculum_id, course_code))
+            if course is None:
+                row_errors.append(f'course {course_code} not found in the curriculum of {section_name}')
+
+        faculty = None
+        faculty_value = row.get('faculty', '')
+        if faculty_value:
+            key = faculty_value.lower() if '@' in faculty_value else _name_key(faculty_value)
+            matches = faculty_by_key.get(key, [])
+            if len(matches) == 1:
+                faculty = matches[0]
+            else:
+                row_errors.append(f'faculty "{faculty_value}" ' + ('is ambiguous' if matches else 'not found'))
+
+        room = None
+        room_value = row.get('room', '')
+        if room_value:
+            matches = rooms_by_key.get(room_value.lower(), [])
+            if len(matches) == 1:
+                room = matches[0]
+            else:
+                row_errors.append(f'room "{room_value}" ' + ('is ambiguous' if matches else 'not found'))
+
+        day = DAY_LOOKUP.get(row.get('day', '').strip().lower())
+        if day is None:
+            row_errors.append(f'invalid day "{row.get("day", "")}"')
+
+        try:
+            start = parse_time(row.get('start_time'))
+            end = parse_time(row.get('end_time'))
+        except (TypeError, ValueError):
+            row_errors.append('start_time and end_time must be times like 08:00 or 1:30 PM')
+            start = end = None
+
+        if start is not None:
+            if end <= start:
+                row_errors.append('end_time must be after start_time')
+            elif start < SCHEDULE_WINDOW[0] or end > SCHEDULE_WINDOW[1]:
+                row_errors.append(
+                    f'schedule times must be within 07:30 and 21:30 '
+                    f'(got {_format_minutes(start)} - {_format_minutes(end)})'
+                )
+            elif day == FRIDAY and start < FRIDAY_BREAK[1] and FRIDAY_BREAK[0] < end:
+                row_errors.append('overlaps the Friday institutional break (10:30 - 13:30)')
+
+        if course is not None and section is not None:
+            if course.year_level != section.year_level:
+                row_errors.append(
+                    f'cannot add {course.course_code} (Year {course.year_level}) '
+                    f'to {section.name} (Year {section.year_level})'
+                )
+            if course.semester != section.semester:
+                row_errors.append(
+                    f'cannot add {course.course_code} (Semester {course.semester}) '
+                    f'to {section.name} (Semester {section.semester})'
+                )
+
+        if row_errors:
+            errors.append((index, '; '.join(row_errors)))
+            continue
+        candidates.append((index, section, course, faculty, room, day, start, end))
+
+    # --- Conflict sweep against existing schedules and earlier rows ---
+    stages.enter('index')
+    section_ids = {c[1].id for c in candidates}
+    faculty_ids = {c[3].id for c in candidates if c[3] is not None}
+    room_ids = {c[4].id for c in candidates if c[4] is not None}
+
+    existing = {}
+    course_days = set()
+    if candidates:
+        existing_qs = Schedule.objects.filter(
+            Q(section_id__in=section_ids) | Q(faculty_id__in=faculty_ids) | Q(room_id__in=room_ids)
+        ).values_list('section_id', 'course_id', 'faculty_id', 'room_id', 'day', 'start_time', 'end_time')
+        for section_id, course_id, faculty_id, room_id, day, start_time, end_time in existing_qs.iterator():
+            try:
+                interval = (parse_time(start_time), parse_time(end_time))
+            except (TypeError, ValueError):
+                continue
+            if section_id in section_ids:
+                existing.setdefault(('section', section_id, day), []).append(interval)
+                course_days.add((section_id, course_id, day))
+            if faculty_id in faculty_ids:
+                existing.setdefault(('faculty', faculty_id, day), []).append(interval)
+            if room_id in room_ids:
+                existing.setdefault(('room', room_id, day), []).append(interval)
+
+    busy = IntervalIndex()
+    for key, intervals in existing.items():
+        busy.load(key, intervals)
+
+    stages.enter('search')
+    accepted = []
+    for index, section, course, faculty, room, day, start, end in candidates:
+        day_name = day_names[day]
+        if (section.id, course.id, day) in course_days:
+            errors.append((index, f'{course.course_code} is already scheduled for {section.name} on {day_name}'))
+            continue
+
+        keys = [(('section', section.id, day), f'Section {section.name}')]
+        if faculty is not None:
+            keys.append((('faculty', faculty.id, day), f'Faculty {faculty.first_name} {faculty.last_name}'))
+        if room is not None:
+            keys.append((('room', room.id, day), f'Room {room.name}'))
+
+        conflicts = []
+        for key, label in keys:
+            block = busy.find_overlap(key, start, end)
+            if block:
+                conflicts.append(
+                    f'{label} has a time conflict on {day_name} between '
+                    f'{_format_minutes(block[0])} and {_format_minutes(block[1])}'
+                )
+        if conflicts:
+            errors.append((index, '; '.join(conflicts)))
+            continue
+
+        for key, label in keys:
+            busy.add(key, start, end)
+        course_days.add((section.id, course.id, day))
+        accepted.append(Schedule(
+            course=course,
+            section=section,
+            faculty=faculty,
+            room=room,
+            day=day,
+            start_time=_format_minutes(start),
+            end_time=_format_minutes(end),
+            duration=end - start,
+        ))
+
+    result = {
+        'created': len(accepted),
+        'errors': [f'Row {index}: {message}' for index, message in sorted(errors)],
+    }
+    if dry_run or not accepted:
+        stages.close()
+        return result
+
+    stages.enter('commit')
+    with transaction.atomic():
+        Schedule.objects.bulk_create(accepted, batch_size=500)
+    stages.close()
+
+    # bulk_create does not send post_save, so invalidate cached data and
+    # tell open pages here
+    rows = [(s.section_id, s.faculty_id, s.room_id) for s in accepted]
+    bump_tags(*schedule_tags(rows))
+    live.record('bulk', live.affected_by(rows))
+    return result
+
+
+# ===== FACULTY ROSTER IMPORT =====
+
+FACULTY_EMAIL_DOMAIN = '@tip.edu.ph'
+
+EMPLOYMENT_STATUS_LOOKUP = {}
+for _value, _label in Faculty.EMPLOYMENT_STATUS_CHOICES:
+    EMPLOYMENT_STATUS_LOOKUP[_value] = _value
+    EMPLOYMENT_STATUS_LOOKUP[_label.lower()] = _value
+    EMPLOYMENT_STATUS_LOOKUP[_label.lower().replace('-', ' ')] = _value
+
+GENDER_LOOKUP = {'m': 'M', 'male': 'M', 'f': 'F', 'female': 'F'}
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+def _split_name(row):
+    first_name = row.get('first_name', '')
+    last_name = row.get('last_name', '')
+    name = row.get('name', '')
+    if name and not (first_name and last_name):
+        if ',' in name:
+            last_name, first_name = [part.strip() for part in name.split(',', 1)]
+        else:
+            first_name, _, last_name = name.strip().rpartition(' ')
+    return first_name.strip(), last_name.strip()
+
+
+def import_faculty_roster(rows, absolute_url, dry_run=False):
+    """Validate a faculty roster and create users, faculty and specializations in bulk.
+
+    Columns: name (or first_name/last_name), email, status, degree,
+    specialization (course codes separated by ";" or "|"), and optional
+    gender, role (staff/admin) and prc_licensed. ``absolute_url`` turns a
+    path into a full URL for the invitation links.
+
+    Accounts get an unusable password instead of a hashed random one (the
+    invitation link lets each person choose theirs), which keeps the import
+    fast; invitations are queued in the email outbox. Nothing is written
+    when any row is invalid.
+
+    Returns a dict with ``created`` and ``errors`` ("Row N: ..." strings).
+    """
+    existing_emails = {e.lower() for e in Faculty.objects.order_by().values_list('email', flat=True)}
+    for email, username in User.objects.values_list('email', 'username'):
+        existing_emails.add((email or '').lower())
+        existing_emails.add(username.lower())
+
+    courses_by_code = {}
+    for course_id, code in Course.objects.order_by().values_list('id', 'course_code'):
+        courses_by_code.setdefault(code.upper(), []).append(course_id)
+
+    errors = []
+    parsed = []
+    seen = {}
+
+    for index, row in enumerate(rows, start=2):  # row 1 is the header
+        row_errors = []
+        first_name, last_name = _split_name(row)
+        if not first_name or not last_name:
+            row_errors.append('first and last name are required')
+
+        email = row.get('email', '').strip().lower()
+        if not email:
+            row_errors.append('email is required')
+        elif not email.endswith(FACULTY_EMAIL_DOMAIN) or email.count('@') != 1:
+            row_errors.append(f'only {FACULTY_EMAIL_DOMAIN} email addresses can be used ({email})')
+        elif email in existing_emails:
+            row_errors.append(f'{email} is already registered')
+        elif email in seen:
+            row_errors.append(f'duplicate email {email} (also on row {seen[email]})')
+        else:
+            seen[email] = index
+
+        status_value = row.get('status', '').strip().lower()
+        employment_status = EMPLOYMENT_STATUS_LOOKUP.get(status_value or 'full_time')
+        if employment_status is None:
+            row_errors.append(f'invalid employment status "{row.get("status")}"')
+
+        gender_value = row.get('gender', '').strip().lower()
+        gender = GENDER_LOOKUP.get(gender_value or 'm')
+        if gender is None:
+            row_errors.append(f'invalid gender "{row.get("gender")}"')
+
+        role = row.get('role', '').strip().lower() or 'staff'
+        if role not in ('staff', 'admin'):
+            row_errors.append(f'invalid role "{role}" (use staff or admin)')
+
+        course_ids = []
+        codes = [c.strip().upper() for c in row.get('specialization', '').replace('|', ';').split(';') if c.strip()]
+        for code in codes:
+            if code in courses_by_code:
+                course_ids.extend(courses_by_code[code])
+            else:
+                row_errors.append(f'unknown specialization course {code}')
+
+        if row_errors:
+            errors.append((index, '; '.join(row_errors)))
+            continue
+        parsed.append({
+            'first_name': first_name,
+            'last_name': last_name,
+            'email': email,
+            'employment_status': employment_status,
+            'gender': gender,
+            'role': role,
+            'highest_degree': row.get('degree', '').strip(),
+            'prc_licensed': row.get('prc_licensed', '').strip().lower() in TRUE_VALUES,
+            'course_ids': sorted(set(course_ids)),
+        })
+
+    result = {
+        'created': 0,
+        'errors': [f'Row {index}: {message}' for index, message in sorted(errors)],
+    }
+    if errors or dry_run:
+        result['created'] = 0 if errors else len(parsed)
+        return result
+
+    with transaction.atomic():
+        users = User.objects.bulk_create([
+            User(
+                username=entry['email'],
+                email=entry['email'],
+                first_name=entry['first_name'],
+                last_name=entry['last_name'],
+                password=make_password(None),
+                is_staff=True,
+                is_superuser=entry['role'] == 'admin',
+            )
+            for entry in parsed
+        ])
+        faculty = Faculty.objects.bulk_create([
+            Faculty(
+                user=user,
+                first_name=entry['first_name'],
+                last_name=entry['last_name'],
+                email=entry['email'],
+                gender=entry['gender'],
+                employment_status=entry['employment_status'],
+                highest_degree=entry['highest_degree'],
+                prc_licensed=entry['prc_licensed'],
+            )
+            for user, entry in zip(users, parsed)
+        ])
+        Through = Faculty.specialization.through
+        Through.objects.bulk_create([
+            Through(faculty_id=member.id, course_id=course_id)
+            for member, entry in zip(faculty, parsed)
+            for course_id in entry['course_ids']
+        ])
+
+        invitations = []
+        for user in users:
+            uid = urlsafe_base64_encode(force_bytes(user.pk))
+            token = default_token_generator.make_token(user)
+            reset_url = absolute_url(reverse('password_reset_confirm', kwargs={'uidb64': uid, 'token': token}))
+            subject, message = invitation_email(user.first_name, user.username, reset_url)
+            invitations.append((subject, message, [user.email]))
+        enqueue_emails(invitations)
+
+    bump_tags(
+        ALL_SCHEDULES, 'list:faculty',
+        *(tag('faculty', member.id) for member in faculty), *(tag('user', user.id) for user in users),
+    )
+    result['created'] = len(parsed)
+    return result
@@ -0,0 +1,149 @@
+"""Live feed of schedule changes for open admin pages.
+
+Every schedule write adds a ``ScheduleChange`` row (``hello/signals.py``
+for single saves and deletes, the importers and seeding for bulk writes).
+An event names what changed and the sections, faculty and rooms it
+touched, so a page can drop just those cached timetables and patch the
+grid it shows from ``row`` instead of refetching everything::
+
+    {"id": 42, "action": "updated", "schedule": 17, "sections": [3],
+     "faculty": [5, 8], "rooms": [2], "row": {...}, "at": "..."}
+
+``bulk`` events (imports, seeding, an instructor or room being deleted)
+carry no row; empty lists mean "anything may have changed".
+
+Two ways to read it:
+
+* ``GET /api/live/stream/``: Server-Sent Events, served when the site runs
+  under ASGI (``ASSIST/asgi.py``). Each connection checks the table every
+  ``LIVE_POLL_SECONDS`` from the event loop, closes after
+  ``LIVE_STREAM_SECONDS`` and is resumed by the browser with
+  ``Last-Event-ID``. Under WSGI the endpoint answers 204, which tells
+  ``EventSource`` not to reconnect, since a stream would hold a worker.
+* ``GET /api/live/changes/?after=<id>``: the same events as JSON, polled
+  every ``LIVE_CLIENT_POLL_SECONDS`` by pages that have no stream.
+
+Event ids come from the table's primary key. A writer can take an id and
+commit after a later one; ``changes_after()`` therefore stops at a gap in
+the ids until the row after it is ``SYNC_OVERLAP_SECONDS`` old, so a slow
+transaction is not skipped. Rows older than ``LIVE_RETENTION_HOURS`` are
+pruned as new ones are written.
+"""
+import asyncio
+import json
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import ScheduleChange
+
+BATCH_SIZE = 200
+HEARTBEAT_SECONDS = 15
+PRUNE_EVERY = 500
+
+AFFECTED_KEYS = ('sections', 'faculty', 'rooms')
+
+
+def affected_by(rows):
+    """``affected`` for schedules given as ``(section_id, faculty_id, room_id)`` rows"""
+    ids = {key: set() for key in AFFECTED_KEYS}
+    for refs in rows:
+        for key, pk in zip(AFFECTED_KEYS, refs):
+            if pk:
+                ids[key].add(pk)
+    return {key: sorted(values) for key, values in ids.items()}
+
+
+def _clock(value):
+    return value.strftime('%H:%M') if hasattr(value, 'strftime') else str(value)
+
+
+def schedule_row(schedule):
+    return {
+        'id': schedule.pk,
+        'course': schedule.course_id,
+        'section': schedule.section_id,
+        'faculty': schedule.faculty_id,
+        'room': schedule.room_id,
+        'day': schedule.day,
+        'start_time': _clock(schedule.start_time),
+        'end_time': _clock(schedule.end_time),
+        'duration': schedule.duration,
+    }
+
+
+def record(action, affected, schedule=None, row=None):
+    """Add an event; ``schedule`` is the schedule's id for single-row events"""
+    change = ScheduleChange.objects.create(action=action, schedule_id=schedule, affected=affected, row=row)
+    if change.id % PRUNE_EVERY == 0:
+        prune()
+    return change
+
+
+def prune(now=None):
+    """Delete events past LIVE_RETENTION_HOURS; returns how many"""
+    cutoff = (now or timezone.now()) - timedelta(hours=settings.LIVE_RETENTION_HOURS)
+    count, _ = ScheduleChange.objects.filter(created_at__lt=cutoff).delete()
+    return count
+
+
+def serialize(change):
+    return {
+        'id': change.id,
+        'action': change.action,
+        'schedule': change.schedule_id,
+        **{key: change.affected.get(key, []) for key in AFFECTED_KEYS},
+        'row': change.row,
+        'at': change.created_at.isoformat(),
+    }
+
+
+def parse_last_id(value):
+    """Event id from ``?after=`` or ``Last-Event-ID``; None when missing or malformed"""
+    try:
+        last_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return last_id if last_id >= 0 else None
+
+
+def latest_id():
+    return ScheduleChange.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def changes_after(last_id, limit=BATCH_SIZE):
+    """Events after ``last_id`` (at most ``limit``) and the id to resume from"""
+    settled = timezone.now() - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+    events = []
+    for change in ScheduleChange.objects.filter(id__gt=last_id).order_by('id')[:limit]:
+        if change.id != last_id + 1 and change.created_at > settled:
+            # The missing id may belong to a transaction that has not committed
+            break
+        events.append(serialize(change))
+        last_id = change.id
+    return events, last_id
+
+
+def message(event, data, event_id):
+    return f'id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+async def stream(last_id):
+    """Server-Sent Events after ``last_id`` until LIVE_STREAM_SECONDS have passed"""
+    started = beat = time.monotonic()
+    # Sets the browser's Last-Event-ID even if nothing changes
+    yield f'retry: {settings.LIVE_CLIENT_POLL_SECONDS * 1000}\n' + message('ready', {}, last_id)
+    while time.monotonic() - started < settings.LIVE_STREAM_SECONDS:
+        events, last_id = await sync_to_async(changes_after)(last_id)
+        if events:
+            yield ''.join(message('schedule', event, event['id']) for event in events)
+            beat = time.monotonic()
+        elif time.monotonic() - beat >= HEARTBEAT_SECONDS:
+            yield ': ping\n\n'
+            beat = time.monotonic()
+        if len(events) < BATCH_SIZE:
+            await asyncio.sleep(settings.LIVE_POLL_SECONDS)
@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from hello import activity
+
+
+class Command(BaseCommand):
+    help = 'Move activity log rows older than N days into a gzip-compressed JSON Lines archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ACTIVITY_RETENTION_DAYS,
+                            help='Archive rows older than this many days (default: ACTIVITY_RETENTION_DAYS)')
+        parser.add_argument('--output-dir', default=settings.ACTIVITY_ARCHIVE_DIR,
+                            help='Directory for archive files (default: ACTIVITY_ARCHIVE_DIR)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per read/delete batch (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the rows that would be archived')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count, path = activity.archive_rows(
+            cutoff, options['output_dir'], batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{count} activities older than {options["days"]} days would be archived')
+        elif path:
+            self.stdout.write(self.style.SUCCESS(f'Archived {count} activities to {path}'))
+        else:
+            self.stdout.write(f'No activities older than {options["days"]} days')
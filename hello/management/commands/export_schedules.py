@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hello import exports
+
+
+class Command(BaseCommand):
+    help = 'Export all schedules (master timetable) to CSV or XLSX'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--curriculum', type=int, help='Curriculum ID to filter by')
+        parser.add_argument('--year', type=int, help='Year level to filter by (1-4)')
+        parser.add_argument('--semester', type=int, help='Semester to filter by (1-2)')
+        parser.add_argument('--campus', help='Campus to filter by (casal or arlegui)')
+        parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv', help='Output format (default: csv)')
+        parser.add_argument('--output', '-o', help='Output file path (default: stdout for CSV)')
+
+    def handle(self, *args, **options):
+        rows = exports.iter_schedule_rows(
+            curriculum=options['curriculum'],
+            year_level=options['year'],
+            semester=options['semester'],
+            campus=options['campus'],
+        )
+        output = options['output']
+
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError('--output is required for XLSX export')
+            try:
+                exports.write_xlsx(rows, output)
+            except ImportError:
+                raise CommandError('XLSX export requires the openpyxl package')
+            self.stderr.write(self.style.SUCCESS(f'Exported schedules to {output}'))
+            return
+
+        if output:
+            with open(output, 'w', newline='', encoding='utf-8') as fh:
+                for line in exports.iter_csv(rows):
+                    fh.write(line)
+            self.stderr.write(self.style.SUCCESS(f'Exported schedules to {output}'))
+        else:
+            for line in exports.iter_csv(rows):
+                self.stdout.write(line, ending='')
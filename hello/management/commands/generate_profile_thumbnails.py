@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from hello import images
+from hello.models import Faculty
+
+
+class Command(BaseCommand):
+    help = 'Render 64/128/256 px thumbnails for faculty profile pictures that do not have them yet'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Regenerate thumbnails for every profile picture')
+
+    def handle(self, *args, **options):
+        faculty = Faculty.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if not options['all']:
+            faculty = faculty.filter(profile_picture_variants={})
+
+        done = failed = 0
+        for faculty_id in faculty.values_list('id', flat=True).iterator():
+            try:
+                images.generate_variants(faculty_id)
+                done += 1
+            except (images.ImageProcessingError, OSError) as e:
+                failed += 1
+                self.stderr.write(f'Faculty {faculty_id}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Generated thumbnails for {done} profile pictures ({failed} failed)'))
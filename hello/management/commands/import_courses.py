@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hello import importers
+from hello.models import Curriculum
+
+
+class Command(BaseCommand):
+    help = 'Bulk import courses (and curricula) from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file to import')
+        parser.add_argument('--curriculum', type=int,
+                            help='Curriculum ID for every row (otherwise read curriculum/curriculum_year columns)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without saving anything')
+
+    def handle(self, *args, **options):
+        curriculum = None
+        if options['curriculum']:
+            try:
+                curriculum = Curriculum.objects.get(id=options['curriculum'])
+            except Curriculum.DoesNotExist:
+                raise CommandError(f"Curriculum {options['curriculum']} does not exist")
+
+        path = options['path']
+        try:
+            with open(path, 'rb') as fh:
+                rows = importers.read_rows(fh, path)
+        except OSError as e:
+            raise CommandError(f'Could not open {path}: {e}')
+        except importers.ImportFileError as e:
+            raise CommandError(str(e))
+
+        result = importers.import_courses(rows, curriculum=curriculum, dry_run=options['dry_run'])
+        if result['errors']:
+            for error in result['errors']:
+                self.stderr.write(error)
+            raise CommandError(f"{len(result['errors'])} invalid rows; nothing was imported")
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['created']} courses ({result['curricula_created']} new curricula)"
+        ))
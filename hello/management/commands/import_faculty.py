@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hello import importers
+
+
+class Command(BaseCommand):
+    help = 'Bulk onboard faculty from a roster (CSV/XLSX: name, email, status, degree, specialization)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX roster file')
+        parser.add_argument('--base-url', default='http://localhost:8000',
+                            help='Site URL used in the invitation links (default: http://localhost:8000)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the roster without saving anything')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as fh:
+                rows = importers.read_rows(fh, path)
+        except OSError as e:
+            raise CommandError(f'Could not open {path}: {e}')
+        except importers.ImportFileError as e:
+            raise CommandError(str(e))
+
+        base_url = options['base_url'].rstrip('/')
+        result = importers.import_faculty_roster(
+            rows, lambda path: f'{base_url}{path}', dry_run=options['dry_run']
+        )
+        if result['errors']:
+            for error in result['errors']:
+                self.stderr.write(error)
+            raise CommandError(f"{len(result['errors'])} invalid rows; nothing was imported")
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(f"{verb} {result['created']} faculty"))
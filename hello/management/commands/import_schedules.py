@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from hello import importers, profiling
+from hello.models import Curriculum
+
+
+class Command(BaseCommand):
+    help = 'Bulk import schedules from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or XLSX file (section, course_code, day, start_time, end_time, faculty, room)')
+        parser.add_argument('--curriculum', type=int,
+                            help='Only match sections in this curriculum ID')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file and report conflicts without saving')
+        parser.add_argument('--profile', action='store_true', help='Run the import under cProfile and save the report to PROFILE_DIR')
+
+    def handle(self, *args, **options):
+        curriculum = None
+        if options['curriculum']:
+            try:
+                curriculum = Curriculum.objects.get(id=options['curriculum'])
+            except Curriculum.DoesNotExist:
+                raise CommandError(f"Curriculum {options['curriculum']} does not exist")
+
+        path = options['path']
+        try:
+            with open(path, 'rb') as fh:
+                rows = importers.read_rows(fh, path)
+        except OSError as e:
+            raise CommandError(f'Could not open {path}: {e}')
+        except importers.ImportFileError as e:
+            raise CommandError(str(e))
+
+        if options['profile']:
+            profile = profiling.Profile(f'import_schedules {path}')
+            with profile.running():
+                result = importers.import_schedules(rows, curriculum=curriculum, dry_run=options['dry_run'])
+            profile.save()
+            for item in profile.spans:
+                self.stdout.write(f"{item['name']}: {item['ms']:.1f} ms")
+            self.stdout.write(f'Profile saved to {profiling.prof_path(profile.id)}')
+        else:
+            result = importers.import_schedules(rows, curriculum=curriculum, dry_run=options['dry_run'])
+        for error in result['errors']:
+            self.stderr.write(error)
+
+        verb = 'Validated' if options['dry_run'] else 'Imported'
+        message = f"{verb} {result['created']} of {len(rows)} schedules"
+        if result['errors']:
+            self.stdout.write(self.style.WARNING(f"{message}; {len(result['errors'])} rows skipped"))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
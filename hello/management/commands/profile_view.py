@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+
+from hello import profiling
+
+
+class Command(BaseCommand):
+    help = 'Request a URL in-process under cProfile and print the most expensive functions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Path to request, e.g. /admin/section/12/print/')
+        parser.add_argument('--user', help='Username or email to log in as (default: the first active superuser)')
+        parser.add_argument('--limit', type=int, default=settings.PROFILE_TOP_N,
+                            help='Number of functions to print (default: PROFILE_TOP_N)')
+        parser.add_argument('--sort', choices=profiling.SORT_KEYS, default='cumulative',
+                            help='Sort order (default: cumulative)')
+        parser.add_argument('--no-save', action='store_true', help='Do not write the .prof and report to PROFILE_DIR')
+
+    def handle(self, *args, **options):
+        if options['limit'] < 1:
+            raise CommandError('--limit must be at least 1')
+        user = self.get_user(options['user'])
+
+        client = Client(raise_request_exception=False)
+        if user is not None:
+            client.force_login(user)
+
+        profile = profiling.Profile(f"GET {options['url']}")
+        # The test client talks to the app as "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            with profile.running():
+                response = client.get(options['url'])
+
+        self.stdout.write(f"{response.status_code} in {profile.wall_ms:.1f} ms"
+                          f" as {user.username if user else 'anonymous'}")
+        for item in profile.spans:
+            self.stdout.write(f"  {item['name']:<40} {item['ms']:10.2f} ms")
+
+        self.stdout.write(f"\n{'calls':>10} {'tottime ms':>12} {'cumtime ms':>12}  function")
+        for row in profile.top(options['limit'], options['sort']):
+            self.stdout.write(
+                f"{row['calls']:>10} {row['tottime_ms']:>12.2f} {row['cumtime_ms']:>12.2f}  {row['function']}"
+            )
+
+        if not options['no_save']:
+            profile.save(options['limit'], options['sort'])
+            self.stdout.write(self.style.SUCCESS(f'\nSaved {profiling.prof_path(profile.id)}'))
+
+    def get_user(self, identifier):
+        if identifier:
+            user = User.objects.filter(username=identifier).first() or User.objects.filter(email__iexact=identifier).first()
+            if user is None:
+                raise CommandError(f'No user {identifier}')
+            return user
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('id').first()
+        if user is None:
+            self.stderr.write('No active superuser; requesting anonymously')
+        return user
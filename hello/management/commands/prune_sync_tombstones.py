@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from hello import sync
+
+
+class Command(BaseCommand):
+    help = 'Delete delta-sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS'
+
+    def handle(self, *args, **options):
+        count = sync.prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(
+            f'Pruned {count} tombstones older than {settings.SYNC_TOMBSTONE_RETENTION_DAYS} days'
+        ))
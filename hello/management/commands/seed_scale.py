@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hello import seeding
+
+
+class Command(BaseCommand):
+    help = 'Generate a large synthetic, conflict-free scheduling dataset for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sections', type=int, required=True, help='Number of sections')
+        parser.add_argument('--faculty', type=int, required=True, help='Number of faculty members (each with a login)')
+        parser.add_argument('--rooms', type=int, required=True, help='Number of rooms')
+        parser.add_argument('--schedules-per-section', type=int, required=True,
+                            help=f'Schedules (distinct courses) per section, at most {len(seeding.time_slots())}')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed; also names the dataset, so each seed can be generated once (default: 0)')
+        parser.add_argument('--password',
+                            help='Password for the generated faculty logins (default: unusable)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            counts = seeding.seed_scale(
+                sections=options['sections'],
+                faculty=options['faculty'],
+                rooms=options['rooms'],
+                schedules_per_section=options['schedules_per_section'],
+                seed=options['seed'],
+                password=options['password'],
+            )
+        except seeding.SeedError as e:
+            raise CommandError(str(e))
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts['sections']} sections, {counts['schedules']} schedules, {counts['courses']} courses, "
+            f"{counts['faculty']} faculty and {counts['rooms']} rooms in {elapsed:.1f}s "
+            f"(curriculum {counts['curriculum']})"
+        ))
+        if counts['unassigned']:
+            self.stdout.write(self.style.WARNING(
+                f"{counts['unassigned']} schedules have no faculty or room (TBA): "
+                'add faculty/rooms to fill every slot'
+            ))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hello import outbox
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails from the outbox (run from cron, or as a worker with --loop)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Emails per batch (default: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the outbox')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop (default: 5)')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed = outbox.send_pending(batch_size=options['batch_size'])
+            total += processed
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'Processed {total} queued emails'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 15:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hello', '0015_sync_tracking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faculty',
+            name='profile_picture_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
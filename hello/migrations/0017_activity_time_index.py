@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-19 15:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hello', '0016_faculty_profile_picture_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['timestamp', 'id'], name='activity_time_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 15:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hello', '0017_activity_time_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', 'timestamp', 'id'], name='activity_user_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['entity_type', 'timestamp', 'id'], name='activity_entity_time_idx'),
+        ),
+    ]
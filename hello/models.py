@@ -1,6 +1,8 @@
 from django.db import models
-from django.db.models import Sum
+from django.db.models import Sum, Func, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.utils import timezone
 import random
 import re
 from django.core.exceptions import ValidationError
@@ -9,6 +11,7 @@ class Curriculum(models.Model):
     name = models.CharField(max_length=100)
     year = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['-year']
@@ -48,7 +51,7 @@ class Course(models.Model):
     semester = models.IntegerField(choices=SEMESTER_CHOICES)
     color = models.CharField(max_length=7, default='#FFA726')
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['year_level', 'semester', 'course_code']
@@ -98,11 +101,14 @@ class Faculty(models.Model):
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, default='M')
     employment_status = models.CharField(max_length=20, choices=EMPLOYMENT_STATUS_CHOICES, default='full_time')
     profile_picture = models.ImageField(upload_to='profile_pictures/', null=True, blank=True, verbose_name='Profile Picture')
+    # {"64": {"webp": path, "jpeg": path}, ...} filled in by hello/images.py
+    profile_picture_variants = models.JSONField(default=dict, blank=True)
     highest_degree = models.CharField(max_length=100, blank=True)
     prc_licensed = models.BooleanField(default=False, verbose_name='PRC Licensed (Qualified)')
     specialization = models.ManyToManyField(Course, blank=True, related_name='specialized_faculty')
     department = models.CharField(max_length=100, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['last_name', 'first_name']
@@ -126,6 +132,16 @@ class Faculty(models.Model):
         )['total'] or 0
         return total
     
+    @staticmethod
+    def total_units_annotation():
+        """``total_units`` as a subquery, for annotating Faculty querysets
+        without one extra query per faculty member"""
+        course_ids = Schedule.objects.filter(faculty_id=OuterRef(OuterRef('pk'))).values('course_id')
+        units = Course.objects.filter(id__in=course_ids).order_by().annotate(
+            total=Func(F('credit_units'), function='SUM')
+        ).values('total')
+        return Coalesce(Subquery(units), Value(0))
+    
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
@@ -145,6 +161,7 @@ class Section(models.Model):
     max_students = models.IntegerField(default=40)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='incomplete')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['year_level', 'semester', 'name']
@@ -192,6 +209,16 @@ class Section(models.Model):
         )['total'] or 0
         return total
 
+    @staticmethod
+    def total_units_annotation():
+        """``total_units`` as a subquery, for annotating Section querysets
+        without one extra query per section"""
+        course_ids = Schedule.objects.filter(section_id=OuterRef(OuterRef('pk'))).values('course_id')
+        units = Course.objects.filter(id__in=course_ids).order_by().annotate(
+            total=Func(F('credit_units'), function='SUM')
+        ).values('total')
+        return Coalesce(Subquery(units), Value(0))
+
 class Room(models.Model):
     """Model for classrooms"""
     CAMPUS_CHOICES = [
@@ -210,6 +237,7 @@ class Room(models.Model):
     campus = models.CharField(max_length=20, choices=CAMPUS_CHOICES, default='casal')
     room_type = models.CharField(max_length=20, choices=ROOM_TYPE_CHOICES, default='lecture')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['campus', 'room_number']
@@ -238,6 +266,7 @@ class Schedule(models.Model):
     end_time = models.CharField(max_length=5)
     duration = models.IntegerField(default=0, help_text="Duration in minutes")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         ordering = ['day', 'start_time']
@@ -371,6 +400,79 @@ class Activity(models.Model):
     class Meta:
         ordering = ['-timestamp']
         verbose_name_plural = 'Activities'
+        indexes = [
+            # Day ranges, newest-first pages and archival cutoffs (see hello/activity.py)
+            models.Index(fields=['timestamp', 'id'], name='activity_time_idx'),
+            # /api/activity/ filtered by user or entity type, still newest first
+            models.Index(fields=['user', 'timestamp', 'id'], name='activity_user_time_idx'),
+            models.Index(fields=['entity_type', 'timestamp', 'id'], name='activity_entity_time_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.action} {self.entity_type}: {self.entity_name}"
\ No newline at end of file
+        return f"{self.action} {self.entity_type}: {self.entity_name}"
+
+class DeletedRecord(models.Model):
+    """Tombstone for a deleted scheduling row, so mobile delta sync
+    (``/api/sync/``) can tell clients what to remove"""
+    entity_type = models.CharField(max_length=20, choices=Activity.ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"{self.entity_type} {self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+class ScheduleChange(models.Model):
+    """One schedule write, streamed to open admin pages (see hello/live.py).
+    The id is the event id clients resume from."""
+    ACTION_CHOICES = [
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+        ('bulk', 'Bulk change'),
+    ]
+
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    schedule_id = models.BigIntegerField(null=True, blank=True)
+    # {"sections": [...], "faculty": [...], "rooms": [...]}; for an edit both
+    # the old and the new references
+    affected = models.JSONField(default=dict)
+    # The schedule after the change (created/updated only)
+    row = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.action} schedule {self.schedule_id or '*'} at {self.created_at:%Y-%m-%d %H:%M:%S}"
+
+class OutboundEmail(models.Model):
+    """Queued email, sent in batches by the outbox worker (see hello/outbox.py)"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
@@ -0,0 +1,232 @@
+"""Email outbox: views enqueue, a worker sends.
+
+``enqueue_email`` only inserts an ``OutboundEmail`` row, so a request never
+waits on Brevo or SMTP. ``send_pending`` claims due rows in batches and
+sends them over one pooled ``requests.Session`` (Brevo API) or one open
+SMTP connection, retrying failures with exponential backoff.
+
+It runs from ``manage.py send_outbound_email`` (cron or ``--loop`` worker)
+and, when ``EMAIL_OUTBOX_AUTOSEND`` is on, from a background thread
+started after the enqueuing transaction commits.
+"""
+import logging
+import threading
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection, transaction
+from django.utils import timezone
+
+from .caching import bump_tags
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+BREVO_SENDER_NAME = 'ASSIST Administration Team'
+
+_session = None
+_session_lock = threading.Lock()
+_worker_lock = threading.Lock()
+
+
+def get_session():
+    """Shared requests.Session so Brevo calls reuse pooled connections"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers.update({
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+            })
+        return _session
+
+
+def send_email_via_brevo_api(subject, message, from_email, recipients, session=None):
+    if not settings.BREVO_API_KEY:
+        raise ValueError('Brevo API key is not configured')
+
+    payload = {
+        'sender': {
+            'email': from_email,
+            'name': BREVO_SENDER_NAME,
+        },
+        'to': [{'email': recipient} for recipient in recipients],
+        'subject': subject,
+        'textContent': message,
+    }
+
+    response = (session or get_session()).post(
+        settings.BREVO_API_URL,
+        json=payload,
+        headers={'api-key': settings.BREVO_API_KEY},
+        timeout=settings.EMAIL_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def enqueue_email(subject, message, recipients, from_email=None):
+    """Queue an email for the outbox worker and return the OutboundEmail row"""
+    email = OutboundEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+    )
+    if settings.EMAIL_OUTBOX_AUTOSEND:
+        transaction.on_commit(kick_worker)
+    return email
+
+
+def enqueue_emails(emails, from_email=None):
+    """Queue many ``(subject, message, recipients)`` emails with one insert"""
+    rows = OutboundEmail.objects.bulk_create([
+        OutboundEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+            recipients=list(recipients),
+        )
+        for subject, message, recipients in emails
+    ])
+    if rows:
+        bump_tags('outbox')
+    if rows and settings.EMAIL_OUTBOX_AUTOSEND:
+        transaction.on_commit(kick_worker)
+    return rows
+
+
+def invitation_email(first_name, username, reset_url):
+    """Subject and body of the new-account invitation email"""
+    subject = 'Your ASSIST Account Invitation'
+    message = f'''Hello {first_name},
+
+Your ASSIST account has been created successfully.
+
+Username: {username}
+
+To complete your account setup and choose a secure password, click the link below:
+{reset_url}
+
+If you cannot click the link, copy and paste it into your browser.
+
+If you did not request this account, please contact the administrator immediately.
+
+Best regards,
+ASSIST Administration Team'''
+    return subject, message
+
+
+def kick_worker():
+    """Drain the outbox in a background thread (no-op if one is already running)"""
+    if _worker_lock.locked():
+        return
+    thread = threading.Thread(target=_drain_in_background, name='email-outbox', daemon=True)
+    thread.start()
+
+
+def _drain_in_background():
+    if not _worker_lock.acquire(blocking=False):
+        return
+    try:
+        while send_pending():
+            pass
+    except Exception:
+        logger.exception('Email outbox worker failed')
+    finally:
+        _worker_lock.release()
+        db_connection.close()
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base ... capped at one hour"""
+    base = settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS
+    return timedelta(seconds=min(base * (2 ** max(attempts - 1, 0)), 3600))
+
+
+def _claim_batch(batch_size):
+    """Lease a batch of due emails so concurrent workers skip them"""
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.EMAIL_TIMEOUT * batch_size + 60)
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(id__in=[e.id for e in batch]).update(next_attempt_at=lease_until)
+    return batch
+
+
+def send_pending(batch_size=None):
+    """Send one batch of due emails. Returns the number of emails processed."""
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return 0
+
+    results = _send_batch(batch)
+
+    now = timezone.now()
+    for email in batch:
+        error = results.get(email.id)
+        email.attempts += 1
+        if error is None:
+            email.status = 'sent'
+            email.sent_at = now
+            email.last_error = ''
+        else:
+            email.last_error = error[:2000]
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = 'failed'
+                logger.error('Giving up on email %s to %s: %s', email.id, email.recipients, error)
+            else:
+                email.next_attempt_at = now + retry_delay(email.attempts)
+    OutboundEmail.objects.bulk_update(
+        batch, ['status', 'attempts', 'sent_at', 'last_error', 'next_attempt_at']
+    )
+    return len(batch)
+
+
+def _send_batch(batch):
+    """Send every email in ``batch``; returns {id: error message or None}"""
+    results = {}
+    if settings.BREVO_API_KEY:
+        session = get_session()
+        for email in batch:
+            try:
+                send_email_via_brevo_api(email.subject, email.body, email.from_email, email.recipients, session=session)
+                results[email.id] = None
+            except Exception as e:
+                results[email.id] = str(e) or e.__class__.__name__
+        return results
+
+    try:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+    except Exception as e:
+        return {email.id: f'Could not connect to mail server: {e}' for email in batch}
+    try:
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.recipients,
+                connection=connection,
+            )
+            try:
+                message.send(fail_silently=False)
+                results[email.id] = None
+            except Exception as e:
+                results[email.id] = str(e) or e.__class__.__name__
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return results
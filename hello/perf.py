@@ -0,0 +1,196 @@
+"""Per-view request timing and SQL accounting.
+
+``PerfMiddleware`` measures every request and files it under the resolved
+view name: wall time, number of SQL queries, time spent in SQL and the
+number of duplicated queries (the same SQL run again with other
+parameters, the signature of an N+1 loop). Totals and fixed-bucket
+latency histograms are kept in process memory, so each worker reports
+its own traffic since it started (or since the last reset). They are
+shown at ``/admin/perf/`` and ``/admin/perf/json/``.
+
+Requests slower than ``PERF_SLOW_REQUEST_MS`` are logged as warnings on
+the ``hello.perf`` logger. Streaming responses are timed until the
+response object is returned, not until the last byte is sent.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+UNRESOLVED = '<unresolved>'
+
+_lock = threading.Lock()
+_stats = {}
+_started = timezone.now()
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` that counts, times and groups queries"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            # ``sql`` still has its placeholders, so repeats differ only by params
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return self.count - len(self.statements)
+
+    def most_repeated(self):
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+
+class ViewStats:
+    def __init__(self):
+        self.requests = 0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.wall_ms = 0.0
+        self.max_wall_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.sql_ms = 0.0
+        self.duplicates = 0
+        self.max_duplicates = 0
+        self.slow = 0
+        self.worst_repeat = (None, 0)
+
+    def add(self, wall_ms, recorder, slow):
+        self.requests += 1
+        self.histogram[_bucket(wall_ms)] += 1
+        self.wall_ms += wall_ms
+        self.max_wall_ms = max(self.max_wall_ms, wall_ms)
+        self.queries += recorder.count
+        self.max_queries = max(self.max_queries, recorder.count)
+        self.sql_ms += recorder.seconds * 1000
+        self.duplicates += recorder.duplicates
+        self.max_duplicates = max(self.max_duplicates, recorder.duplicates)
+        self.slow += slow
+        sql, repeats = recorder.most_repeated()
+        if repeats > 1 and repeats > self.worst_repeat[1]:
+            self.worst_repeat = (sql, repeats)
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of requests"""
+        target = fraction * self.requests
+        seen = 0
+        for i, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else round(self.max_wall_ms, 1)
+        return None
+
+    def as_dict(self):
+        n = self.requests or 1
+        sql, repeats = self.worst_repeat
+        return {
+            'requests': self.requests,
+            'slow_requests': self.slow,
+            'wall_ms': {
+                'avg': round(self.wall_ms / n, 1),
+                'max': round(self.max_wall_ms, 1),
+                'p50': self.percentile(0.50),
+                'p95': self.percentile(0.95),
+                'p99': self.percentile(0.99),
+            },
+            'queries': {'avg': round(self.queries / n, 1), 'max': self.max_queries},
+            'sql_ms': {'avg': round(self.sql_ms / n, 1), 'total': round(self.sql_ms, 1)},
+            'duplicate_queries': {
+                'avg': round(self.duplicates / n, 1),
+                'max': self.max_duplicates,
+                'most_repeated': {'sql': sql[:500], 'times': repeats} if sql else None,
+            },
+            'histogram': [
+                {'le_ms': BUCKETS_MS[i] if i < len(BUCKETS_MS) else None, 'count': count}
+                for i, count in enumerate(self.histogram)
+            ],
+        }
+
+
+def _bucket(wall_ms):
+    for i, bound in enumerate(BUCKETS_MS):
+        if wall_ms <= bound:
+            return i
+    return len(BUCKETS_MS)
+
+
+def record(view_name, wall_ms, recorder):
+    slow = wall_ms >= settings.PERF_SLOW_REQUEST_MS
+    with _lock:
+        _stats.setdefault(view_name, ViewStats()).add(wall_ms, recorder, slow)
+    return slow
+
+
+def snapshot():
+    """Per-view stats, slowest total time first"""
+    with _lock:
+        views = sorted(_stats.items(), key=lambda item: item[1].wall_ms, reverse=True)
+        return {
+            'since': _started.isoformat(),
+            'slow_request_ms': settings.PERF_SLOW_REQUEST_MS,
+            'buckets_ms': list(BUCKETS_MS),
+            'views': {name: stats.as_dict() for name, stats in views},
+        }
+
+
+def reset():
+    global _started
+    with _lock:
+        _stats.clear()
+        _started = timezone.now()
+
+
+def view_label(match):
+    """URL name of the resolved view, else its dotted path"""
+    if match is None:
+        return UNRESOLVED
+    if match.view_name:
+        return match.view_name
+    # Class-based (and DRF @api_view) views are named after their class
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{view.__module__}.{getattr(view, "__qualname__", view.__name__)}'
+
+
+class PerfMiddleware:
+    """Time each request and count its queries (see module docstring)"""
+
+    def __init__(self, get_response):
+        if not settings.PERF_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_ms = (time.perf_counter() - start) * 1000
+
+        view_name = view_label(getattr(request, 'resolver_match', None))
+        if record(view_name, wall_ms, recorder):
+            logger.warning(
+                'Slow request: %s %s (%s) took %.0f ms, %d queries (%.0f ms SQL, %d duplicated)',
+                request.method, request.path, view_name, wall_ms,
+                recorder.count, recorder.seconds * 1000, recorder.duplicates,
+            )
+        return response
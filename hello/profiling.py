@@ -0,0 +1,259 @@
+"""On-demand cProfile captures and named timing spans.
+
+An admin can profile a single request by adding ``?profile=1`` to the URL
+or sending an ``X-Profile: 1`` header. ``ProfileMiddleware`` then runs the
+rest of the request under ``cProfile`` and saves two files in
+``PROFILE_DIR``: ``<id>.prof`` (open it with ``python -m pstats`` or
+snakeviz) and ``<id>.json`` with the top ``PROFILE_TOP_N`` functions by
+cumulative time and the spans recorded during the request. The response
+carries ``X-Profile-Id`` and a ``Server-Timing`` header with the spans, and
+the saved reports are listed at ``/admin/profiles/``. ``manage.py
+profile_view <url>`` does the same from the command line.
+
+Spans name the stages of long jobs, e.g. ``import_schedules.load`` or
+``import_schedules.search``. They cost two ``perf_counter()`` calls when
+nothing is being profiled and are otherwise only logged at DEBUG level on
+the ``hello.profiling`` logger.
+
+Only one profile runs at a time per process; a request that asks for one
+while another is running is served normally with ``X-Profile: busy``.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ('cumulative', 'tottime', 'calls')
+
+_spans = ContextVar('profiling_spans', default=None)
+_lock = threading.Lock()
+
+
+def _add_span(name, started):
+    ms = (time.perf_counter() - started) * 1000
+    spans = _spans.get()
+    if spans is not None:
+        spans.append({'name': name, 'ms': round(ms, 2)})
+    logger.debug('%s took %.1f ms', name, ms)
+
+
+@contextmanager
+def span(name):
+    """Time the block as a named span"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add_span(name, started)
+
+
+class Stages:
+    """Consecutive spans under one prefix: each ``enter()`` ends the previous stage
+
+        stages = Stages('import_schedules')
+        stages.enter('load')
+        ...
+        stages.enter('search')
+        ...
+        stages.close()
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.current = None
+        self.started = None
+
+    def enter(self, name):
+        self.close()
+        self.current = name
+        self.started = time.perf_counter()
+
+    def close(self):
+        if self.current is not None:
+            _add_span(f'{self.prefix}.{self.current}', self.started)
+            self.current = None
+
+
+class ProfileBusy(RuntimeError):
+    """Another profile is already running in this process"""
+
+
+class Profile:
+    """One cProfile capture plus the spans recorded while it ran"""
+
+    def __init__(self, label):
+        self.label = label
+        self.created = timezone.now()
+        self.id = f"{self.created:%Y%m%dT%H%M%S%f}-{secrets.token_hex(3)}"
+        self.profiler = cProfile.Profile()
+        self.spans = []
+        self.wall_ms = None
+        self._token = None
+        self._started = None
+
+    def start(self):
+        if not _lock.acquire(blocking=False):
+            raise ProfileBusy('another profile is running')
+        self._token = _spans.set(self.spans)
+        self._started = time.perf_counter()
+        self.profiler.enable()
+
+    def stop(self):
+        self.profiler.disable()
+        self.wall_ms = round((time.perf_counter() - self._started) * 1000, 2)
+        _spans.reset(self._token)
+        _lock.release()
+
+    @contextmanager
+    def running(self):
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def top(self, limit=None, sort='cumulative'):
+        """The ``limit`` most expensive functions as dicts, sorted by ``sort``"""
+        stats = pstats.Stats(self.profiler)
+        stats.sort_stats(sort)
+        rows = []
+        for func in stats.fcn_list[:limit or settings.PROFILE_TOP_N]:
+            primitive_calls, calls, tottime, cumtime, _ = stats.stats[func]
+            rows.append({
+                'function': pstats.func_std_string(func),
+                'calls': calls,
+                'primitive_calls': primitive_calls,
+                'tottime_ms': round(tottime * 1000, 2),
+                'cumtime_ms': round(cumtime * 1000, 2),
+            })
+        return rows
+
+    def report(self, limit=None, sort='cumulative'):
+        return {
+            'id': self.id,
+            'label': self.label,
+            'created': self.created.isoformat(),
+            'wall_ms': self.wall_ms,
+            'spans': self.spans,
+            'sort': sort,
+            'top': self.top(limit, sort),
+        }
+
+    def save(self, limit=None, sort='cumulative'):
+        """Write ``<id>.prof`` and ``<id>.json`` to PROFILE_DIR; returns the report"""
+        directory = settings.PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+        self.profiler.dump_stats(prof_path(self.id))
+        report = self.report(limit, sort)
+        with open(os.path.join(directory, f'{self.id}.json'), 'w') as fh:
+            json.dump(report, fh, indent=2)
+        prune()
+        return report
+
+    def server_timing(self):
+        parts = [f'total;dur={self.wall_ms}']
+        for i, item in enumerate(self.spans):
+            parts.append(f'span{i};desc="{item["name"]}";dur={item["ms"]}')
+        return ', '.join(parts)
+
+
+def prof_path(profile_id):
+    return os.path.join(settings.PROFILE_DIR, f'{profile_id}.prof')
+
+
+def load_report(profile_id):
+    """Saved report for ``profile_id`` or None"""
+    try:
+        with open(os.path.join(settings.PROFILE_DIR, f'{profile_id}.json')) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def saved_reports():
+    """Summaries of the saved reports, newest first"""
+    try:
+        names = os.listdir(settings.PROFILE_DIR)
+    except OSError:
+        return []
+    reports = []
+    for name in sorted(names, reverse=True):
+        if name.endswith('.json'):
+            report = load_report(name[:-len('.json')])
+            if report:
+                reports.append({key: report.get(key) for key in ('id', 'label', 'created', 'wall_ms')})
+    return reports
+
+
+def prune():
+    """Keep only the newest PROFILE_KEEP captures"""
+    ids = sorted(
+        (name[:-len('.json')] for name in os.listdir(settings.PROFILE_DIR) if name.endswith('.json')),
+        reverse=True,
+    )
+    for profile_id in ids[settings.PROFILE_KEEP:]:
+        for suffix in ('.json', '.prof'):
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, profile_id + suffix))
+            except OSError:
+                pass
+
+
+def wants_profile(request):
+    if request.GET.get('profile') != '1' and request.headers.get('X-Profile') != '1':
+        return False
+    user = getattr(request, 'user', None)
+    # Same rule as views.is_admin
+    return bool(user and user.is_authenticated and user.is_staff and user.is_superuser)
+
+
+class ProfileMiddleware:
+    """Profile requests from admins that ask for it (see module docstring).
+
+    Has to come after AuthenticationMiddleware. Streaming responses are
+    profiled until the response object is returned, not while the body is
+    sent.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILE_REQUESTS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not wants_profile(request):
+            return self.get_response(request)
+
+        profile = Profile(f'{request.method} {request.get_full_path()}')
+        try:
+            profile.start()
+        except ProfileBusy:
+            response = self.get_response(request)
+            response['X-Profile'] = 'busy'
+            return response
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.stop()
+
+        try:
+            profile.save()
+        except OSError:
+            logger.exception('Could not save profile %s', profile.id)
+            response['X-Profile'] = 'error'
+            return response
+        response['X-Profile-Id'] = profile.id
+        response['Server-Timing'] = profile.server_timing()
+        return response
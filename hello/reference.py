@@ -0,0 +1,100 @@
+"""Cached reference lists for the admin pages' dropdowns.
+
+The create/edit schedule, section and faculty modals need every course,
+faculty member, section, room and curriculum. Each list is cached (as
+model instances limited to the fields the dropdowns show) under its own
+tag, ``list:courses`` and so on, which ``hello/signals.py`` bumps when a
+row of that model is added, edited or deleted. Schedule edits, by far
+the most frequent write, leave the lists cached.
+
+``GET /api/reference/`` returns the same lists as JSON for modals that
+load them lazily, with an ETag built from the list versions.
+
+``faculty_for_user()`` replaces the ``Faculty.objects.get(user=...)``
+lookups the page views ran for the header: the profile (or None) is cached
+under the ``user:<id>`` tag and remembered on the user object for the
+rest of the request.
+"""
+from django.conf import settings
+
+from .caching import get_or_build, tag, tagged_key
+from .models import Course, Curriculum, Faculty, Room, Section
+
+LISTS = {
+    'curricula': lambda: Curriculum.objects.only('id', 'name', 'year').order_by('-year', 'name'),
+    'courses': lambda: Course.objects.only(
+        'id', 'course_code', 'descriptive_title', 'curriculum_id', 'year_level', 'semester',
+        'lecture_hours', 'laboratory_hours', 'credit_units', 'color',
+    ).order_by('course_code'),
+    'faculty': lambda: Faculty.objects.only(
+        'id', 'first_name', 'last_name', 'email', 'employment_status',
+    ).order_by('last_name', 'first_name'),
+    'sections': lambda: Section.objects.select_related('curriculum').only(
+        'id', 'name', 'year_level', 'semester', 'status', 'curriculum__id', 'curriculum__name', 'curriculum__year',
+    ).order_by('year_level', 'semester', 'name'),
+    'rooms': lambda: Room.objects.only(
+        'id', 'name', 'room_number', 'campus', 'room_type',
+    ).order_by('campus', 'room_number'),
+}
+
+SERIALIZERS = {
+    'curricula': lambda c: {'id': c.id, 'name': c.name, 'year': c.year},
+    'courses': lambda c: {
+        'id': c.id, 'course_code': c.course_code, 'descriptive_title': c.descriptive_title,
+        'curriculum_id': c.curriculum_id, 'year_level': c.year_level, 'semester': c.semester,
+        'lecture_hours': c.lecture_hours, 'laboratory_hours': c.laboratory_hours, 'credit_units': c.credit_units,
+        'color': c.color,
+    },
+    'faculty': lambda f: {
+        'id': f.id, 'first_name': f.first_name, 'last_name': f.last_name, 'email': f.email,
+        'employment_status': f.employment_status,
+    },
+    'sections': lambda s: {
+        'id': s.id, 'name': s.name, 'year_level': s.year_level, 'semester': s.semester, 'status': s.status,
+        'curriculum_id': s.curriculum.id, 'curriculum': f'{s.curriculum.name} ({s.curriculum.year})',
+    },
+    'rooms': lambda r: {
+        'id': r.id, 'name': r.name, 'room_number': r.room_number, 'campus': r.campus,
+        'room_type': r.room_type, 'room_type_display': r.get_room_type_display(),
+    },
+}
+
+_MISSING = object()
+
+
+def list_tag(name):
+    return tag('list', name)
+
+
+def get_list(name):
+    """Cached list of ``name`` (a key of LISTS)"""
+    key = tagged_key('reference', [list_tag(name)], name)
+    return get_or_build('reference', key, lambda: list(LISTS[name]()), settings.REFERENCE_CACHE_SECONDS)
+
+
+def payload_key(names):
+    return tagged_key('reference-json', [list_tag(name) for name in names], *names)
+
+
+def payload(names, key=None):
+    """``{name: [row, ...]}`` for the JSON endpoint, cached as a whole"""
+    def build():
+        return {name: [SERIALIZERS[name](obj) for obj in get_list(name)] for name in names}
+    return get_or_build(
+        'reference_json', key or payload_key(names), build, settings.REFERENCE_CACHE_SECONDS
+    )
+
+
+def faculty_for_user(user):
+    """The Faculty profile linked to ``user``, or None"""
+    if not user.is_authenticated:
+        return None
+    profile = getattr(user, '_faculty_profile', _MISSING)
+    if profile is _MISSING:
+        key = tagged_key('user-faculty', [tag('user', user.pk)], user.pk)
+        profile = get_or_build(
+            'user_faculty', key, lambda: Faculty.objects.filter(user=user).first(),
+            settings.REFERENCE_CACHE_SECONDS,
+        )
+        user._faculty_profile = profile
+    return profile
@@ -0,0 +1,169 @@
+"""Synthetic datasets for benchmarking (``manage.py seed_scale``).
+
+Builds one curriculum with courses for every year/semester, faculty
+(each with a login), rooms, sections named ``CPE[year][semester]S[n]``
+and schedules, all with ``bulk_create`` so 100k schedules take seconds
+rather than the minutes ``Schedule.save()`` (full_clean plus conflict
+queries per row) would need.
+
+Schedules use a fixed grid of 90-minute slots. A section never gets the
+same slot twice, and each slot hands out faculty and rooms round-robin
+from a random offset, so nobody is double-booked; once a slot runs out
+of faculty or rooms the remaining schedules in it are left TBA. The
+same ``seed`` always produces the same dataset.
+"""
+import random
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from . import live
+from .caching import ALL_SCHEDULES, bump_tags
+from .models import Course, Curriculum, Faculty, Room, Schedule, Section
+
+SLOT_MINUTES = 90
+DAY_START = '07:30'
+DAY_END = '21:30'
+BATCH_SIZE = 1000
+
+
+class SeedError(ValueError):
+    """Invalid seeding parameters"""
+
+
+def time_slots():
+    """``(day, start, end)`` for every 90-minute slot of the week"""
+    start = datetime.strptime(DAY_START, '%H:%M')
+    end = datetime.strptime(DAY_END, '%H:%M')
+    times = []
+    while start + timedelta(minutes=SLOT_MINUTES) <= end:
+        times.append((start.strftime('%H:%M'), (start + timedelta(minutes=SLOT_MINUTES)).strftime('%H:%M')))
+        start += timedelta(minutes=SLOT_MINUTES)
+    return [(day, begin, finish) for day, _ in Schedule.DAY_CHOICES for begin, finish in times]
+
+
+def terms():
+    return [(year, semester) for year, _ in Course.YEAR_CHOICES for semester, _ in Course.SEMESTER_CHOICES]
+
+
+def seed_scale(sections, faculty, rooms, schedules_per_section, seed=0, password=None):
+    """Generate a dataset in one transaction; returns a dict of row counts"""
+    slots = time_slots()
+    if min(sections, faculty, rooms) < 1:
+        raise SeedError('sections, faculty and rooms must be at least 1')
+    if not 0 <= schedules_per_section <= len(slots):
+        raise SeedError(f'schedules per section must be between 0 and {len(slots)}')
+
+    rng = random.Random(seed)
+    term_list = terms()
+    label = f'SCALE{seed}'
+    if Curriculum.objects.filter(name=label).exists():
+        raise SeedError(f'A dataset for seed {seed} already exists (curriculum {label})')
+
+    with transaction.atomic():
+        curriculum = Curriculum.objects.create(name=label, year=timezone.localdate().year)
+
+        palette = Course.COLOR_PALETTE
+        courses = Course.objects.bulk_create([
+            Course(
+                curriculum=curriculum,
+                course_code=f'CPE{year}{semester}{i + 1:02d}',
+                descriptive_title=f'Computer Engineering {year}-{semester} Course {i + 1}',
+                lecture_hours=rng.choice((2, 3)),
+                laboratory_hours=rng.choice((0, 3)),
+                credit_units=rng.choice((2, 3)),
+                year_level=year,
+                semester=semester,
+                color=palette[(index * schedules_per_section + i) % len(palette)],
+            )
+            for index, (year, semester) in enumerate(term_list)
+            for i in range(schedules_per_section)
+        ], batch_size=BATCH_SIZE)
+        courses_by_term = {}
+        for course in courses:
+            courses_by_term.setdefault((course.year_level, course.semester), []).append(course)
+
+        hashed = make_password(password)  # hashed once; unusable when password is None
+        domain = 'tip.edu.ph'
+        users = User.objects.bulk_create([
+            User(
+                username=f'{label.lower()}.f{i}@{domain}', email=f'{label.lower()}.f{i}@{domain}',
+                first_name=f'Faculty{i}', last_name=label.title(), password=hashed, is_staff=True,
+            )
+            for i in range(faculty)
+        ], batch_size=BATCH_SIZE)
+        members = Faculty.objects.bulk_create([
+            Faculty(
+                user=user, first_name=user.first_name, last_name=user.last_name, email=user.email,
+                gender=rng.choice('MF'),
+                employment_status=rng.choice(('full_time', 'full_time', 'part_time')),
+                department='Computer Engineering',
+            )
+            for user in users
+        ], batch_size=BATCH_SIZE)
+
+        room_rows = Room.objects.bulk_create([
+            Room(
+                name=f'{label} Room {i + 1}', room_number=f'{i + 1:04d}',
+                campus='arlegui' if i % 2 else 'casal',
+                room_type='laboratory' if i % 3 == 0 else 'lecture',
+            )
+            for i in range(rooms)
+        ], batch_size=BATCH_SIZE)
+
+        counters = {}
+        section_rows = []
+        for i in range(sections):
+            year, semester = term_list[i % len(term_list)]
+            number = counters[year, semester] = counters.get((year, semester), 0) + 1
+            section_rows.append(Section(
+                name=f'CPE{year}{semester}S{number}', year_level=year, semester=semester,
+                curriculum=curriculum, status='complete' if schedules_per_section else 'incomplete',
+            ))
+        section_rows = Section.objects.bulk_create(section_rows, batch_size=BATCH_SIZE)
+
+        # Per slot: how many faculty/rooms are taken and where the rotation starts
+        taken = [[0, 0] for _ in slots]
+        offsets = [(rng.randrange(faculty), rng.randrange(rooms)) for _ in slots]
+        schedules = []
+        specializations = set()
+        unassigned = 0
+        for section in section_rows:
+            section_courses = courses_by_term[section.year_level, section.semester]
+            for course, slot in zip(section_courses, rng.sample(range(len(slots)), schedules_per_section)):
+                day, start, end = slots[slot]
+                used_faculty, used_rooms = taken[slot]
+                member = members[(offsets[slot][0] + used_faculty) % faculty] if used_faculty < faculty else None
+                room = room_rows[(offsets[slot][1] + used_rooms) % rooms] if used_rooms < rooms else None
+                taken[slot] = [used_faculty + 1, used_rooms + 1]
+                if member is None or room is None:
+                    unassigned += 1
+                if member is not None:
+                    specializations.add((member.id, course.id))
+                schedules.append(Schedule(
+                    course=course, section=section, faculty=member, room=room,
+                    day=day, start_time=start, end_time=end, duration=SLOT_MINUTES,
+                ))
+        Schedule.objects.bulk_create(schedules, batch_size=BATCH_SIZE)
+
+        Through = Faculty.specialization.through
+        Through.objects.bulk_create([
+            Through(faculty_id=faculty_id, course_id=course_id) for faculty_id, course_id in sorted(specializations)
+        ], batch_size=BATCH_SIZE)
+
+    # bulk_create does not send post_save, so invalidate cached data and
+    # tell open pages (everything may have changed) here
+    bump_tags(ALL_SCHEDULES, 'list:curricula', 'list:courses', 'list:faculty', 'list:sections', 'list:rooms')
+    live.record('bulk', live.affected_by([]))
+    return {
+        'curriculum': curriculum.id,
+        'courses': len(courses),
+        'faculty': len(members),
+        'rooms': len(room_rows),
+        'sections': len(section_rows),
+        'schedules': len(schedules),
+        'unassigned': unassigned,
+    }
@@ -0,0 +1,207 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import live
+from .caching import ALL_SCHEDULES, bump_tags, schedule_tags, tag
+from .models import Activity, Curriculum, Course, DeletedRecord, Faculty, OutboundEmail, Section, Room, Schedule
+from .sync import ENTITY_TYPES
+
+SCHEDULING_MODELS = (Curriculum, Course, Faculty, Section, Room, Schedule)
+
+# Log-style tables: one tag each, bumped on save only. Their bulk deletes
+# (archival, pruning) bump the tag themselves instead of paying for a
+# delete listener (see below).
+LOG_MODEL_TAGS = {Activity: 'activity', DeletedRecord: 'sync', OutboundEmail: 'outbox'}
+
+REFERENCE_FIELDS = ('section_id', 'faculty_id', 'room_id')
+
+# Cached dropdown lists (hello/reference.py) showing each model; sections
+# are listed with their curriculum's name
+LIST_TAGS = {
+    Curriculum: ('list:curricula', 'list:sections'),
+    Course: ('list:courses',),
+    Faculty: ('list:faculty',),
+    Section: ('list:sections',),
+    Room: ('list:rooms',),
+    Schedule: (),
+}
+
+
+def _schedule_rows(**filters):
+    return Schedule.objects.filter(**filters).values_list(*REFERENCE_FIELDS).distinct()
+
+
+def tags_for(instance):
+    """Cache tags affected by a change to a scheduling row.
+
+    Besides the row's own tag this includes the section, faculty and room
+    tags of every schedule that displays it (a renamed room shows up on
+    the section and faculty timetables), ``all-schedules`` and the tag of
+    the cached list the row appears in.
+    """
+    return _entity_tags(instance) | set(LIST_TAGS[type(instance)])
+
+
+def _entity_tags(instance):
+    if isinstance(instance, Schedule):
+        return schedule_tags([(instance.section_id, instance.faculty_id, instance.room_id)])
+    if isinstance(instance, Curriculum):
+        tags = {tag('curriculum', instance.pk), ALL_SCHEDULES}
+        tags.update(tag('section', pk) for pk in instance.sections.values_list('id', flat=True))
+        return tags
+    if isinstance(instance, Course):
+        tags = schedule_tags(_schedule_rows(course_id=instance.pk))
+        tags.add(tag('curriculum', instance.curriculum_id))
+        return tags
+    if isinstance(instance, Section):
+        tags = schedule_tags(_schedule_rows(section_id=instance.pk))
+        tags.update((tag('section', instance.pk), tag('curriculum', instance.curriculum_id)))
+        return tags
+    kind = 'faculty' if isinstance(instance, Faculty) else 'room'
+    tags = schedule_tags(_schedule_rows(**{f'{kind}_id': instance.pk}))
+    tags.add(tag(kind, instance.pk))
+    if kind == 'faculty' and instance.user_id:
+        # reference.faculty_for_user() caches the profile per user
+        tags.add(tag('user', instance.user_id))
+    return tags
+
+
+def remember_schedule_references(sender, instance, **kwargs):
+    """A moved schedule also invalidates the section/faculty/room it left"""
+    instance._previous_references = None
+    if not instance._state.adding and instance.pk:
+        instance._previous_references = _schedule_rows(pk=instance.pk).first()
+
+
+def invalidate_on_save(sender, instance, **kwargs):
+    tags = tags_for(instance)
+    previous = getattr(instance, '_previous_references', None)
+    if previous:
+        tags |= schedule_tags([previous])
+    bump_tags(*tags)
+
+
+def delete_tags(instance):
+    """``tags_for()`` a row that is being deleted.
+
+    Courses, sections and schedules removed with it by the cascade add
+    their own tags, so only instructors and rooms, whose schedules stay
+    behind unassigned, look up the schedules showing them.
+    """
+    if isinstance(instance, (Faculty, Room)):
+        return tags_for(instance)
+    if isinstance(instance, Schedule):
+        tags = schedule_tags([(instance.section_id, instance.faculty_id, instance.room_id)])
+    else:
+        curriculum_id = instance.pk if isinstance(instance, Curriculum) else instance.curriculum_id
+        tags = {ALL_SCHEDULES, tag('curriculum', curriculum_id)}
+        if isinstance(instance, Section):
+            tags.add(tag('section', instance.pk))
+    return tags | set(LIST_TAGS[type(instance)])
+
+
+def record_schedule_save(sender, instance, created, **kwargs):
+    """Live feed event (hello/live.py), naming where the schedule was and is"""
+    rows = [(instance.section_id, instance.faculty_id, instance.room_id)]
+    previous = getattr(instance, '_previous_references', None)
+    if previous:
+        rows.append(previous)
+    live.record('created' if created else 'updated', live.affected_by(rows), instance.pk, live.schedule_row(instance))
+
+
+def record_schedule_delete(sender, instance, **kwargs):
+    rows = [(instance.section_id, instance.faculty_id, instance.room_id)]
+    live.record('deleted', live.affected_by(rows), instance.pk)
+
+
+def invalidate_log_tag(sender, **kwargs):
+    bump_tags(LOG_MODEL_TAGS[sender])
+
+
+class _DeleteBatch:
+    """Rows removed by one ``delete()`` call, including what it cascades to"""
+
+    def __init__(self):
+        self.seen = set()
+        self.remaining = 0
+        self.tags = {LOG_MODEL_TAGS[DeletedRecord]}
+        self.tombstones = []
+
+
+def _delete_batch(origin):
+    return getattr(origin, '_delete_batch', None)
+
+
+def collect_delete(sender, instance, origin=None, **kwargs):
+    """Count the rows of a delete and gather their cache tags, computed
+    while dependent schedules still point at them"""
+    origin = origin if origin is not None else instance
+    batch = _delete_batch(origin)
+    key = (sender, instance.pk)
+    if batch is None or key in batch.seen:
+        # The first row of this delete, or a retry of one that failed
+        batch = origin._delete_batch = _DeleteBatch()
+    batch.seen.add(key)
+    batch.remaining += 1
+    batch.tags |= delete_tags(instance)
+
+
+def finish_delete(sender, instance, origin=None, **kwargs):
+    """Leave a tombstone so delta sync can report the delete.
+
+    A cascade (a section and all its schedules) sends one post_delete per
+    row; after the last one the tombstones are written together and the
+    cache tags of every row are bumped once, when the delete commits.
+    """
+    origin = origin if origin is not None else instance
+    batch = _delete_batch(origin)
+    batch.tombstones.append(DeletedRecord(entity_type=ENTITY_TYPES[sender], object_id=instance.pk))
+    batch.remaining -= 1
+    if not batch.remaining:
+        del origin._delete_batch
+        DeletedRecord.objects.bulk_create(batch.tombstones)
+        transaction.on_commit(lambda: bump_tags(*batch.tags))
+
+
+# Connected per model rather than for every sender: a delete listener on a
+# model disables Django's fast (single DELETE) path for it, which would make
+# bulk deletes of unrelated tables such as Activity fetch every row first.
+for model in SCHEDULING_MODELS:
+    post_save.connect(invalidate_on_save, sender=model)
+    pre_delete.connect(collect_delete, sender=model)
+    post_delete.connect(finish_delete, sender=model)
+pre_save.connect(remember_schedule_references, sender=Schedule)
+post_save.connect(record_schedule_save, sender=Schedule)
+post_delete.connect(record_schedule_delete, sender=Schedule)
+
+for model in LOG_MODEL_TAGS:
+    post_save.connect(invalidate_log_tag, sender=model)
+
+
+@receiver(pre_delete, sender=Faculty)
+@receiver(pre_delete, sender=Room)
+def touch_unassigned_schedules(sender, instance, **kwargs):
+    """Schedules are SET_NULL'd by a queryset update, which skips auto_now
+    and sends no signals"""
+    field = 'faculty' if sender is Faculty else 'room'
+    rows = list(_schedule_rows(**{field: instance}))
+    if rows:
+        Schedule.objects.filter(**{field: instance}).update(updated_at=timezone.now())
+        live.record('bulk', live.affected_by(rows))
+
+
+@receiver(m2m_changed, sender=Faculty.specialization.through)
+def invalidate_specialization_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Specializations are part of cached faculty data"""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            bump_tags(ALL_SCHEDULES, tag('faculty', instance.pk))
+        return
+    # instance is a Course; a clear has no pk_set, so note the faculty first
+    if action == 'pre_clear':
+        instance._cleared_faculty = list(instance.specialized_faculty.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        faculty_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_faculty', [])
+        bump_tags(ALL_SCHEDULES, *(tag('faculty', pk) for pk in faculty_ids))
@@ -0,0 +1,53 @@
+// Dropdown options for the schedule modals. The lists come from the cached
+// /api/reference/ endpoint (hello/reference.py) the first time a modal
+// opens, instead of being rendered into every page load.
+const referenceRequests = {};
+const REFERENCE_YEARS = { 1: '1st', 2: '2nd', 3: '3rd' };
+const REFERENCE_LABELS = {
+    courses: course => `${course.course_code} - ${course.descriptive_title}`,
+    faculty: member => `${member.last_name}, ${member.first_name}`,
+    sections: section => `${section.name} - ${REFERENCE_YEARS[section.year_level] || '4th'} Year, ${section.semester === 1 ? '1st' : '2nd'} Semester`,
+    rooms: room => `${room.room_type_display}: ${room.campus === 'arlegui' ? 'A' : 'C'}-${room.room_number}`,
+};
+
+function loadReferenceLists(names) {
+    const missing = names.filter(name => !referenceRequests[name]);
+    if (missing.length) {
+        const request = fetch(`/api/reference/?lists=${missing.join(',')}`, { credentials: 'same-origin' })
+            .then(res => {
+                if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                return res.json();
+            });
+        missing.forEach(name => {
+            referenceRequests[name] = request.then(data => data[name]);
+        });
+        // A failed load is retried the next time a modal opens
+        request.catch(() => missing.forEach(name => { delete referenceRequests[name]; }));
+    }
+    return Promise.all(names.map(name => referenceRequests[name]))
+        .then(rows => Object.fromEntries(names.map((name, i) => [name, rows[i]])));
+}
+
+function referenceOption(name, row) {
+    const option = document.createElement('option');
+    option.value = row.id;
+    option.textContent = REFERENCE_LABELS[name](row);
+    if (name === 'sections') {
+        option.dataset.sectionName = row.name;
+        option.dataset.sectionCurriculum = row.curriculum;
+    }
+    return option;
+}
+
+// Fill each [select, listName] pair once, after its placeholder option
+function populateReferenceSelects(pairs) {
+    const pending = pairs.filter(([select]) => select && !select.dataset.populated);
+    const names = [...new Set(pending.map(([, name]) => name))];
+    return loadReferenceLists(names).then(lists => {
+        pending.forEach(([select, name]) => {
+            if (select.dataset.populated) return;
+            lists[name].forEach(row => select.appendChild(referenceOption(name, row)));
+            select.dataset.populated = 'true';
+        });
+    });
+}
@@ -17,7 +17,22 @@ let currentSectionId = null;
         }
 
         // Modal management
+        function scheduleModalSelects(prefix = '') {
+            return [
+                [document.getElementById(`${prefix}course_select`), 'courses'],
+                [document.getElementById(`${prefix}faculty_select`), 'faculty'],
+                [document.getElementById(`${prefix}room_select`), 'rooms'],
+            ];
+        }
+
         function openScheduleModal() {
+            const selects = [...scheduleModalSelects(), [document.getElementById('section_select'), 'sections']];
+            populateReferenceSelects(selects)
+                .then(resetScheduleModal)
+                .catch(() => showAlert('Error loading form options', 'error'));
+        }
+
+        function resetScheduleModal() {
             // Reset form fields
             document.getElementById('course_select').value = '';
             document.getElementById('faculty_select').value = '';
@@ -622,9 +637,11 @@ let currentSectionId = null;
         function openEditScheduleModal(scheduleId) {
             currentEditScheduleId = scheduleId;
             
-            fetch(`/admin/schedule/edit/${scheduleId}/`)
-                .then(res => res.json())
-                .then(data => {
+            Promise.all([
+                fetch(`/admin/schedule/edit/${scheduleId}/`).then(res => res.json()),
+                populateReferenceSelects(scheduleModalSelects('edit_')),
+            ])
+                .then(([data]) => {
                     document.getElementById('edit_schedule_id').value = data.id;
                     document.getElementById('edit_course_select').value = data.course;
                     document.getElementById('edit_faculty_select').value = data.faculty;
@@ -1330,20 +1347,316 @@ let currentSectionId = null;
         }
 
         // Utility functions
-        function filterSections() {
-            const searchInput = document.getElementById('searchInput').value.toLowerCase();
-            const sectionCards = document.querySelectorAll('.section-card');
-            sectionCards.forEach(card => {
-                const name = card.dataset.sectionName || '';
-                const curriculum = card.dataset.curriculum || '';
-                if (name.includes(searchInput) || curriculum.includes(searchInput)) {
-                    card.style.display = 'flex';
-                } else {
-                    card.style.display = 'none';
+        // ===== Section list: first page embedded by schedule_view, the rest
+        // and every search paged from /api/sections/ (keyset cursor) =====
+        const sectionList = { nextCursor: null, loading: false, request: 0, fields: '', pageSize: 24, statusLabels: {} };
+        const YEAR_LABELS = { 1: '1st Year', 2: '2nd Year', 3: '3rd Year', 4: '4th Year' };
+
+        function escapeHtml(value) {
+            return String(value ?? '').replace(/[&<>"']/g, ch => (
+                { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' }[ch]
+            ));
+        }
+
+        function renderSectionCard(section) {
+            const curriculum = `${section.curriculum_name} (${section.curriculum_year})`;
+            const card = document.createElement('div');
+            card.className = 'section-card';
+            card.dataset.sectionId = section.id;
+            if (String(section.id) === String(currentSectionId)) card.classList.add('selected');
+            card.innerHTML = `
+                <div class="card-header">
+                    <div class="card-header-left">
+                        <div class="card-title">${escapeHtml(section.name)}</div>
+                        <div class="card-subtitle">${escapeHtml(curriculum)}</div>
+                    </div>
+                    <div class="card-header-right">
+                        <div class="dropdown-menu-container">
+                            <button class="triple-dot-btn" onclick="event.preventDefault(); event.stopPropagation(); toggleSectionMenu(event, ${section.id})">
+                                <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">
+                                    <circle cx="12" cy="6" r="2"/>
+                                    <circle cx="12" cy="12" r="2"/>
+                                    <circle cx="12" cy="18" r="2"/>
+                                </svg>
+                            </button>
+                            <div class="section-dropdown-menu" id="sectionMenu${section.id}">
+                                <button class="dropdown-item" onclick="openEditSectionModal(${section.id})">
+                                    <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">
+                                        <path d="M3 17.25V21h3.75L17.81 9.94l-3.75-3.75L3 17.25zM20.71 7.04c.39-.39.39-1.02 0-1.41l-2.34-2.34c-.39-.39-1.02-.39-1.41 0l-1.83 1.83 3.75 3.75 1.83-1.83z"/>
+                                    </svg>
+                                    Edit
+                                </button>
+                                <button class="dropdown-item delete-item">
+                                    <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 24">
+                                        <path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/>
+                                    </svg>
+                                    Delete
+                                </button>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+
+                <div class="card-body">
+                    <div class="info-row">
+                        <div class="info-group">
+                            <div class="info-label">STATUS</div>
+                            <div class="info-value status-value" id="status-${section.id}"
+                                 onclick="event.preventDefault(); event.stopPropagation(); toggleStatus(event, ${section.id})"
+                                 style="cursor: pointer; color: ${section.status === 'complete' ? '#28a745' : '#dc3545'};">
+                                ${escapeHtml(sectionList.statusLabels[section.status] || section.status)}
+                            </div>
+                        </div>
+                        <div class="info-group">
+                            <div class="info-label">YEAR LEVEL</div>
+                            <div class="info-value">${YEAR_LABELS[section.year_level] || '4th Year'}</div>
+                        </div>
+                        <div class="info-group">
+                            <div class="info-label">SEMESTER</div>
+                            <div class="info-value">${section.semester === 1 ? '1st' : '2nd'}</div>
+                        </div>
+                        <div class="info-group">
+                            <div class="info-label">CURRICULUM</div>
+                            <div class="info-value">${escapeHtml(curriculum)}</div>
+                        </div>
+                        <div class="info-group">
+                            <div class="info-label">TOTAL UNITS</div>
+                            <div class="info-value">${section.total_units}</div>
+                        </div>
+                    </div>
+                </div>`;
+            card.querySelector('.delete-item').addEventListener('click', () => deleteSection(section.id, section.name));
+            card.addEventListener('click', event => {
+                if (!event.target.closest('.triple-dot-btn, .status-value, .dropdown-item, .section-dropdown-menu')) {
+                    loadScheduleView(section.id, section.name, curriculum);
                 }
             });
+            return card;
+        }
+
+        function appendSections(results, nextCursor) {
+            const container = document.getElementById('sectionsContainer');
+            const sentinel = document.getElementById('sectionsSentinel');
+            results.forEach(section => container.insertBefore(renderSectionCard(section), sentinel));
+            sectionList.nextCursor = nextCursor;
+        }
+
+        function showSectionsEmpty(searching) {
+            const container = document.getElementById('sectionsContainer');
+            const isEmpty = !container.querySelector('.section-card');
+            container.style.display = isEmpty ? 'none' : '';
+            document.getElementById('sectionsEmptyState').style.display = isEmpty ? '' : 'none';
+            document.getElementById('sectionsEmptyText').textContent = searching
+                ? 'No sections match your search.'
+                : 'No sections available. Create a section first.';
+        }
+
+        function sectionQuery(cursor) {
+            const params = new URLSearchParams({ fields: sectionList.fields, limit: sectionList.pageSize });
+            const filters = {
+                q: document.getElementById('searchInput').value.trim(),
+                curriculum: document.getElementById('sectionCurriculumFilter').value,
+                year: document.getElementById('sectionYearFilter').value,
+                semester: document.getElementById('sectionSemesterFilter').value,
+                status: document.getElementById('sectionStatusFilter').value,
+            };
+            Object.entries(filters).forEach(([key, value]) => { if (value) params.set(key, value); });
+            if (cursor) params.set('cursor', cursor);
+            return { params, searching: Object.values(filters).some(Boolean) };
+        }
+
+        function fetchSections(cursor) {
+            // Responses to superseded searches are dropped
+            const request = ++sectionList.request;
+            const { params, searching } = sectionQuery(cursor);
+            sectionList.loading = true;
+            return fetch(`/api/sections/?${params}`, { credentials: 'same-origin' })
+                .then(res => {
+                    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                    return res.json();
+                })
+                .then(data => {
+                    if (request !== sectionList.request) return;
+                    if (!cursor) {
+                        document.querySelectorAll('#sectionsContainer .section-card').forEach(card => card.remove());
+                    }
+                    appendSections(data.results, data.next_cursor);
+                    showSectionsEmpty(searching);
+                })
+                .catch(err => {
+                    console.error('fetchSections error', err);
+                    showAlert('Error loading sections', 'error');
+                })
+                .finally(() => {
+                    if (request === sectionList.request) sectionList.loading = false;
+                });
+        }
+
+        let sectionSearchTimer = null;
+        function filterSections() {
+            clearTimeout(sectionSearchTimer);
+            sectionSearchTimer = setTimeout(() => {
+                document.getElementById('sectionsContainer').scrollTop = 0;
+                fetchSections(null);
+            }, 250);
+        }
+
+        function loadMoreSections() {
+            if (sectionList.loading || !sectionList.nextCursor) return;
+            fetchSections(sectionList.nextCursor);
+        }
+
+        function initSectionList() {
+            const dataEl = document.getElementById('sectionPageData');
+            if (!dataEl) return;
+            const page = JSON.parse(dataEl.textContent);
+            sectionList.fields = page.fields;
+            sectionList.pageSize = page.page_size;
+            sectionList.statusLabels = page.status_labels;
+            appendSections(page.results, page.next_cursor);
+            showSectionsEmpty(false);
+
+            const container = document.getElementById('sectionsContainer');
+            const sentinel = document.getElementById('sectionsSentinel');
+            if ('IntersectionObserver' in window) {
+                new IntersectionObserver(entries => {
+                    if (entries.some(entry => entry.isIntersecting)) loadMoreSections();
+                }, { root: container, rootMargin: '200px' }).observe(sentinel);
+            } else {
+                container.addEventListener('scroll', () => {
+                    if (container.scrollTop + container.clientHeight >= container.scrollHeight - 200) loadMoreSections();
+                });
+            }
+        }
+
+        document.addEventListener('DOMContentLoaded', initSectionList);
+
+        // ===== Live schedule changes from other admins (hello/live.py): a
+        // Server-Sent Events stream, or polling when the server answers the
+        // stream with 204 (WSGI) =====
+        const liveFeed = { lastId: null, pollSeconds: 5, refreshTimer: null };
+
+        function refreshCurrentSection() {
+            // A burst of changes to the open section redraws it once
+            clearTimeout(liveFeed.refreshTimer);
+            liveFeed.refreshTimer = setTimeout(() => {
+                const sectionName = document.getElementById('scheduleSectionName').textContent;
+                const curriculum = document.getElementById('scheduleCurriculum').textContent;
+                loadScheduleView(currentSectionId, sectionName, curriculum);
+            }, 300);
+        }
+
+        // An event row (hello/live.py schedule_row) in the shape of
+        // /admin/section/<id>/schedule-data/, or null when the course is not
+        // in the reference lists loaded so far
+        function liveScheduleItem(row, lists) {
+            const course = lists.courses.find(c => c.id === row.course);
+            if (!course) return null;
+            const member = lists.faculty.find(f => f.id === row.faculty);
+            const room = lists.rooms.find(r => r.id === row.room);
+            return {
+                id: row.id,
+                day: row.day,
+                start_time: row.start_time,
+                end_time: row.end_time,
+                duration: row.duration,
+                course_id: course.id,
+                course_code: course.course_code,
+                course_title: course.descriptive_title,
+                course_color: course.color,
+                faculty: member ? `${member.first_name} ${member.last_name}` : 'TBA',
+                room: room ? room.name : 'TBA',
+                section_name: document.getElementById('scheduleSectionName').textContent,
+            };
+        }
+
+        function showPatchedSchedules(schedules, courses) {
+            schedules.sort((a, b) => (a.day - b.day) || a.start_time.localeCompare(b.start_time));
+            currentSchedules = schedules;
+            renderScheduleGrid(schedules);
+            const courseIds = [...new Set(schedules.map(schedule => schedule.course_id))];
+            renderCoursesSidebar(courseIds.map(id => courses.find(course => course.id === id)).filter(Boolean));
+            filterAvailableInstructors('faculty_select');
+        }
+
+        function applyLiveChange(change) {
+            const everything = change.action === 'bulk'
+                && !change.sections.length && !change.faculty.length && !change.rooms.length;
+            if (everything) {
+                facultyScheduleCache = {};
+            } else {
+                change.faculty.forEach(id => { delete facultyScheduleCache[id]; });
+            }
+            if (!currentSectionId) return;
+            if (change.action === 'bulk') {
+                if (everything || change.sections.includes(Number(currentSectionId))) refreshCurrentSection();
+                return;
+            }
+
+            // Single-row events patch the open grid in place
+            const sectionId = currentSectionId;
+            const shown = currentSchedules.some(schedule => schedule.id === change.schedule);
+            const belongs = change.action !== 'deleted' && change.row && String(change.row.section) === String(sectionId);
+            if (!shown && !belongs) return;
+            loadReferenceLists(['courses', 'faculty', 'rooms'])
+                .then(lists => {
+                    if (String(currentSectionId) !== String(sectionId)) return;
+                    const schedules = currentSchedules.filter(schedule => schedule.id !== change.schedule);
+                    if (belongs) {
+                        const item = liveScheduleItem(change.row, lists);
+                        if (!item) {
+                            refreshCurrentSection();
+                            return;
+                        }
+                        schedules.push(item);
+                    }
+                    showPatchedSchedules(schedules, lists.courses);
+                })
+                .catch(refreshCurrentSection);
+        }
+
+        function pollLiveChanges() {
+            const query = liveFeed.lastId === null ? '' : `?after=${liveFeed.lastId}`;
+            fetch(`/api/live/changes/${query}`, { credentials: 'same-origin' })
+                .then(res => {
+                    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+                    return res.json();
+                })
+                .then(data => {
+                    data.events.forEach(applyLiveChange);
+                    liveFeed.lastId = data.last_id;
+                    liveFeed.pollSeconds = data.poll_seconds;
+                    setTimeout(pollLiveChanges, data.more ? 0 : liveFeed.pollSeconds * 1000);
+                })
+                .catch(() => setTimeout(pollLiveChanges, liveFeed.pollSeconds * 1000));
+        }
+
+        function startLiveFeed() {
+            // Only the admin schedule page embeds the id it was rendered at
+            const afterEl = document.getElementById('liveAfter');
+            if (!afterEl) return;
+            liveFeed.lastId = JSON.parse(afterEl.textContent);
+            if (!window.EventSource) {
+                pollLiveChanges();
+                return;
+            }
+            const source = new EventSource(`/api/live/stream/?after=${liveFeed.lastId}`);
+            source.addEventListener('ready', event => { liveFeed.lastId = Number(event.lastEventId); });
+            source.addEventListener('schedule', event => {
+                liveFeed.lastId = Number(event.lastEventId);
+                applyLiveChange(JSON.parse(event.data));
+            });
+            source.onerror = () => {
+                // CONNECTING means the browser is already resuming the stream
+                if (source.readyState === EventSource.CLOSED) {
+                    source.close();
+                    pollLiveChanges();
+                }
+            };
         }
 
+        document.addEventListener('DOMContentLoaded', startLiveFeed);
+
         function toggleSectionMenu(event, sectionId) {
             event.stopPropagation();
             document.querySelectorAll('.section-dropdown-menu').forEach(menu => {
@@ -0,0 +1,152 @@
+"""Delta sync for offline-capable mobile clients (``GET /api/sync/``).
+
+Every scheduling model carries ``updated_at`` and deletes leave a
+``DeletedRecord`` tombstone (see ``hello/signals.py``). A sync token is a
+signed timestamp; a request with ``?since=<token>`` returns the rows
+changed and the ids deleted after it, plus a new token for the next call.
+
+Rows are read with ``values()``, one query per entity and one for the
+tombstones. The window is widened by ``SYNC_OVERLAP_SECONDS`` so rows
+written by transactions still in flight when the previous token was issued
+are not missed; clients apply changes as upserts, so repeats are harmless.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.utils import timezone
+
+from .caching import bump_tags
+from .models import Course, Curriculum, DeletedRecord, Faculty, Room, Schedule, Section
+
+# (response key, tombstone entity_type, model, {output field: ORM lookup})
+SYNC_ENTITIES = (
+    ('curriculums', 'curriculum', Curriculum, {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+    }),
+    ('courses', 'course', Course, {
+        'id': 'id',
+        'course_code': 'course_code',
+        'descriptive_title': 'descriptive_title',
+        'lecture_hours': 'lecture_hours',
+        'laboratory_hours': 'laboratory_hours',
+        'credit_units': 'credit_units',
+        'year_level': 'year_level',
+        'semester': 'semester',
+        'color': 'color',
+        'curriculum': 'curriculum_id',
+    }),
+    ('sections', 'section', Section, {
+        'id': 'id',
+        'name': 'name',
+        'year_level': 'year_level',
+        'semester': 'semester',
+        'status': 'status',
+        'curriculum': 'curriculum_id',
+    }),
+    ('rooms', 'room', Room, {
+        'id': 'id',
+        'name': 'name',
+        'room_number': 'room_number',
+        'capacity': 'capacity',
+        'campus': 'campus',
+        'room_type': 'room_type',
+    }),
+    ('faculty', 'faculty', Faculty, {
+        'id': 'id',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'email': 'email',
+        'gender': 'gender',
+        'employment_status': 'employment_status',
+        'department': 'department',
+        'highest_degree': 'highest_degree',
+        'prc_licensed': 'prc_licensed',
+    }),
+    ('schedules', 'schedule', Schedule, {
+        'id': 'id',
+        'course': 'course_id',
+        'section': 'section_id',
+        'faculty': 'faculty_id',
+        'room': 'room_id',
+        'day': 'day',
+        'start_time': 'start_time',
+        'end_time': 'end_time',
+        'duration': 'duration',
+    }),
+)
+
+ENTITY_TYPES = {model: entity_type for _, entity_type, model, _ in SYNC_ENTITIES}
+
+_signer = signing.Signer(salt='hello.sync-token')
+
+
+class SyncTokenError(ValueError):
+    """The ``since`` token was tampered with or is malformed"""
+
+
+def make_token(moment):
+    """Opaque sync token for a point in time"""
+    micros = int(moment.timestamp() * 1_000_000)
+    return _signer.sign(str(micros))
+
+
+def parse_token(token):
+    """Return the datetime a token was issued at"""
+    try:
+        micros = int(_signer.unsign(token))
+    except (signing.BadSignature, ValueError):
+        raise SyncTokenError('Invalid sync token')
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def tombstone_cutoff(now=None):
+    """Tombstones older than this are pruned; older tokens need a full sync"""
+    return (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def changes_since(since=None):
+    """Build the sync payload for a ``since`` datetime (None = full sync).
+
+    Returns ``{'token', 'full', 'changes': {key: [rows]}, 'deleted': {key: [ids]}}``.
+    A token older than the tombstone retention window is answered with a
+    full sync, as deletes before the cutoff can no longer be reported.
+    """
+    now = timezone.now()
+    full = since is None or since < tombstone_cutoff(now)
+    after = None if full else since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS)
+
+    changes = {}
+    for key, _, model, field_map in SYNC_ENTITIES:
+        qs = model.objects.order_by('id')
+        if after is not None:
+            qs = qs.filter(updated_at__gte=after)
+        changes[key] = [
+            {field: record[lookup] for field, lookup in field_map.items()}
+            for record in qs.values(*field_map.values())
+        ]
+
+    deleted = {key: [] for key, _, _, _ in SYNC_ENTITIES}
+    if after is not None:
+        keys = {entity_type: key for key, entity_type, _, _ in SYNC_ENTITIES}
+        tombstones = DeletedRecord.objects.filter(deleted_at__gte=after).order_by('id')
+        for entity_type, object_id in tombstones.values_list('entity_type', 'object_id'):
+            if entity_type in keys:
+                deleted[keys[entity_type]].append(object_id)
+
+    return {
+        'token': make_token(now),
+        'full': full,
+        'changes': changes,
+        'deleted': deleted,
+    }
+
+
+def prune_tombstones(now=None):
+    """Delete tombstones past the retention window; returns how many"""
+    count, _ = DeletedRecord.objects.filter(deleted_at__lt=tombstone_cutoff(now)).delete()
+    if count:
+        bump_tags('sync')
+    return count
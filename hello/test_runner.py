@@ -0,0 +1,27 @@
+from django.test.runner import DiscoverRunner as BaseDiscoverRunner
+from django.test.utils import override_settings
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'assist-tests',
+    }
+}
+
+
+class DiscoverRunner(BaseDiscoverRunner):
+    """Runs the tests against a private local-memory cache.
+
+    The configured file cache outlives a test run and is shared with the
+    development server; test databases reuse ids, so entries cached by an
+    earlier run (or by the server) would be served for different rows.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._caches = override_settings(CACHES=TEST_CACHES)
+        self._caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._caches.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,7 +1,10 @@
+import os
+from unittest import skipIf, skipUnless
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import Faculty
+from . import compact
 
 
 class HelloTests(TestCase):
@@ -36,3 +39,1463 @@ class HelloTests(TestCase):
 		errors = data.get('errors', [])
 		self.assertTrue(any('at least 8' in e or 'New password must have' in e for e in errors))
 
+
+
+class ScheduleExportTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		self.admin = User.objects.create_superuser(username='exportadmin', password='Admin123!', email='exportadmin@tip.edu.ph')
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', credit_units=3, year_level=1, semester=1)
+		section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		room = Room.objects.create(name='Lab 1', room_number='101', campus='arlegui', room_type='laboratory')
+		faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		Schedule.objects.create(course=course, section=section, faculty=faculty, room=room, day=1, start_time='08:00', end_time='09:30')
+		Schedule.objects.create(course=course, section=section, day=3, start_time='10:00', end_time='11:00')
+
+	def test_export_view_streams_csv(self):
+		self.client.login(username='exportadmin', password='Admin123!')
+		resp = self.client.get(reverse('export_schedules'))
+		self.assertEqual(resp.status_code, 200)
+		self.assertTrue(resp.streaming)
+		lines = b''.join(resp.streaming_content).decode().splitlines()
+		self.assertEqual(len(lines), 3)
+		self.assertIn('Tuesday,08:00,09:30,CPE101,Intro,CPE11S1,Ada Lovelace,Lab 1,Arlegui,3', lines[1])
+		self.assertIn('TBA', lines[2])
+
+		resp = self.client.get(reverse('export_schedules'), {'campus': 'casal'})
+		lines = b''.join(resp.streaming_content).decode().splitlines()
+		self.assertEqual(len(lines), 1)
+
+	def test_export_command_writes_csv(self):
+		from io import StringIO
+		from django.core.management import call_command
+		out = StringIO()
+		call_command('export_schedules', '--year', '1', stdout=out)
+		self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+
+class CalendarFeedTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro, Part 1', credit_units=3, year_level=1, semester=1)
+		section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		room = Room.objects.create(name='Lab 1', room_number='101')
+		self.faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		self.schedule = Schedule.objects.create(course=course, section=section, faculty=self.faculty, room=room, day=4, start_time='08:00', end_time='09:30')
+
+	def test_feed_is_cached_and_supports_etag(self):
+		from . import calendar_feeds
+		url = reverse('calendar_feed', kwargs={'token': calendar_feeds.make_feed_token('faculty', self.faculty.id)})
+		resp = self.client.get(url)
+		self.assertEqual(resp.status_code, 200)
+		body = resp.content.decode()
+		self.assertIn('BEGIN:VEVENT', body)
+		self.assertIn('RRULE:FREQ=WEEKLY;BYDAY=FR', body)
+		self.assertIn('SUMMARY:CPE101 - CPE11S1', body)
+		self.assertIn('Intro\\, Part 1', body)
+
+		with self.assertNumQueries(0):
+			cached = self.client.get(url)
+			not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+		self.assertEqual(cached.content, resp.content)
+		self.assertEqual(not_modified.status_code, 304)
+
+		# Any schedule change invalidates the cached feed
+		with self.captureOnCommitCallbacks(execute=True):
+			self.schedule.delete()
+		changed = self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag'])
+		self.assertEqual(changed.status_code, 200)
+		self.assertNotIn('BEGIN:VEVENT', changed.content.decode())
+
+	def test_default_term_is_anchored_to_the_semester(self):
+		from datetime import date
+		from . import calendar_feeds
+		# 2026-08-01 is a Saturday; the window is the same all semester
+		start, end = calendar_feeds.term_range(date(2026, 9, 14))
+		self.assertEqual(calendar_feeds.term_range(date(2026, 11, 30)), (start, end))
+		self.assertEqual(start, date(2026, 7, 27))
+		self.assertEqual(calendar_feeds.term_range(date(2027, 2, 1))[0], date(2026, 12, 28))
+
+	def test_tampered_token_is_rejected(self):
+		from . import calendar_feeds
+		token = calendar_feeds.make_feed_token('faculty', self.faculty.id)
+		resp = self.client.get(reverse('calendar_feed', kwargs={'token': token.replace(f':{self.faculty.id}:', ':999:')}))
+		self.assertEqual(resp.status_code, 404)
+
+
+class CacheTagTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', credit_units=3, year_level=1, semester=1)
+		self.section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		self.room = Room.objects.create(name='Lab 1', room_number='101')
+		self.other_room = Room.objects.create(name='Lab 2', room_number='102')
+		self.faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		self.schedule = Schedule.objects.create(course=course, section=self.section, faculty=self.faculty, room=self.room, day=0, start_time='08:00', end_time='09:30')
+
+	def _keys(self):
+		from .caching import tag, tagged_key
+		return {
+			name: tagged_key('test', [tag(kind, obj.id)])
+			for name, kind, obj in (
+				('section', 'section', self.section), ('faculty', 'faculty', self.faculty),
+				('room', 'room', self.room), ('other_room', 'room', self.other_room),
+			)
+		}
+
+	def _changed(self, before):
+		after = self._keys()
+		return {name for name in before if before[name] != after[name]}
+
+	def test_renaming_a_room_invalidates_timetables_that_show_it(self):
+		before = self._keys()
+		self.room.name = 'Lab 1A'
+		self.room.save()
+		self.assertEqual(self._changed(before), {'section', 'faculty', 'room'})
+
+	def test_moving_a_schedule_invalidates_old_and_new_room(self):
+		before = self._keys()
+		self.schedule.room = self.other_room
+		self.schedule.save()
+		self.assertEqual(self._changed(before), {'section', 'faculty', 'room', 'other_room'})
+
+	def test_deleting_faculty_invalidates_their_sections_and_rooms(self):
+		admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(admin)
+		before = self._keys()
+		with self.captureOnCommitCallbacks(execute=True):
+			self.client.post(reverse('delete_faculty', args=[self.faculty.id]))
+		self.schedule.refresh_from_db()
+		self.assertIsNone(self.schedule.faculty_id)
+		self.assertEqual(self._changed(before), {'section', 'faculty', 'room'})
+
+	def test_cascading_delete_bumps_tags_once_on_commit(self):
+		from unittest import mock
+		from . import signals
+		from .models import Schedule
+		for day in range(1, 5):
+			Schedule.objects.create(course=self.schedule.course, section=self.section, room=self.other_room, day=day, start_time='08:00', end_time='09:30')
+		before = self._keys()
+		with mock.patch.object(signals, 'bump_tags', wraps=signals.bump_tags) as bump:
+			with self.captureOnCommitCallbacks(execute=True):
+				self.section.delete()
+				self.assertFalse(bump.called)
+		bump.assert_called_once()
+		self.assertEqual(self._changed(before), {'section', 'faculty', 'room', 'other_room'})
+
+	def test_hit_rates_are_reported(self):
+		from . import caching
+		caching.reset_stats()
+		self.addCleanup(caching.reset_stats)
+		key = caching.tagged_key('test', [caching.tag('room', self.room.id)])
+		for _ in range(3):
+			self.assertEqual(caching.get_or_build('rooms', key, lambda: 'built', 60), 'built')
+		self.other_room.save()
+		caching.get_or_build('rooms', key, lambda: 'rebuilt', 60)  # unrelated change: still a hit
+		admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(admin)
+		stats = self.client.get(reverse('cache_stats')).json()
+		self.assertEqual(stats['caches']['rooms'], {'hits': 3, 'misses': 1, 'hit_rate': 0.75})
+		self.assertGreaterEqual(stats['tag_bumps']['room'], 1)
+
+
+class CourseImportTests(TestCase):
+	def setUp(self):
+		User.objects.create_superuser(username='importadmin', password='Admin123!', email='importadmin@tip.edu.ph')
+		self.client.login(username='importadmin', password='Admin123!')
+
+	def _upload(self, text, **extra):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		data = {'file': SimpleUploadedFile('courses.csv', text.encode(), content_type='text/csv')}
+		data.update(extra)
+		return self.client.post(reverse('import_courses'), data).json()
+
+	def test_import_creates_curricula_and_courses_in_bulk(self):
+		from .models import Course, Curriculum
+		rows = ['curriculum,curriculum_year,course_code,descriptive_title,lecture_hours,laboratory_hours,credit_units,year_level,semester']
+		rows += [f'BSCPE,2025,cpe{i:03d},Course {i},2,3,3,{i % 4 + 1},{i % 2 + 1}' for i in range(60)]
+		# The activity entry is written after the commit, outside this count
+		with self.assertNumQueries(7):
+			data = self._upload('\n'.join(rows))
+		self.assertTrue(data['success'], data)
+		self.assertEqual(data['created'], 60)
+		curriculum = Curriculum.objects.get(name='BSCPE', year=2025)
+		self.assertEqual(curriculum.courses.count(), 60)
+		colors = list(curriculum.courses.values_list('color', flat=True))
+		self.assertEqual(set(colors), set(Course.COLOR_PALETTE))
+		self.assertTrue(Course.objects.filter(course_code='CPE001').exists())
+
+	def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+		from .models import Course, Curriculum
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		Course.objects.create(curriculum=curriculum, course_code='CPE100', descriptive_title='Existing', year_level=1, semester=1)
+		data = self._upload(
+			'course_code,descriptive_title,credit_units,year_level,semester\n'
+			'CPE101,Good,3,1,1\n'
+			'CPE101,Duplicate,3,1,1\n'
+			'CPE100,Already there,3,1,1\n'
+			'CPE102,Bad year,3,5,1\n'
+			'CPE103,Huge units,1e400,1,1\n',
+			curriculum=curriculum.id,
+		)
+		self.assertFalse(data['success'])
+		self.assertEqual(len(data['errors']), 4)
+		self.assertIn('credit_units must be a number (got "1e400")', data['errors'][3])
+		self.assertTrue(data['errors'][0].startswith('Row 3:'))
+		self.assertEqual(curriculum.courses.count(), 1)
+
+
+class ScheduleImportTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		User.objects.create_superuser(username='schedimport', password='Admin123!', email='schedimport@tip.edu.ph')
+		self.client.login(username='schedimport', password='Admin123!')
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		self.cpe101 = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', credit_units=3, year_level=1, semester=1)
+		Course.objects.create(curriculum=curriculum, course_code='CPE102', descriptive_title='Logic', credit_units=3, year_level=1, semester=1)
+		Course.objects.create(curriculum=curriculum, course_code='CPE201', descriptive_title='Data', credit_units=3, year_level=2, semester=1)
+		self.s1 = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		Section.objects.create(name='CPE11S2', year_level=1, semester=1, curriculum=curriculum)
+		Room.objects.create(name='Lab 1', room_number='101')
+		faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		Schedule.objects.create(course=self.cpe101, section=self.s1, faculty=faculty, day=0, start_time='08:00', end_time='09:00')
+
+	def test_valid_rows_are_created_and_conflicts_reported_per_row(self):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		from .models import Schedule
+		csv_text = '\n'.join([
+			'section,course_code,day,start_time,end_time,faculty,room',
+			'CPE11S1,CPE102,Tuesday,08:00,09:30,ada@tip.edu.ph,Lab 1',      # ok
+			'CPE11S2,CPE101,Tuesday,09:00,10:00,Ada Lovelace,',             # faculty conflict with row 2
+			'CPE11S2,CPE101,Monday,08:30,09:30,,Lab 1',                     # ok (room free)
+			'CPE11S2,CPE102,Monday,09:00,10:00,,Lab 1',                     # room conflict with row 4
+			'CPE11S1,CPE102,Friday,11:00,12:00,,',                          # Friday break
+			'CPE11S1,CPE201,Wednesday,08:00,09:00,,',                       # wrong year
+			'CPE11S1,CPE101,Mon,1:00 PM,2:00 PM,Lovelace Ada,',             # duplicate course/day
+			'CPE11S1,CPE102,Saturday,21:00,22:00,,',                        # outside window
+			'CPE11S1,CPE101,Thursday,13:00,14:30,Lovelace Ada,',            # ok
+		])
+		upload = SimpleUploadedFile('schedules {v2}.csv', csv_text.encode(), content_type='text/csv')
+		with self.captureOnCommitCallbacks(execute=True):
+			data = self.client.post(reverse('import_schedules'), {'file': upload}).json()
+		self.assertEqual(data['created'], 3)
+		self.assertEqual([e.split(':')[0] for e in data['errors']], ['Row 3', 'Row 5', 'Row 6', 'Row 7', 'Row 8', 'Row 9'])
+		self.assertIn('Faculty Ada Lovelace has a time conflict', data['errors'][0])
+		self.assertIn('Room Lab 1 has a time conflict', data['errors'][1])
+		self.assertIn('Friday', data['errors'][2])
+		self.assertEqual(Schedule.objects.count(), 4)
+		self.assertEqual(Schedule.objects.get(section=self.s1, day=3).duration, 90)
+		# One summarized entry for the whole import
+		from .models import Activity
+		self.assertEqual(list(Activity.objects.values_list('message', flat=True)), ['Imported 3 schedules from schedules {v2}.csv (6 rows skipped)'])
+
+	def test_clearing_a_section_logs_one_entry(self):
+		from .models import Activity, Schedule
+		Schedule.objects.create(course=self.cpe101, section=self.s1, day=1, start_time='08:00', end_time='09:00')
+		with self.captureOnCommitCallbacks(execute=True):
+			data = self.client.post(reverse('delete_section_schedules', args=[self.s1.id])).json()
+		self.assertEqual(data['deleted_count'], 2)
+		self.assertEqual(list(Activity.objects.values_list('message', flat=True)), ['Deleted 2 schedules for section CPE11S1'])
+		with self.captureOnCommitCallbacks(execute=True):
+			data = self.client.post(reverse('delete_section_schedules', args=[self.s1.id])).json()
+		self.assertEqual(data['message'], 'No schedules found for this section.')
+		self.assertEqual(Activity.objects.count(), 1)
+
+	def test_conflict_names_the_existing_class_not_the_merged_block(self):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		from .models import Course, Schedule, Section
+		# Legacy data (bulk_create skips validation): two overlapping classes
+		# for Ada on Monday, 08:00-09:00 and 08:30-10:00
+		Schedule.objects.bulk_create([Schedule(
+			course=Course.objects.get(course_code='CPE102'), section=Section.objects.get(name='CPE11S2'),
+			faculty=Faculty.objects.get(), day=0, start_time='08:30', end_time='10:00', duration=90,
+		)])
+		csv_text = 'section,course_code,day,start_time,end_time,faculty\nCPE11S1,CPE102,Monday,09:30,10:30,ada@tip.edu.ph'
+		upload = SimpleUploadedFile('schedules.csv', csv_text.encode(), content_type='text/csv')
+		data = self.client.post(reverse('import_schedules'), {'file': upload}).json()
+		self.assertIn('between 08:30 and 10:00', data['errors'][0])
+
+	def test_inverted_legacy_schedule_is_not_a_conflict(self):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		from .models import Course, Schedule, Section
+		Schedule.objects.bulk_create([Schedule(
+			course=Course.objects.get(course_code='CPE102'), section=Section.objects.get(name='CPE11S2'),
+			faculty=Faculty.objects.get(), day=1, start_time='10:00', end_time='09:00', duration=60,
+		)])
+		csv_text = 'section,course_code,day,start_time,end_time,faculty\nCPE11S1,CPE102,Tuesday,09:30,10:30,ada@tip.edu.ph'
+		upload = SimpleUploadedFile('schedules.csv', csv_text.encode(), content_type='text/csv')
+		data = self.client.post(reverse('import_schedules'), {'file': upload}).json()
+		self.assertEqual((data['created'], data['errors']), (1, []))
+
+
+class EmailOutboxTests(TestCase):
+	def test_password_reset_only_enqueues_and_worker_sends_via_locmem(self):
+		import json
+		from django.core import mail
+		from . import outbox
+		from .models import OutboundEmail
+		User.objects.create_user(username='reset@tip.edu.ph', email='reset@tip.edu.ph', password='Secret123!')
+
+		resp = self.client.post(reverse('api_password_reset'), json.dumps({'email': 'reset@tip.edu.ph'}), content_type='application/json')
+		self.assertEqual(resp.status_code, 200)
+		self.assertEqual(len(mail.outbox), 0)
+		queued = OutboundEmail.objects.get()
+		self.assertEqual(queued.status, 'pending')
+
+		self.assertEqual(outbox.send_pending(), 1)
+		self.assertEqual(len(mail.outbox), 1)
+		self.assertEqual(mail.outbox[0].to, ['reset@tip.edu.ph'])
+		queued.refresh_from_db()
+		self.assertEqual(queued.status, 'sent')
+		self.assertEqual(outbox.send_pending(), 0)
+
+	def test_brevo_failures_are_retried_with_backoff(self):
+		import threading
+		from datetime import timedelta
+		from http.server import BaseHTTPRequestHandler, HTTPServer
+		from django.test import override_settings
+		from django.utils import timezone
+		from . import outbox
+		from .models import OutboundEmail
+
+		statuses = [500, 201]
+		received = []
+
+		class StubHandler(BaseHTTPRequestHandler):
+			def do_POST(self):
+				received.append(self.rfile.read(int(self.headers['Content-Length'])))
+				self.send_response(statuses.pop(0))
+				self.send_header('Content-Type', 'application/json')
+				self.end_headers()
+				self.wfile.write(b'{"messageId": "1"}')
+
+			def log_message(self, *args):
+				pass
+
+		server = HTTPServer(('127.0.0.1', 0), StubHandler)
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		self.addCleanup(server.shutdown)
+
+		url = f'http://127.0.0.1:{server.server_port}/v3/smtp/email'
+		with override_settings(BREVO_API_KEY='test-key', BREVO_API_URL=url, EMAIL_OUTBOX_AUTOSEND=False):
+			email = outbox.enqueue_email('Hello', 'Body', ['a@tip.edu.ph'])
+			self.assertEqual(outbox.send_pending(), 1)
+			email.refresh_from_db()
+			self.assertEqual((email.status, email.attempts), ('pending', 1))
+			self.assertGreater(email.next_attempt_at, timezone.now())
+
+			# Not due yet; make it due and retry
+			self.assertEqual(outbox.send_pending(), 0)
+			OutboundEmail.objects.filter(id=email.id).update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+			self.assertEqual(outbox.send_pending(), 1)
+			email.refresh_from_db()
+			self.assertEqual((email.status, email.attempts), ('sent', 2))
+		self.assertEqual(len(received), 2)
+
+
+class FacultyRosterImportTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course
+		User.objects.create_superuser(username='rosteradmin', password='Admin123!', email='rosteradmin@tip.edu.ph')
+		self.client.login(username='rosteradmin', password='Admin123!')
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', year_level=1, semester=1)
+		Course.objects.create(curriculum=curriculum, course_code='CPE102', descriptive_title='Logic', year_level=1, semester=1)
+
+	def _upload(self, text):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		upload = SimpleUploadedFile('roster.csv', text.encode(), content_type='text/csv')
+		return self.client.post(reverse('import_faculty'), {'file': upload}).json()
+
+	def test_roster_creates_users_faculty_specializations_and_invitations(self):
+		from .models import OutboundEmail
+		rows = ['name,email,status,degree,specialization']
+		rows += [f'"Part{i}, Timer",pt{i}@tip.edu.ph,Part-Time,MSCpE,CPE101;CPE102' for i in range(80)]
+		# SQLite's 999-parameter limit splits the 80 faculty rows into two inserts;
+		# the activity entry is written after the commit, outside this count
+		with self.assertNumQueries(12):
+			data = self._upload('\n'.join(rows))
+		self.assertTrue(data['success'], data)
+		self.assertEqual(data['created'], 80)
+		member = Faculty.objects.get(email='pt7@tip.edu.ph')
+		self.assertEqual((member.first_name, member.last_name, member.employment_status), ('Timer', 'Part7', 'part_time'))
+		self.assertEqual(member.specialization.count(), 2)
+		self.assertTrue(member.user.is_staff)
+		self.assertFalse(member.user.has_usable_password())
+		self.assertEqual(OutboundEmail.objects.count(), 80)
+		self.assertIn('/admin/reset/', OutboundEmail.objects.first().body)
+
+	def test_invalid_roster_is_rejected(self):
+		data = self._upload(
+			'name,email,specialization\n'
+			'Ada Lovelace,ada@gmail.com,\n'
+			'Grace Hopper,rosteradmin@tip.edu.ph,\n'
+			'Alan Turing,alan@tip.edu.ph,CPE999\n'
+		)
+		self.assertFalse(data['success'])
+		self.assertEqual(len(data['errors']), 3)
+		self.assertEqual(Faculty.objects.count(), 0)
+
+
+class MobileListApiTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		user = User.objects.create_user(username='mobile', password='Mobile123!', email='mobile@tip.edu.ph')
+		self.client.force_login(user)
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		courses = [
+			Course.objects.create(curriculum=curriculum, course_code=f'CPE{i:03d}', descriptive_title=f'Course {i}', credit_units=3, year_level=1, semester=1)
+			for i in range(3)
+		]
+		section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		for i in range(7):
+			Section.objects.create(name=f'CPE21S{i + 1}', year_level=2, semester=1, curriculum=curriculum)
+		for i in range(5):
+			Room.objects.create(name=f'Room {i}', room_number=f'{i:03d}', campus='casal' if i % 2 else 'arlegui')
+		self.faculty = [
+			Faculty.objects.create(first_name=f'F{i}', last_name=f'L{i}', email=f'f{i}@tip.edu.ph')
+			for i in range(6)
+		]
+		# Same course twice counts once
+		Schedule.objects.create(course=courses[0], section=section, faculty=self.faculty[0], day=1, start_time='08:00', end_time='09:00')
+		Schedule.objects.create(course=courses[0], section=section, faculty=self.faculty[0], day=3, start_time='08:00', end_time='09:00')
+		Schedule.objects.create(course=courses[1], section=section, faculty=self.faculty[0], day=2, start_time='08:00', end_time='09:00')
+
+	def test_unpaginated_list_keeps_plain_shape(self):
+		data = self.client.get(reverse('api_faculty_list')).json()
+		self.assertEqual(len(data), 6)
+		self.assertEqual(data[0]['total_units'], 6)
+		self.assertEqual(data[1]['total_units'], 0)
+		self.assertIsNone(data[0]['profile_picture_url'])
+
+	def test_keyset_pages_use_constant_queries(self):
+		url = reverse('api_sections')
+		seen = []
+		cursor = ''
+		while True:
+			# session + user lookups, then exactly one query for the page
+			with self.assertNumQueries(3):
+				data = self.client.get(url, {'limit': 3, 'cursor': cursor, 'fields': 'id,name'}).json()
+			self.assertTrue(all(set(row) == {'id', 'name'} for row in data['results']))
+			seen += [row['name'] for row in data['results']]
+			cursor = data['next_cursor']
+			if not cursor:
+				break
+		self.assertEqual(len(seen), 8)
+		self.assertEqual(seen[0], 'CPE11S1')
+		self.assertEqual(len(set(seen)), 8)
+
+	def test_section_search(self):
+		url = reverse('api_sections')
+		data = self.client.get(url, {'q': 'cpe21'}).json()
+		self.assertEqual(len(data), 7)
+		# Joined and computed columns are opt-in
+		self.assertEqual(set(data[0]), {'id', 'name', 'year_level', 'semester', 'status', 'curriculum'})
+		data = self.client.get(url, {'q': 'CPE', 'year': 1, 'fields': 'name,curriculum_name,total_units', 'limit': 5}).json()
+		self.assertEqual(data['results'], [{'name': 'CPE11S1', 'curriculum_name': 'BSCPE', 'total_units': 6}])
+		self.assertIsNone(data['next_cursor'])
+		self.assertEqual(self.client.get(url, {'q': 'S1', 'status': 'complete'}).json(), [])
+
+	def test_schedule_page_embeds_first_page_only(self):
+		from .models import Section
+		curriculum = Section.objects.first().curriculum
+		for i in range(20):
+			Section.objects.create(name=f'CPE31S{i + 1}', year_level=3, semester=1, curriculum=curriculum)
+		self.client.force_login(User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph'))
+		page = self.client.get(reverse('schedule_view')).context['section_page']
+		self.assertEqual(len(page['results']), 24)
+		self.assertEqual(page['results'][0]['total_units'], 6)
+		rest = self.client.get(reverse('api_sections'), {'fields': page['fields'], 'limit': page['page_size'], 'cursor': page['next_cursor']}).json()
+		self.assertEqual(len(rest['results']), 4)
+		self.assertIsNone(rest['next_cursor'])
+
+	def test_filters_and_invalid_params(self):
+		data = self.client.get(reverse('api_rooms'), {'campus': 'casal'}).json()
+		self.assertEqual([r['name'] for r in data], ['Room 1', 'Room 3'])
+		data = self.client.get(reverse('api_courses'), {'year': 2}).json()
+		self.assertEqual(data, [])
+		resp = self.client.get(reverse('api_courses'), {'fields': 'id,secret'})
+		self.assertEqual(resp.status_code, 400)
+		resp = self.client.get(reverse('api_courses'), {'cursor': 'not-a-cursor'})
+		self.assertEqual(resp.status_code, 400)
+
+	def test_forged_cursor_is_rejected(self):
+		from .pagination import encode_cursor
+		forged = encode_cursor(['x', 'y', 'z', 'w'])
+		for name in ('api_courses', 'api_sections'):
+			resp = self.client.get(reverse(name), {'cursor': forged})
+			self.assertEqual(resp.status_code, 400, name)
+			self.assertEqual(resp.json()['error'], 'Invalid cursor')
+		resp = self.client.get(reverse('api_sections'), {'cursor': encode_cursor([1, [2], 'a', {}])})
+		self.assertEqual(resp.status_code, 400)
+
+
+class DeltaSyncTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		user = User.objects.create_user(username='syncer', password='Sync1234!', email='sync@tip.edu.ph')
+		self.client.force_login(user)
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		self.course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', year_level=1, semester=1)
+		self.section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		self.room = Room.objects.create(name='Room 1', room_number='101')
+		self.faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		self.schedule = Schedule.objects.create(course=self.course, section=self.section, faculty=self.faculty, room=self.room, day=0, start_time='08:00', end_time='09:00')
+
+	def _age_rows(self):
+		"""Move every row back in time and return a token issued after them"""
+		from datetime import timedelta
+		from django.utils import timezone
+		from . import sync
+		from .models import Curriculum, Course, Section, Room, Schedule
+		past = timezone.now() - timedelta(hours=1)
+		for model in (Curriculum, Course, Section, Room, Faculty, Schedule):
+			model.objects.update(updated_at=past)
+		# A token issued half an hour ago, well outside the overlap window
+		return sync.make_token(past + timedelta(minutes=30))
+
+	def test_full_sync_then_delta(self):
+		from . import sync
+		from .models import DeletedRecord
+		data = self.client.get(reverse('api_sync')).json()
+		self.assertTrue(data['full'])
+		self.assertEqual([c['course_code'] for c in data['changes']['courses']], ['CPE101'])
+		self.assertEqual(data['changes']['schedules'][0]['faculty'], self.faculty.id)
+
+		token = self._age_rows()
+		self.room.capacity = 50
+		self.room.save()
+		course_id, schedule_id = self.course.id, self.schedule.id
+		self.course.delete()  # cascades to the schedule
+
+		# session + user lookups, one query per entity, one for tombstones
+		with self.assertNumQueries(2 + len(sync.SYNC_ENTITIES) + 1):
+			data = self.client.get(reverse('api_sync'), {'since': token}).json()
+		self.assertFalse(data['full'])
+		self.assertEqual([r['capacity'] for r in data['changes']['rooms']], [50])
+		self.assertEqual(data['changes']['faculty'], [])
+		self.assertEqual(data['deleted']['courses'], [course_id])
+		self.assertEqual(data['deleted']['schedules'], [schedule_id])
+		self.assertEqual(DeletedRecord.objects.count(), 2)
+
+		# Rows changed just before a token are re-sent within the overlap window
+		next_token = data['token']
+		data = self.client.get(reverse('api_sync'), {'since': next_token}).json()
+		self.assertEqual([r['id'] for r in data['changes']['rooms']], [self.room.id])
+		with self.settings(SYNC_OVERLAP_SECONDS=0):
+			data = self.client.get(reverse('api_sync'), {'since': next_token}).json()
+		self.assertEqual(data['changes']['rooms'], [])
+
+	def test_cascade_writes_tombstones_in_one_insert(self):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		from .models import DeletedRecord, Schedule
+		for day in range(1, 5):
+			Schedule.objects.create(course=self.course, section=self.section, day=day, start_time='08:00', end_time='09:00')
+		with CaptureQueriesContext(connection) as queries:
+			self.section.delete()
+		inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "hello_deletedrecord"')]
+		self.assertEqual(len(inserts), 1)
+		self.assertEqual(sorted(DeletedRecord.objects.values_list('entity_type', flat=True)), ['schedule'] * 5 + ['section'])
+
+		# A second delete in the same test gets its own batch
+		self.room.delete()
+		self.assertEqual(DeletedRecord.objects.filter(entity_type='room').count(), 1)
+
+	def test_deleting_faculty_reports_unassigned_schedules(self):
+		token = self._age_rows()
+		faculty_id = self.faculty.id
+		self.faculty.delete()
+		data = self.client.get(reverse('api_sync'), {'since': token}).json()
+		self.assertEqual(data['deleted']['faculty'], [faculty_id])
+		self.assertEqual([s['faculty'] for s in data['changes']['schedules']], [None])
+
+	def test_invalid_and_expired_tokens(self):
+		from datetime import timedelta
+		from django.utils import timezone
+		from . import sync
+		resp = self.client.get(reverse('api_sync'), {'since': 'garbage'})
+		self.assertEqual(resp.status_code, 400)
+		old = sync.make_token(timezone.now() - timedelta(days=365))
+		data = self.client.get(reverse('api_sync'), {'since': old}).json()
+		self.assertTrue(data['full'])
+		self.assertEqual(len(data['changes']['sections']), 1)
+
+
+class MobileBootstrapTests(TestCase):
+	def setUp(self):
+		from django.core.cache import cache
+		from .models import Curriculum, Course, Section, Schedule
+		cache.clear()
+		self.user = User.objects.create_user(username='boot', password='Boot1234!', email='boot@tip.edu.ph')
+		self.client.force_login(self.user)
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		self.courses = [
+			Course.objects.create(curriculum=curriculum, course_code=f'CPE{i:03d}', descriptive_title=f'Course {i}', credit_units=3, year_level=1, semester=1)
+			for i in range(4)
+		]
+		self.section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		self.faculty = Faculty.objects.create(user=self.user, first_name='Boot', last_name='Strap', email='boot@tip.edu.ph')
+		self.faculty.specialization.set(self.courses[:2])
+		Schedule.objects.create(course=self.courses[0], section=self.section, faculty=self.faculty, day=0, start_time='08:00', end_time='09:00')
+
+	def test_fixed_query_count_and_cache(self):
+		from .models import Schedule
+		# session + user lookups, then profile, schedules, specializations, two counts, curricula
+		with self.assertNumQueries(8):
+			data = self.client.get(reverse('api_bootstrap')).json()
+		self.assertEqual(data['profile']['faculty_id'], self.faculty.id)
+		self.assertEqual(data['total_units'], 3)
+		self.assertEqual([s['course_code'] for s in data['specializations']], ['CPE000', 'CPE001'])
+		self.assertEqual(len(data['schedules']), 1)
+
+		with self.assertNumQueries(2):
+			response = self.client.get(reverse('api_bootstrap'))
+		self.assertEqual(response.json(), data)
+		response = self.client.get(reverse('api_bootstrap'), HTTP_IF_NONE_MATCH=response['ETag'])
+		self.assertEqual(response.status_code, 304)
+
+		# More schedules do not add queries, and the schedule change invalidates the cache
+		for day in range(1, 5):
+			Schedule.objects.create(course=self.courses[day - 1], section=self.section, faculty=self.faculty, day=day, start_time='10:00', end_time='11:00')
+		with self.assertNumQueries(8):
+			data = self.client.get(reverse('api_bootstrap')).json()
+		self.assertEqual(len(data['schedules']), 5)
+		self.assertEqual(data['total_units'], 12)
+
+	def test_user_without_faculty_profile(self):
+		other = User.objects.create_user(username='plain', password='Plain123!', email='plain@tip.edu.ph', first_name='Pat')
+		self.client.force_login(other)
+		data = self.client.get(reverse('api_bootstrap')).json()
+		self.assertIsNone(data['profile']['faculty_id'])
+		self.assertEqual(data['profile']['first_name'], 'Pat')
+		self.assertEqual(data['schedules'], [])
+		self.assertEqual(data['stats'], {'faculty_count': 1, 'section_count': 1})
+
+
+class CompactScheduleFormatTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		self.user = User.objects.create_user(username='compact', password='Compact123!', email='compact@tip.edu.ph', is_staff=True)
+		self.client.force_login(self.user)
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		courses = [
+			Course.objects.create(curriculum=curriculum, course_code=f'CPE{i:03d}', descriptive_title=f'Computer Engineering Course Number {i}', credit_units=3, year_level=1, semester=1)
+			for i in range(3)
+		]
+		self.room = Room.objects.create(name='Lecture Hall 1', room_number='101')
+		self.faculty = Faculty.objects.create(user=self.user, first_name='Grace', last_name='Hopper', email='compact@tip.edu.ph')
+		for n in range(4):
+			section = Section.objects.create(name=f'CPE11S{n + 1}', year_level=1, semester=1, curriculum=curriculum)
+			for day in range(6):
+				course = courses[(n + day) % 3]
+				start = 8 + n * 3
+				Schedule.objects.create(
+					course=course, section=section, room=self.room, faculty=self.faculty if day < 3 and n < 3 else None,
+					day=day, start_time=f'{start:02d}:00', end_time=f'{start + 2:02d}:30',
+				)
+
+	def test_compact_matches_regular_payload_and_is_smaller(self):
+		url = reverse('get_room_schedule', args=[self.room.id])
+		regular = self.client.get(url)
+		# session, user, room, then a single query for every block
+		with self.assertNumQueries(4):
+			compact_response = self.client.get(url, {'format': 'compact'})
+		self.assertLess(len(compact_response.content) * 2, len(regular.content))
+
+		data = compact_response.json()
+		tables, blocks = data['tables'], data['blocks']
+		self.assertEqual(len(blocks['day']), 24)
+		self.assertEqual(len(tables['courses']['id']), 3)
+		decoded = [
+			{
+				'day': blocks['day'][i],
+				'start_time': f"{blocks['start_minute'][i] // 60:02d}:{blocks['start_minute'][i] % 60:02d}",
+				'course_code': tables['courses']['code'][blocks['course_idx'][i]],
+				'section_name': tables['sections']['name'][blocks['section_idx'][i]],
+				'faculty': tables['faculty']['name'][blocks['faculty_idx'][i]] if blocks['faculty_idx'][i] >= 0 else 'TBA',
+			}
+			for i in range(len(blocks['day']))
+		]
+		expected = [
+			{key: item[key] for key in ('day', 'start_time', 'course_code', 'section_name', 'faculty')}
+			for item in regular.json()['schedules']
+		]
+		self.assertEqual(decoded, expected)
+
+	def test_mobile_api_accepts_compact_format(self):
+		response = self.client.get(reverse('api_my_schedule'), {'format': 'compact'})
+		self.assertEqual(response.status_code, 200)
+		data = response.json()
+		self.assertEqual(data['format'], 'compact')
+		self.assertEqual(data['faculty_id'], self.faculty.id)
+		self.assertEqual(len(data['blocks']['id']), 9)
+		self.assertEqual(data['tables']['rooms']['name'], ['Lecture Hall 1'])
+
+		response = self.client.get(reverse('api_my_schedule'), {'format': 'compact', 'encoding': 'msgpack'})
+		try:
+			import msgpack
+		except ImportError:
+			self.assertEqual(response.status_code, 406)
+		else:
+			self.assertEqual(response['Content-Type'], 'application/msgpack')
+			self.assertEqual(msgpack.unpackb(response.content)['blocks'], data['blocks'])
+
+	@skipIf(compact.msgpack, 'msgpack is installed')
+	def test_msgpack_is_not_acceptable_without_the_package(self):
+		response = self.client.get(reverse('api_my_schedule'), {'format': 'compact'}, HTTP_ACCEPT='application/msgpack')
+		self.assertEqual(response.status_code, 406)
+		missing = self.client.get(reverse('api_faculty_schedule', args=[0]), {'format': 'compact'}, HTTP_ACCEPT='application/msgpack')
+		self.assertEqual(missing.status_code, 406)
+
+	@skipUnless(compact.msgpack, 'msgpack is not installed')
+	def test_msgpack_renders_every_response(self):
+		# A user without a faculty profile gets an empty schedule
+		self.client.force_login(User.objects.create_user(username='nofaculty', password='None1234!'))
+		response = self.client.get(reverse('api_my_schedule'), {'format': 'compact'}, HTTP_ACCEPT='application/msgpack')
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(response['Content-Type'], 'application/msgpack')
+		self.assertEqual(compact.msgpack.unpackb(response.content)['schedules'], [])
+
+		# Error responses are rendered too
+		missing = self.client.get(reverse('api_faculty_schedule', args=[0]), {'format': 'compact'}, HTTP_ACCEPT='application/msgpack')
+		self.assertEqual(missing.status_code, 404)
+		self.assertEqual(compact.msgpack.unpackb(missing.content), {'error': 'Faculty not found'})
+
+
+class ProfilePictureVariantTests(TestCase):
+	def setUp(self):
+		import shutil
+		import tempfile
+		self.media_root = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+		self.user = User.objects.create_user(username='avatar', password='Avatar123!', email='avatar@tip.edu.ph')
+		self.faculty = Faculty.objects.create(user=self.user, first_name='Ava', last_name='Tar', email='avatar@tip.edu.ph')
+		self.client.force_login(self.user)
+
+	def _photo(self):
+		import io
+		from PIL import Image
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		image = Image.new('RGB', (2400, 1600), (200, 30, 30))
+		exif = Image.Exif()
+		exif[0x010F] = 'SecretCam'  # Make
+		buffer = io.BytesIO()
+		image.save(buffer, 'JPEG', exif=exif.tobytes())
+		return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+	def test_upload_is_reencoded_and_variants_are_served(self):
+		from PIL import Image
+		from django.core.files.storage import default_storage
+		with self.settings(MEDIA_ROOT=self.media_root, PROFILE_THUMBNAILS_ASYNC=False):
+			with self.captureOnCommitCallbacks(execute=True):
+				resp = self.client.post('/staff/account/save/', {
+					'firstName': 'Ava', 'lastName': 'Tar', 'email': 'avatar@tip.edu.ph',
+					'profilePicture': self._photo(),
+				})
+			self.assertEqual(resp.status_code, 200)
+
+			self.faculty.refresh_from_db()
+			with default_storage.open(self.faculty.profile_picture.name, 'rb') as fh:
+				stored = Image.open(fh)
+				self.assertEqual(max(stored.size), 1024)
+				self.assertNotIn(0x010F, stored.getexif())
+
+			variants = self.faculty.profile_picture_variants
+			self.assertEqual(sorted(variants, key=int), ['64', '128', '256'])
+			with default_storage.open(variants['64']['jpeg'], 'rb') as fh:
+				self.assertEqual(Image.open(fh).size, (64, 64))
+
+			data = self.client.get(reverse('api_faculty_list'), {'fields': 'id,profile_picture_variants'}).json()
+			self.assertTrue(data[0]['profile_picture_variants']['128']['jpeg'].startswith('http://testserver/media/'))
+
+	def test_rejects_files_that_are_not_images(self):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		with self.settings(MEDIA_ROOT=self.media_root):
+			resp = self.client.post('/staff/account/save/', {
+				'firstName': 'Ava', 'lastName': 'Tar', 'email': 'avatar@tip.edu.ph',
+				'profilePicture': SimpleUploadedFile('fake.png', b'not an image', content_type='image/png'),
+			})
+		self.assertEqual(resp.status_code, 400)
+		self.faculty.refresh_from_db()
+		self.assertFalse(self.faculty.profile_picture)
+
+
+class StreamingUploadTests(TestCase):
+	def setUp(self):
+		self.user = User.objects.create_user(username='stream', password='Stream123!', email='stream@tip.edu.ph')
+		self.faculty = Faculty.objects.create(user=self.user, first_name='Str', last_name='Eam', email='stream@tip.edu.ph')
+		self.client.force_login(self.user)
+
+	def _post(self, content, content_type='image/jpeg', client=None):
+		from django.core.files.uploadedfile import SimpleUploadedFile
+		return (client or self.client).post('/staff/account/save/', {
+			'firstName': 'Changed', 'lastName': 'Eam', 'email': 'stream@tip.edu.ph',
+			'profilePicture': SimpleUploadedFile('upload.jpg', content, content_type=content_type),
+		})
+
+	def test_rejects_oversized_uploads_while_streaming(self):
+		jpeg_header = b'\xff\xd8\xff\xe0' + b'\x00' * 16
+		with self.settings(PROFILE_PICTURE_MAX_UPLOAD_SIZE=4096):
+			# Over the cap plus form allowance: refused from Content-Length alone
+			resp = self._post(jpeg_header + b'\x00' * (200 * 1024))
+			self.assertEqual(resp.status_code, 400)
+			self.assertEqual(resp.json()['errors'], ['File size must be under 4KB'])
+			# Under the allowance but over the cap: aborted part-way through the file
+			resp = self._post(jpeg_header + b'\x00' * 8192)
+			self.assertEqual(resp.status_code, 400)
+			self.assertEqual(resp.json()['errors'], ['File size must be under 4KB'])
+		self.faculty.refresh_from_db()
+		self.assertEqual(self.faculty.first_name, 'Str')
+
+	def test_sniffs_magic_bytes_instead_of_trusting_content_type(self):
+		resp = self._post(b'GIF89a' + b'\x00' * 2048, content_type='image/png')
+		self.assertEqual(resp.status_code, 400)
+		self.assertEqual(resp.json()['errors'], ['Only PNG and JPEG images are allowed'])
+		resp = self._post(b'\xff\xd8', content_type='image/jpeg')
+		self.assertEqual(resp.status_code, 400)
+
+	def test_csrf_is_still_enforced(self):
+		client = Client(enforce_csrf_checks=True)
+		client.force_login(self.user)
+		resp = client.post('/staff/account/save/', {'firstName': 'X', 'lastName': 'Y', 'email': 'stream@tip.edu.ph'})
+		self.assertEqual(resp.status_code, 403)
+
+
+class ActivityLogTests(TestCase):
+	def setUp(self):
+		from .models import Activity
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(self.admin)
+		for i in range(15):
+			Activity.objects.create(user=self.admin, action='add', entity_type='room', entity_name=f'Room {i}', message=f'Added room {i}')
+
+	def _age(self, queryset, **delta):
+		from datetime import timedelta
+		from django.utils import timezone
+		for activity in queryset:
+			type(activity).objects.filter(id=activity.id).update(timestamp=timezone.now() - timedelta(**delta))
+
+	def test_dashboard_groups_today_and_yesterday(self):
+		from datetime import timedelta
+		from django.utils import timezone
+		from . import activity
+		from .models import Activity
+		today = timezone.localdate()
+		start, _ = activity.day_range(today)
+		Activity.objects.filter(id__in=list(Activity.objects.order_by('id').values_list('id', flat=True)[:4])).update(
+			timestamp=start - timedelta(hours=1)
+		)
+		groups = activity.recent_activity_groups(limit=10, today=today)
+		self.assertEqual(len(groups['Today']), 10)
+		self.assertEqual([a.entity_name for a in groups['Yesterday']], ['Room 3', 'Room 2', 'Room 1', 'Room 0'])
+		response = self.client.get(reverse('admin_dashboard'))
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(list(response.context['recent_activities']), ['Today', 'Yesterday'])
+
+	def test_archive_moves_old_rows_to_gzip_jsonl(self):
+		import gzip
+		import json
+		import shutil
+		import tempfile
+		from django.core.management import call_command
+		from .models import Activity
+		directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+		self._age(Activity.objects.order_by('id')[:12], days=400)
+
+		call_command('archive_activity', days=365, output_dir=directory, batch_size=5, stdout=open('/dev/null', 'w'))
+
+		self.assertEqual(Activity.objects.count(), 3)
+		[name] = os.listdir(directory)
+		self.assertTrue(name.endswith('.jsonl.gz'))
+		with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as fh:
+			records = [json.loads(line) for line in fh]
+		self.assertEqual(len(records), 12)
+		self.assertEqual(len({r['id'] for r in records}), 12)
+		self.assertEqual(records[0]['username'], 'root')
+		self.assertEqual(records[0]['message'], 'Added room 0')
+
+
+class ActivityHistoryApiTests(TestCase):
+	def setUp(self):
+		from datetime import timedelta
+		from django.utils import timezone
+		from .models import Activity
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.other = User.objects.create_user(username='staff1', password='Staff1234!')
+		now = timezone.now()
+		for i in range(25):
+			a = Activity.objects.create(
+				user=self.admin if i % 2 else self.other,
+				action='add' if i % 3 else 'delete',
+				entity_type='room' if i < 20 else 'course',
+				entity_name=f'Item {i}',
+				message=f'Changed item {i}',
+			)
+			# Several rows share a timestamp so the id tiebreak is exercised
+			Activity.objects.filter(id=a.id).update(timestamp=now - timedelta(days=i // 5))
+		self.client.force_login(self.admin)
+		self.url = reverse('api_activity')
+
+	def _pages(self, params):
+		names, cursor = [], None
+		while True:
+			query = dict(params, **({'cursor': cursor} if cursor else {}))
+			data = self.client.get(self.url, query).json()
+			names += [row['entity_name'] for row in data['results']]
+			cursor = data['next_cursor']
+			if not cursor:
+				return names
+
+	def test_keyset_pages_cover_history_newest_first(self):
+		names = self._pages({'limit': 4})
+		expected = [f'Item {day * 5 + i}' for day in range(5) for i in (4, 3, 2, 1, 0)]
+		self.assertEqual(names, expected)
+
+	def test_deep_page_is_one_query(self):
+		first = self.client.get(self.url, {'limit': 4}).json()
+		with self.assertNumQueries(3):
+			deep = self.client.get(self.url, {'limit': 4, 'cursor': first['next_cursor']})
+		self.assertEqual(len(deep.json()['results']), 4)
+
+	def test_filters_and_search(self):
+		from django.utils import timezone
+		self.assertEqual(len(self._pages({'entity_type': 'course'})), 5)
+		self.assertEqual(len(self._pages({'user': self.admin.id})), 12)
+		self.assertEqual(len(self._pages({'action': 'delete'})), 9)
+		today = timezone.localdate().isoformat()
+		self.assertEqual(len(self._pages({'from': today, 'to': today})), 5)
+		self.assertEqual(self._pages({'q': 'item 17'}), ['Item 17'])
+
+	def test_invalid_params_and_permissions(self):
+		self.assertEqual(self.client.get(self.url, {'entity_type': 'bogus'}).status_code, 400)
+		self.assertEqual(self.client.get(self.url, {'from': '2024-13-01'}).status_code, 400)
+		self.assertEqual(self.client.get(self.url, {'cursor': 'nope'}).status_code, 400)
+		# Decodes fine, but the timestamp is not a datetime
+		from .pagination import encode_cursor
+		self.assertEqual(self.client.get(self.url, {'cursor': encode_cursor(['yesterday', 5])}).status_code, 400)
+		self.client.force_login(self.other)
+		self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class BufferedActivityLogTests(TestCase):
+	def setUp(self):
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+
+	def test_request_entries_are_written_in_one_insert(self):
+		from . import activity
+		from .models import Activity
+		# A COUNT check plus one INSERT for all three entries
+		with self.assertNumQueries(2):
+			with self.captureOnCommitCallbacks(execute=True):
+				with activity.buffered():
+					for i in range(3):
+						activity.record(self.admin, 'add', 'room', f'Room {i}', f'Added room {i}')
+				self.assertEqual(Activity.objects.count(), 0)
+		self.assertEqual(sorted(Activity.objects.values_list('entity_name', flat=True)), ['Room 0', 'Room 1', 'Room 2'])
+
+	def test_rolled_back_entries_are_dropped(self):
+		from django.db import transaction
+		from . import activity
+		from .models import Activity
+		with self.captureOnCommitCallbacks(execute=True):
+			with activity.buffered():
+				activity.record(self.admin, 'add', 'room', 'Kept', 'Kept')
+				try:
+					with transaction.atomic():
+						activity.record(self.admin, 'add', 'room', 'Lost', 'Lost')
+						raise ValueError
+				except ValueError:
+					pass
+		self.assertEqual(list(Activity.objects.values_list('entity_name', flat=True)), ['Kept'])
+
+	def test_summarized_bulk_entry(self):
+		from . import activity
+		from .models import Activity
+		with self.captureOnCommitCallbacks(execute=True):
+			with activity.summarized(self.admin, 'add', 'schedule', '{count} schedules', 'Generated {count} schedules for CPE31S1'):
+				for i in range(42):
+					activity.record(self.admin, 'add', 'schedule', f'CPE{i}', 'Created schedule')
+				activity.record(self.admin, 'edit', 'section', 'CPE31S1', 'Marked complete')
+		self.assertEqual(
+			sorted(Activity.objects.values_list('message', flat=True)),
+			['Generated 42 schedules for CPE31S1', 'Marked complete'],
+		)
+
+	def test_view_logs_through_middleware(self):
+		from .models import Activity, Curriculum, Section
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		self.client.force_login(self.admin)
+		with self.captureOnCommitCallbacks(execute=True):
+			resp = self.client.post(reverse('delete_section', args=[section.id]))
+		self.assertTrue(resp.json()['success'])
+		self.assertEqual(list(Activity.objects.values_list('message', flat=True)), ['Deleted section: CPE11S1'])
+
+
+class PerfMetricsTests(TestCase):
+	def setUp(self):
+		from . import perf
+		perf.reset()
+		self.addCleanup(perf.reset)
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(self.admin)
+
+	def test_unnamed_views_are_keyed_by_dotted_path(self):
+		from django.urls import resolve
+		from django.urls.resolvers import ResolverMatch
+		from . import perf
+		self.assertEqual(perf.view_label(None), perf.UNRESOLVED)
+		self.assertEqual(perf.view_label(resolve(reverse('api_sync'))), 'api_sync')
+		unnamed = ResolverMatch(resolve(reverse('api_sync')).func, (), {})
+		self.assertEqual(perf.view_label(unnamed), 'hello.views.api_sync')
+
+	def test_views_are_timed_and_queries_counted(self):
+		from .models import Curriculum, Section
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		for _ in range(3):
+			self.client.get(reverse('api_sections'))
+		stats = self.client.get(reverse('perf_json')).json()['views']['api_sections']
+		self.assertEqual(stats['requests'], 3)
+		# session, user and the section list
+		self.assertEqual(stats['queries']['max'], 3)
+		self.assertEqual(sum(bucket['count'] for bucket in stats['histogram']), 3)
+		self.assertIsNotNone(stats['wall_ms']['p95'])
+
+	def test_repeated_queries_are_reported(self):
+		from django.db import connection
+		from . import perf
+		recorder = perf.QueryRecorder()
+		with connection.execute_wrapper(recorder):
+			for user_id in range(4):
+				list(User.objects.filter(id=user_id))
+			User.objects.count()
+		self.assertEqual((recorder.count, recorder.duplicates), (5, 3))
+		self.assertEqual(recorder.most_repeated()[1], 4)
+
+	def test_slow_requests_are_logged(self):
+		with self.settings(PERF_SLOW_REQUEST_MS=0):
+			with self.assertLogs('hello.perf', 'WARNING') as logs:
+				self.client.get(reverse('api_rooms'))
+		self.assertIn('api_rooms', logs.output[0])
+		self.assertEqual(self.client.get(reverse('perf_json')).json()['views']['api_rooms']['slow_requests'], 1)
+
+	def test_dashboard_is_admin_only(self):
+		self.client.get(reverse('api_rooms'))
+		resp = self.client.get(reverse('perf_dashboard'))
+		self.assertContains(resp, 'api_rooms')
+		self.client.post(reverse('perf_dashboard'))
+		self.assertNotIn('api_rooms', self.client.get(reverse('perf_json')).json()['views'])
+
+		User.objects.create_user(username='staff1', password='Staff1234!', is_staff=True)
+		self.client.force_login(User.objects.get(username='staff1'))
+		self.assertEqual(self.client.get(reverse('perf_json')).status_code, 302)
+
+
+class ReferenceCacheTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		self.course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', credit_units=3, year_level=1, semester=1)
+		Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		Room.objects.create(name='Lab 1', room_number='101')
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(self.admin)
+
+	def _queries(self, url):
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		with CaptureQueriesContext(connection) as queries:
+			self.assertEqual(self.client.get(url).status_code, 200)
+		return len(queries)
+
+	def test_pages_reuse_cached_lists(self):
+		from django.core.cache import cache
+		cache.clear()
+		cold = self._queries(reverse('schedule_view'))
+		# session, user, the section table, the live feed position; lists and
+		# the faculty lookup are cached
+		self.assertEqual(self._queries(reverse('schedule_view')), 4)
+		self.assertEqual(cold - 4, 2)
+		# Course, instructor, section and room options are fetched when a modal opens
+		resp = self.client.get(reverse('schedule_view'))
+		self.assertNotContains(resp, 'CPE101 - Intro')
+		self.assertNotIn('all_courses', resp.context)
+		self.assertNotIn('section_list', resp.context)
+
+		# Schedule edits leave the lists cached; a new course refreshes only its list
+		from .models import Course
+		Course.objects.create(curriculum=self.course.curriculum, course_code='CPE102', descriptive_title='Next', credit_units=3, year_level=1, semester=1)
+		courses = self.client.get(reverse('api_reference'), {'lists': 'courses'}).json()['courses']
+		self.assertEqual([c['course_code'] for c in courses], ['CPE101', 'CPE102'])
+
+	def test_reference_endpoint(self):
+		resp = self.client.get(reverse('api_reference'), {'lists': 'rooms,courses'})
+		data = resp.json()
+		self.assertEqual(sorted(data), ['courses', 'rooms'])
+		self.assertEqual(data['rooms'][0]['room_type_display'], 'Lecture')
+		self.assertEqual(self.client.get(reverse('api_reference'), {'lists': 'rooms,courses'}, HTTP_IF_NONE_MATCH=resp['ETag']).status_code, 304)
+		self.assertEqual(self.client.get(reverse('api_reference'), {'lists': 'users'}).status_code, 400)
+
+		self.course.descriptive_title = 'Introduction'
+		self.course.save()
+		resp = self.client.get(reverse('api_reference'), {'lists': 'rooms,courses'}, HTTP_IF_NONE_MATCH=resp['ETag'])
+		self.assertEqual(resp.json()['courses'][0]['descriptive_title'], 'Introduction')
+
+		User.objects.create_user(username='student', password='Student1234!')
+		self.client.force_login(User.objects.get(username='student'))
+		self.assertEqual(self.client.get(reverse('api_reference')).status_code, 403)
+
+	def test_faculty_lookup_is_cached_per_user(self):
+		from . import reference
+		member = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		self.assertIsNone(reference.faculty_for_user(User.objects.get(id=self.admin.id)))
+		member.user = self.admin
+		member.save()
+		# Linking the profile bumps the user's tag: one lookup, then memoized
+		with self.assertNumQueries(2):
+			user = User.objects.get(id=self.admin.id)
+			self.assertEqual(reference.faculty_for_user(user), member)
+			self.assertEqual(reference.faculty_for_user(user), member)
+		with self.assertNumQueries(0):
+			self.assertEqual(reference.faculty_for_user(User(id=self.admin.id)), member)
+
+
+class ProfilingTests(TestCase):
+	def setUp(self):
+		import shutil
+		import tempfile
+		self.directory = tempfile.mkdtemp()
+		self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+		override = self.settings(PROFILE_DIR=self.directory, PROFILE_KEEP=2)
+		override.enable()
+		self.addCleanup(override.disable)
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(self.admin)
+
+	def test_admin_request_is_profiled_on_demand(self):
+		self.assertNotIn('X-Profile-Id', self.client.get(reverse('api_rooms')))
+		resp = self.client.get(reverse('api_rooms'), {'profile': '1'})
+		profile_id = resp['X-Profile-Id']
+		self.assertIn('total;dur=', resp['Server-Timing'])
+
+		report = self.client.get(reverse('profile_report', args=[profile_id])).json()
+		self.assertTrue(report['label'].startswith('GET /api/rooms/'))
+		self.assertTrue(report['top'])
+		download = self.client.get(reverse('profile_download', args=[profile_id]))
+		self.assertIn('attachment', download['Content-Disposition'])
+		self.assertTrue(b''.join(download.streaming_content))
+
+		for _ in range(2):
+			self.client.get(reverse('api_rooms'), HTTP_X_PROFILE='1')
+		profiles = self.client.get(reverse('profile_list')).json()['profiles']
+		self.assertEqual(len(profiles), 2)  # PROFILE_KEEP
+		self.assertNotIn(profile_id, [p['id'] for p in profiles])
+		self.assertEqual(self.client.get(reverse('profile_download', args=[profile_id])).status_code, 404)
+
+	def test_flag_is_ignored_for_non_admins(self):
+		staff = User.objects.create_user(username='staff1', password='Staff1234!', is_staff=True)
+		self.client.force_login(staff)
+		self.assertNotIn('X-Profile-Id', self.client.get(reverse('staff_dashboard'), {'profile': '1'}))
+		self.assertEqual(os.listdir(self.directory), [])
+
+	def test_import_stages_are_recorded_as_spans(self):
+		from . import importers, profiling
+		profile = profiling.Profile('import')
+		with profile.running():
+			importers.import_schedules([{'section': 'CPE11S1', 'course_code': 'CPE101'}], dry_run=True)
+		self.assertEqual(
+			[span['name'] for span in profile.spans],
+			['import_schedules.load', 'import_schedules.validate', 'import_schedules.index', 'import_schedules.search'],
+		)
+
+	def test_profile_view_command(self):
+		from io import StringIO
+		from django.core.management import call_command
+		out = StringIO()
+		call_command('profile_view', reverse('admin_dashboard'), limit=5, stdout=out)
+		output = out.getvalue()
+		self.assertTrue(output.startswith('200 in '))
+		self.assertIn('as root', output)
+		self.assertEqual(len([name for name in os.listdir(self.directory) if name.endswith('.prof')]), 1)
+
+
+class LiveFeedTests(TestCase):
+	def setUp(self):
+		from .models import Curriculum, Course, Section, Room, Schedule
+		from . import live
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		course = Course.objects.create(curriculum=curriculum, course_code='CPE101', descriptive_title='Intro', credit_units=3, year_level=1, semester=1)
+		self.section = Section.objects.create(name='CPE11S1', year_level=1, semester=1, curriculum=curriculum)
+		self.room = Room.objects.create(name='Lab 1', room_number='101')
+		self.faculty = Faculty.objects.create(first_name='Ada', last_name='Lovelace', email='ada@tip.edu.ph')
+		self.start = live.latest_id()
+		self.schedule = Schedule.objects.create(course=course, section=self.section, faculty=self.faculty, day=0, start_time='08:00', end_time='09:30')
+		self.user = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+		self.client.force_login(self.user)
+
+	def _events(self, after):
+		data = self.client.get(reverse('api_live_changes'), {'after': after}).json()
+		return data['events'], data['last_id']
+
+	def test_schedule_writes_are_reported_with_affected_ids(self):
+		self.schedule.room = self.room
+		self.schedule.save()
+		self.schedule.delete()
+		events, last_id = self._events(self.start)
+		self.assertEqual([e['action'] for e in events], ['created', 'updated', 'deleted'])
+		self.assertEqual(events[0]['row']['start_time'], '08:00')
+		self.assertEqual((events[1]['sections'], events[1]['faculty'], events[1]['rooms']), ([self.section.id], [self.faculty.id], [self.room.id]))
+		self.assertIsNone(events[2]['row'])
+		self.assertEqual(self._events(last_id), ([], last_id))
+
+		# Without ?after= only the position is returned
+		data = self.client.get(reverse('api_live_changes')).json()
+		self.assertEqual((data['events'], data['last_id']), ([], last_id))
+
+	def test_schedule_page_starts_the_feed_where_it_was_rendered(self):
+		resp = self.client.get(reverse('schedule_view'))
+		after = resp.context['live_after']
+		self.assertContains(resp, f'<script id="liveAfter" type="application/json">{after}</script>', html=True)
+		# An edit made before the page connects is still delivered
+		self.schedule.delete()
+		events, _ = self._events(after)
+		self.assertEqual([e['action'] for e in events], ['deleted'])
+
+	def test_deleting_an_instructor_reports_their_schedules(self):
+		faculty_id = self.faculty.id
+		self.faculty.delete()
+		events, _ = self._events(self.start + 1)
+		self.assertEqual([e['action'] for e in events], ['bulk'])
+		self.assertEqual((events[0]['sections'], events[0]['faculty']), ([self.section.id], [faculty_id]))
+
+	def test_waits_at_a_gap_until_it_settles(self):
+		from datetime import timedelta
+		from django.utils import timezone
+		from .models import ScheduleChange
+		from . import live
+		first = live.record('bulk', live.affected_by([]))
+		live.record('bulk', live.affected_by([]))
+		third = live.record('bulk', live.affected_by([]))
+		ScheduleChange.objects.filter(id=first.id + 1).delete()
+		events, last_id = live.changes_after(first.id - 1)
+		self.assertEqual((len(events), last_id), (1, first.id))
+		ScheduleChange.objects.filter(id=third.id).update(created_at=timezone.now() - timedelta(minutes=1))
+		events, last_id = live.changes_after(last_id)
+		self.assertEqual([e['id'] for e in events], [third.id])
+
+	def test_stream_only_under_asgi(self):
+		self.assertEqual(self.client.get(reverse('live_stream')).status_code, 204)
+
+	async def test_stream_resumes_from_last_event_id(self):
+		from django.test import override_settings
+		with override_settings(LIVE_STREAM_SECONDS=0.05, LIVE_POLL_SECONDS=0.01):
+			await self.async_client.aforce_login(self.user)
+			response = await self.async_client.get(reverse('live_stream'), headers={'Last-Event-ID': str(self.start)})
+			self.assertEqual(response['Content-Type'], 'text/event-stream')
+			body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+		self.assertIn(f'id: {self.start}\nevent: ready', body)
+		self.assertIn(f'event: schedule\ndata: {{"id":{self.start + 1},"action":"created"', body)
+
+
+class QueryCountRegressionTests(TestCase):
+	"""Every read view must issue the same number of queries whatever the dataset size.
+
+	The dataset is seeded at two scales; the anchor section, faculty member and
+	room used in the URLs gain schedules at the larger scale too, so per-row
+	queries in list pages and in detail/print views both show up as a
+	difference. QUERY_BUDGETS additionally caps each count, so an added
+	constant query is a deliberate change here as well.
+	"""
+	SMALL = {'sections': 3, 'per_section': 2}
+	LARGE = {'sections': 10, 'per_section': 5}
+
+	# Queries per request, including the session and user lookups
+	QUERY_BUDGETS = {
+		'admin_dashboard': 12, 'section_view': 5, 'course_view': 4, 'schedule_view': 6,
+		'faculty_view': 5, 'room_view': 4, 'export_schedules': 3,
+		'edit_section': 4, 'edit_course': 4, 'edit_faculty': 5, 'edit_room': 3, 'edit_schedule': 6, 'edit_curriculum': 3,
+		'get_section_schedule': 5, 'get_faculty_schedule': 6, 'get_room_schedule': 4,
+		'admin_section_schedule_print': 5, 'admin_faculty_schedule_print': 6, 'admin_room_schedule_print': 5,
+		'perf_dashboard': 2, 'staff_dashboard': 4, 'staff_schedule': 4, 'staff_schedule_print': 6,
+		'get_available_resources': 4, 'get_user_faculty_data': 4, 'api_dashboard_stats': 4, 'api_curriculums': 3,
+		'api_sections': 3, 'api_rooms': 3, 'api_faculty_list': 3, 'api_my_schedule': 6, 'api_faculty_schedule': 6,
+		'api_bootstrap': 8, 'api_sync': 8, 'api_activity': 3, 'api_courses': 3, 'course_detail': 4, 'calendar_feed': 2,
+		'api_reference': 7, 'api_live_changes': 4,
+	}
+
+	# Mutations, uploads and auth flows: not read views
+	UNMEASURED = {
+		'save_account_settings', 'perf_json', 'cache_stats', 'add_section', 'delete_section', 'delete_section_schedules',
+		'toggle_section_status', 'add_course', 'delete_course', 'import_courses', 'import_schedules',
+		'add_schedule', 'delete_schedule', 'add_curriculum', 'delete_curriculum', 'add_faculty', 'import_faculty',
+		'delete_faculty', 'add_room', 'delete_room', 'admin_logout', 'password_reset', 'password_reset_done',
+		'password_reset_confirm', 'password_reset_complete', 'token_obtain_pair', 'token_refresh',
+		'api_password_reset', 'api_password_reset_confirm', 'api_add_course', 'profile_list', 'profile_report',
+		'profile_download', 'live_stream',
+	}
+
+	def setUp(self):
+		self.admin = User.objects.create_superuser(username='root', password='Root1234!', email='root@tip.edu.ph')
+
+	def _seed(self, sections, per_section):
+		from .models import Activity, Course, Curriculum, Room, Schedule, Section
+		for model in (Activity, Schedule, Section, Course, Curriculum, Room, Faculty):
+			model.objects.all().delete()
+		User.objects.exclude(id=self.admin.id).delete()
+
+		curriculum = Curriculum.objects.create(name='BSCPE', year=2024)
+		courses = {}
+		for year in range(1, 5):
+			courses[year] = [
+				Course.objects.create(
+					curriculum=curriculum, course_code=f'CPE{year}{i:02d}', descriptive_title=f'Course {year}-{i}',
+					lecture_hours=2, laboratory_hours=3, credit_units=3, year_level=year, semester=1,
+				)
+				for i in range(per_section)
+			]
+		faculty = []
+		for i in range(sections):
+			user = User.objects.create_user(username=f'fac{i}@tip.edu.ph', email=f'fac{i}@tip.edu.ph', password='Staff1234!', is_staff=True)
+			member = Faculty.objects.create(user=user, first_name=f'First{i}', last_name=f'Last{i}', email=user.email)
+			member.specialization.set(courses[1])
+			faculty.append(member)
+		rooms = [
+			Room.objects.create(name=f'Room {i}', room_number=f'{300 + i}', campus='arlegui' if i % 2 else 'casal')
+			for i in range(sections)
+		]
+		section_rows = []
+		for i in range(sections):
+			year = i % 4 + 1
+			section = Section.objects.create(name=f'CPE{year}1S{i // 4 + 1}', year_level=year, semester=1, curriculum=curriculum)
+			section_rows.append(section)
+			for j, course in enumerate(courses[year]):
+				# Every schedule gets its own slot, so none conflict; the anchors
+				# (faculty[0], rooms[0], section_rows[0]) gain rows with scale
+				slot = i * per_section + j
+				Schedule.objects.create(
+					course=course, section=section,
+					faculty=faculty[0] if j == 0 else faculty[(i + j) % sections],
+					room=rooms[0] if j == 0 else rooms[(i + j) % sections],
+					day=slot % 6, start_time=f'{7 + slot // 6:02d}:30', end_time=f'{8 + slot // 6:02d}:30',
+				)
+			Activity.objects.create(user=self.admin, action='add', entity_type='section', entity_name=section.name, message=f'Added section {section.name}')
+		return {
+			'section': section_rows[0], 'faculty': faculty[0], 'room': rooms[0],
+			'course': courses[1][0], 'curriculum': curriculum, 'schedule': Schedule.objects.order_by('id').first(),
+		}
+
+	def _cases(self, anchors):
+		from . import calendar_feeds
+		section, member, room = anchors['section'].id, anchors['faculty'].id, anchors['room'].id
+		return [
+			('admin_dashboard', 'admin', reverse('admin_dashboard'), {}),
+			('section_view', 'admin', reverse('section_view'), {}),
+			('course_view', 'admin', reverse('course_view'), {}),
+			('schedule_view', 'admin', reverse('schedule_view'), {}),
+			('faculty_view', 'admin', reverse('faculty_view'), {}),
+			('room_view', 'admin', reverse('room_view'), {}),
+			('export_schedules', 'admin', reverse('export_schedules'), {}),
+			('edit_section', 'admin', reverse('edit_section', args=[section]), {}),
+			('edit_course', 'admin', reverse('edit_course', args=[anchors['course'].id]), {}),
+			('edit_faculty', 'admin', reverse('edit_faculty', args=[member]), {}),
+			('edit_room', 'admin', reverse('edit_room', args=[room]), {}),
+			('edit_schedule', 'admin', reverse('edit_schedule', args=[anchors['schedule'].id]), {}),
+			('edit_curriculum', 'admin', reverse('edit_curriculum', args=[anchors['curriculum'].id]), {}),
+			('get_section_schedule', 'admin', reverse('get_section_schedule', args=[section]), {}),
+			('get_faculty_schedule', 'admin', reverse('get_faculty_schedule', args=[member]), {}),
+			('get_room_schedule', 'admin', reverse('get_room_schedule', args=[room]), {}),
+			('admin_section_schedule_print', 'admin', reverse('admin_section_schedule_print', args=[section]), {}),
+			('admin_faculty_schedule_print', 'admin', reverse('admin_faculty_schedule_print', args=[member]), {}),
+			('admin_room_schedule_print', 'admin', reverse('admin_room_schedule_print', args=[room]), {}),
+			('perf_dashboard', 'admin', reverse('perf_dashboard'), {}),
+			('staff_dashboard', 'staff', reverse('staff_dashboard'), {}),
+			('staff_schedule', 'staff', reverse('staff_schedule'), {}),
+			('staff_schedule_print', 'staff', reverse('staff_schedule_print'), {}),
+			('get_available_resources', 'admin', reverse('get_available_resources'), {'day': 1, 'start_time': '07:30', 'end_time': '09:00'}),
+			('get_user_faculty_data', 'staff', reverse('get_user_faculty_data'), {}),
+			('api_dashboard_stats', 'admin', reverse('api_dashboard_stats'), {}),
+			('api_curriculums', 'admin', reverse('api_curriculums'), {}),
+			('api_sections', 'admin', reverse('api_sections'), {}),
+			('api_rooms', 'admin', reverse('api_rooms'), {}),
+			('api_faculty_list', 'admin', reverse('api_faculty_list'), {}),
+			('api_my_schedule', 'staff', reverse('api_my_schedule'), {}),
+			('api_faculty_schedule', 'admin', reverse('api_faculty_schedule', args=[member]), {}),
+			('api_bootstrap', 'staff', reverse('api_bootstrap'), {}),
+			('api_reference', 'admin', reverse('api_reference'), {}),
+			('api_sync', 'admin', reverse('api_sync'), {}),
+			('api_live_changes', 'admin', reverse('api_live_changes'), {'after': 0}),
+			('api_activity', 'admin', reverse('api_activity'), {}),
+			('api_courses', 'admin', reverse('api_courses'), {}),
+			('course_detail', 'admin', reverse('course_detail', args=[anchors['course'].id]), {}),
+			('calendar_feed', None, reverse('calendar_feed', args=[calendar_feeds.make_feed_token('faculty', member)]), {}),
+		]
+
+	def _measure(self, scale):
+		from django.core.cache import cache
+		from django.db import connection
+		from django.test.utils import CaptureQueriesContext
+		anchors = self._seed(**scale)
+		users = {'admin': self.admin, 'staff': anchors['faculty'].user}
+		counts = {}
+		for name, who, url, params in self._cases(anchors):
+			cache.clear()
+			if who:
+				self.client.force_login(users[who])
+			else:
+				self.client.logout()
+			with CaptureQueriesContext(connection) as queries:
+				response = self.client.get(url, params)
+				if response.streaming:
+					b''.join(response.streaming_content)
+			self.assertLess(response.status_code, 400, f'{name} returned {response.status_code}')
+			counts[name] = len(queries)
+		return counts
+
+	def test_every_url_is_covered(self):
+		from . import urls
+		names = {pattern.name for pattern in urls.urlpatterns if pattern.name}
+		measured = {case[0] for case in self._cases(self._seed(sections=1, per_section=1))}
+		self.assertEqual(names - measured - self.UNMEASURED, set())
+		self.assertEqual(measured, set(self.QUERY_BUDGETS))
+
+	def test_query_counts_do_not_grow_with_data(self):
+		small = self._measure(self.SMALL)
+		large = self._measure(self.LARGE)
+		for name, budget in self.QUERY_BUDGETS.items():
+			with self.subTest(view=name):
+				self.assertEqual(small[name], large[name], f'{name} queries grow with the data')
+				self.assertLessEqual(large[name], budget, f'{name} exceeds its query budget')
+
+
+class SeedScaleCommandTests(TestCase):
+	def test_generates_valid_conflict_free_dataset(self):
+		from io import StringIO
+		from django.core.management import call_command
+		from django.core.management.base import CommandError
+		from django.db.models import Count, F
+		from .models import Course, Schedule, Section
+		out = StringIO()
+		call_command('seed_scale', sections=30, faculty=6, rooms=5, schedules_per_section=4, seed=7, password='Scale1234!', stdout=out)
+		self.assertIn('Created 30 sections, 120 schedules, 32 courses', out.getvalue())
+
+		for section in Section.objects.all():
+			section.full_clean()
+		self.assertTrue(all(
+			(c.year_level, c.semester) in [(y, s) for y, _ in Course.YEAR_CHOICES for s, _ in Course.SEMESTER_CHOICES]
+			for c in Course.objects.all()
+		))
+		for field in ('faculty', 'room', 'section'):
+			clashes = (Schedule.objects.filter(**{f'{field}__isnull': False})
+				.values(field, 'day', 'start_time').annotate(n=Count('id')).filter(n__gt=1))
+			self.assertFalse(clashes.exists(), f'{field} double-booked')
+		self.assertFalse(Schedule.objects.exclude(course__year_level=F('section__year_level')).exists())
+		self.assertTrue(self.client.login(username='scale7.f0@tip.edu.ph', password='Scale1234!'))
+
+		with self.assertRaises(CommandError):
+			call_command('seed_scale', sections=1, faculty=1, rooms=1, schedules_per_section=1, seed=7)
@@ -0,0 +1,119 @@
+"""Streaming upload handler for profile pictures.
+
+Django buffers every uploaded file completely (in memory up to 2.5 MB,
+then in a temp file) before a view can look at its size or type, so a
+too-large or bogus upload ties up a worker until the whole body has been
+read. ``ProfilePictureUploadHandler`` checks as the body streams in:
+
+* a ``Content-Length`` above the cap is rejected before the body is read;
+* the first bytes must carry a PNG or JPEG signature;
+* the running size is checked on every chunk;
+* data goes straight to a temp file, never to an in-memory copy.
+
+A rejected upload raises ``StopUpload(connection_reset=True)`` so the rest
+of the body is not consumed, and the reason is left on
+``request.upload_error`` for the view to report. The handler must be
+installed before anything reads ``request.POST`` (including the CSRF
+middleware), see ``views.save_account_settings``.
+"""
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+)
+SIGNATURE_LENGTH = max(len(magic) for magic, _ in IMAGE_SIGNATURES)
+
+# Allowance for the other account-settings form fields in the request body
+FORM_OVERHEAD = 64 * 1024
+
+
+def sniff_image_type(head):
+    """Content type implied by the first bytes of a file, or None"""
+    for magic, content_type in IMAGE_SIGNATURES:
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+def size_limit_message(max_size):
+    if max_size >= 1024 * 1024:
+        return f'File size must be under {max_size // (1024 * 1024)}MB'
+    return f'File size must be under {max(max_size // 1024, 1)}KB'
+
+
+class ProfilePictureUploadHandler(FileUploadHandler):
+    """Stream one image field to a temp file, aborting early when it is too
+    large or not a PNG/JPEG. Other file fields fall through to the default
+    handlers."""
+
+    def __init__(self, request, field_name='profilePicture', max_size=None):
+        super().__init__(request)
+        self.field_name = field_name
+        self.max_size = max_size or settings.PROFILE_PICTURE_MAX_UPLOAD_SIZE
+        self.active = False
+        request.upload_error = None
+
+    def _abort(self, message):
+        # The parser closes (and so deletes) ``self.file`` on StopUpload
+        self.request.upload_error = message
+        raise StopUpload(connection_reset=True)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > self.max_size + FORM_OVERHEAD:
+            # Claim the request with empty data so the body is never read
+            self.request.upload_error = size_limit_message(self.max_size)
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        if content_length and content_length > self.max_size:
+            self._abort(size_limit_message(self.max_size))
+        self.file = TemporaryUploadedFile(file_name, content_type, 0, charset, content_type_extra)
+        self.received = 0
+        self.head = b''
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self._abort(size_limit_message(self.max_size))
+        if len(self.head) < SIGNATURE_LENGTH:
+            self.head += raw_data[:SIGNATURE_LENGTH - len(self.head)]
+            if len(self.head) >= SIGNATURE_LENGTH and sniff_image_type(self.head) is None:
+                self._abort('Only PNG and JPEG images are allowed')
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        uploaded = self.file
+        del self.file
+        uploaded.seek(0)
+        uploaded.size = file_size
+        content_type = sniff_image_type(self.head)
+        if content_type is None:
+            # Too short to be rejected while streaming. Raising here would
+            # escape the parser, so flag it and let the view answer 400.
+            self.request.upload_error = 'Only PNG and JPEG images are allowed'
+        else:
+            # Trust the bytes, not the client-supplied Content-Type
+            uploaded.content_type = content_type
+        return uploaded
+
+    def upload_interrupted(self):
+        if hasattr(self, 'file'):
+            self.file.close()
+            del self.file
@@ -13,6 +13,14 @@ urlpatterns = [
     path('staff/schedule/', views.staff_schedule, name='staff_schedule'),
     path('staff/schedule/print/', views.staff_schedule_print, name='staff_schedule_print'),
     path('staff/account/save/', views.save_account_settings, name='save_account_settings'),
+
+    # Performance metrics
+    path('admin/perf/', views.perf_dashboard, name='perf_dashboard'),
+    path('admin/perf/json/', views.perf_json, name='perf_json'),
+    path('admin/perf/cache/', views.cache_stats, name='cache_stats'),
+    path('admin/profiles/', views.profile_list, name='profile_list'),
+    path('admin/profiles/<slug:profile_id>/', views.profile_report, name='profile_report'),
+    path('admin/profiles/<slug:profile_id>/download/', views.profile_download, name='profile_download'),
     
     # Sections
     path('admin/section/', views.section_view, name='section_view'),  
@@ -28,9 +36,12 @@ urlpatterns = [
     path('admin/course/add/', views.add_course, name='add_course'),
     path('admin/course/edit/<int:course_id>/', views.edit_course, name='edit_course'),
     path('admin/course/delete/<int:course_id>/', views.delete_course, name='delete_course'),
+    path('admin/course/import/', views.import_courses, name='import_courses'),
     
     # Schedules
     path('admin/schedule/', views.schedule_view, name='schedule_view'),
+    path('admin/schedule/export/', views.export_schedules, name='export_schedules'),
+    path('admin/schedule/import/', views.import_schedules, name='import_schedules'),
     path('admin/section/<int:section_id>/schedule/print/', views.admin_section_schedule_print, name='admin_section_schedule_print'),
     path('admin/faculty/<int:faculty_id>/schedule/print/', views.admin_faculty_schedule_print, name='admin_faculty_schedule_print'),
     path('admin/room/<int:room_id>/schedule/print/', views.admin_room_schedule_print, name='admin_room_schedule_print'),
@@ -46,6 +57,7 @@ urlpatterns = [
     # Faculty CRUD operations
     path('admin/faculty/', views.faculty_view, name='faculty_view'),
     path('admin/faculty/add/', views.add_faculty, name='add_faculty'),
+    path('admin/faculty/import/', views.import_faculty, name='import_faculty'),
     path('admin/faculty/edit/<int:faculty_id>/', views.edit_faculty, name='edit_faculty'),
     path('admin/faculty/delete/<int:faculty_id>/', views.delete_faculty, name='delete_faculty'),
     path('admin/faculty/<int:faculty_id>/schedule-data/', views.get_faculty_schedule, name='get_faculty_schedule'),
@@ -100,8 +112,17 @@ urlpatterns = [
     path('api/faculty-list/', views.get_faculty_list, name='api_faculty_list'),
     path('api/my-schedule/', views.api_my_schedule, name='api_my_schedule'),
     path('api/faculty/<int:faculty_id>/schedule-data/', views.api_faculty_schedule, name='api_faculty_schedule'),
+    path('api/bootstrap/', views.api_bootstrap, name='api_bootstrap'),
+    path('api/reference/', views.api_reference, name='api_reference'),
+    path('api/sync/', views.api_sync, name='api_sync'),
+    path('api/live/changes/', views.api_live_changes, name='api_live_changes'),
+    path('api/live/stream/', views.live_stream, name='live_stream'),
+    path('api/activity/', views.get_activity_history, name='api_activity'),
     path('api/courses/', views.get_courses, name='api_courses'),
     path('api/courses/<int:course_id>/', views.course_detail, name='course_detail'),
     path('api/courses/add/', views.api_add_course, name='api_add_course'),
+
+    # iCalendar feeds (signed token, no login required)
+    path('calendar/<str:token>.ics', views.calendar_feed, name='calendar_feed'),
 ]
 
@@ -2,25 +2,30 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.http import JsonResponse, Http404
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from django.http import JsonResponse, Http404, StreamingHttpResponse, FileResponse, HttpResponse, HttpResponseNotModified
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail, EmailMessage, get_connection
-import requests
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.files.storage import default_storage
 from django.db.models import Sum, Q
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 from datetime import datetime, timedelta
+from asgiref.sync import sync_to_async
 import random
 import re
 import string
 from .models import Course, Curriculum, Activity, Faculty, Section, Schedule, Room
 from .forms import CourseForm, CurriculumForm
-from rest_framework.decorators import api_view, permission_classes
+from . import exports, calendar_feeds, importers, pagination, sync, bootstrap, compact, images, uploads, activity, perf, profiling, reference, live
+from . import caching
+from .outbox import enqueue_email, invitation_email
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
@@ -30,36 +35,6 @@ def is_admin(user):
     return user.is_staff and user.is_superuser
 
 
-def send_email_via_brevo_api(subject, message, from_email, recipients):
-    if not settings.BREVO_API_KEY:
-        raise ValueError('Brevo API key is not configured')
-
-    payload = {
-        'sender': {
-            'email': from_email,
-            'name': 'ASSIST Administration Team',
-        },
-        'to': [{'email': recipient} for recipient in recipients],
-        'subject': subject,
-        'textContent': message,
-    }
-
-    headers = {
-        'Accept': 'application/json',
-        'Content-Type': 'application/json',
-        'api-key': settings.BREVO_API_KEY,
-    }
-
-    response = requests.post(
-        'https://api.brevo.com/v3/smtp/email',
-        json=payload,
-        headers=headers,
-        timeout=settings.EMAIL_TIMEOUT,
-    )
-    response.raise_for_status()
-    return response.json()
-
-
 def admin_login(request):
     """Handle admin login with custom template"""
     # If user is already authenticated, redirect based on role
@@ -250,62 +225,38 @@ def admin_dashboard(request):
     faculty_count = Faculty.objects.count()
     section_count = Section.objects.count()
     
-    # Get all curricula for forms
-    curricula = Curriculum.objects.all()
-    
-    # Get faculty list with their total units
-    faculty_list = Faculty.objects.all().order_by('last_name', 'first_name')
+    # Dropdown lists for the modals (cached, see reference.py)
+    curricula = reference.get_list('curricula')
     
-    # Get section list with schedule status
-    section_list = Section.objects.all().order_by('year_level', 'semester', 'name')
+    # Get faculty list with their total units (one subquery, not a query per faculty)
+    faculty_list = Faculty.objects.annotate(
+        units_total=Faculty.total_units_annotation()
+    ).order_by('last_name', 'first_name')
     
-    # Get room list for schedule creation
-    room_list = Room.objects.all().order_by('campus', 'room_number')
+    # Get section list with schedule status and total units (unique courses only)
+    section_list = Section.objects.annotate(
+        calculated_total_units=Section.total_units_annotation()
+    ).order_by('year_level', 'semester', 'name')
     
-    # Calculate total units for each section (counting unique courses only)
     for section in section_list:
-        # Get unique course IDs for this section to avoid double-counting
-        unique_course_ids = section.schedules.values_list('course', flat=True).distinct()
-        
-        # Sum credit units for unique courses only
-        calculated_units = Course.objects.filter(id__in=unique_course_ids).aggregate(total=Sum('credit_units'))['total'] or 0
-        
-        # Add as a temporary attribute (not the property)
-        section.calculated_total_units = calculated_units
-        
         # Use the actual status field from the database
         section.has_schedule = (section.status == 'complete')
     
-    # Get all activities from last 2 days
-    today = timezone.now().date()
-    yesterday = today - timedelta(days=1)
+    # Latest activities of today and yesterday (index-backed day ranges)
+    recent_activities = activity.recent_activity_groups(limit=10)
     
-    # Get activities and separate by date
-    today_activities = Activity.objects.filter(
-        timestamp__date=today
-    ).order_by('-timestamp')[:10]
-
-    yesterday_activities = Activity.objects.filter(
-        timestamp__date=yesterday
-    ).order_by('-timestamp')[:10]
-
-    # Create recent_activities dictionary for template
-    recent_activities = {}
-    if today_activities:
-        recent_activities['Today'] = today_activities
-    if yesterday_activities:
-        recent_activities['Yesterday'] = yesterday_activities
+    # Faculty profile for current user (may not exist for pure admin accounts)
+    current_faculty = reference.faculty_for_user(request.user)
     
     # Get courses - show only courses handled by logged-in faculty member
-    try:
-        faculty_profile = Faculty.objects.get(user=request.user)
+    if current_faculty is not None:
         # Get courses from schedules assigned to this faculty member
         scheduled_courses = Course.objects.filter(
-            schedules__faculty=faculty_profile
+            schedules__faculty=current_faculty
         ).distinct().order_by('course_code')
-    except Faculty.DoesNotExist:
+    else:
         # Pure admins with no faculty profile see all courses
-        scheduled_courses = Course.objects.all().order_by('course_code')
+        scheduled_courses = reference.get_list('courses')
     
     # Generate time slots from 7:30 AM to 9:30 PM (30-minute intervals)
     time_slots = []
@@ -328,24 +279,17 @@ def admin_dashboard(request):
     ]
     
     # Get schedules - filter by logged-in admin's faculty profile if they have one
-    try:
-        faculty_profile = Faculty.objects.get(user=request.user)
+    if current_faculty is not None:
         # If logged-in admin has a faculty profile, show only THEIR schedules
-        schedules = Schedule.objects.filter(faculty=faculty_profile).select_related(
+        schedules = Schedule.objects.filter(faculty=current_faculty).select_related(
             'course', 'section', 'faculty', 'room'
         )
-    except Faculty.DoesNotExist:
+    else:
         # If no faculty profile, show all schedules (for pure admin accounts)
         schedules = Schedule.objects.select_related(
             'course', 'section', 'faculty', 'room'
         ).all()
     
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
-    
     context = {
         'user': request.user,
         'faculty': current_faculty,
@@ -353,27 +297,19 @@ def admin_dashboard(request):
         'section_count': section_count,
         'faculty_list': faculty_list,
         'section_list': section_list,
-        'room_list': room_list,
         'recent_activities': recent_activities,
         'scheduled_courses': scheduled_courses,
         'time_slots': time_slots,
         'days': days,
         'schedules': schedules,
         'curricula': curricula,
-        'all_courses': Course.objects.all().order_by('course_code'),
     }
     
     return render(request, 'hello/dashboard.html', context)
 
 def log_activity(user, action, entity_type, entity_name, message):
-    """Helper function to log activities"""
-    Activity.objects.create(
-        user=user,
-        action=action,
-        entity_type=entity_type,
-        entity_name=entity_name,
-        message=message
-    )
+    """Helper function to log activities (buffered per request, see activity.record)"""
+    activity.record(user, action, entity_type, entity_name, message)
 
 def generate_password(length=12):
     """Generate a random password with at least one uppercase, lowercase, digit, and special character"""
@@ -399,21 +335,17 @@ def generate_password(length=12):
 @user_passes_test(is_admin, login_url='admin_login')
 def faculty_view(request):
     """Faculty management page"""
-    # Get all faculty members
-    faculties = Faculty.objects.all().order_by('last_name', 'first_name')
+    # Get all faculty members with their total units
+    faculties = Faculty.objects.annotate(
+        units_total=Faculty.total_units_annotation()
+    ).order_by('last_name', 'first_name')
     
     # Get all courses for specialization selection
-    courses = Course.objects.all().order_by('course_code')
-    
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
+    courses = reference.get_list('courses')
     
     context = {
         'user': request.user,
-        'faculty': current_faculty,
+        'faculty': reference.faculty_for_user(request.user),
         'faculties': faculties,
         'courses': courses,
     }
@@ -501,7 +433,7 @@ def add_faculty(request):
                 courses = Course.objects.filter(id__in=specialization_ids)
                 faculty.specialization.set(courses)
             
-            # Send email with a password reset invitation link using configured SMTP backend
+            # Queue the invitation email (password reset link); the outbox worker sends it
             email_sent = False
             try:
                 uid = urlsafe_base64_encode(force_bytes(user.pk))
@@ -509,47 +441,17 @@ def add_faculty(request):
                 reset_path = reverse('password_reset_confirm', kwargs={'uidb64': uid, 'token': token})
                 reset_url = request.build_absolute_uri(reset_path)
 
-                subject = 'Your ASSIST Account Invitation'
-                message = f'''Hello {first_name},
-
-Your ASSIST account has been created successfully.
-
-Username: {username}
-
-To complete your account setup and choose a secure password, click the link below:
-{reset_url}
-
-If you cannot click the link, copy and paste it into your browser.
-
-If you did not request this account, please contact the administrator immediately.
-
-Best regards,
-ASSIST Administration Team'''
-
-                if getattr(settings, 'BREVO_API_KEY', ''):
-                    send_email_via_brevo_api(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [email],
-                    )
-                else:
-                    send_mail(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,
-                        [email],
-                        fail_silently=False,
-                    )
+                subject, message = invitation_email(first_name, username, reset_url)
+                enqueue_email(subject, message, [email])
 
                 email_sent = True
-                message_text = f'Faculty added successfully. An invitation email has been sent to {email}.'
+                message_text = f'Faculty added successfully. An invitation email will be sent to {email}.'
             except Exception as e:
-                print(f"Error sending invitation email: {str(e)}")
+                print(f"Error queueing invitation email: {str(e)}")
                 email_sent = False
                 message_text = (
-                    'Faculty added successfully, but email could not be sent. '
-                    'Please check your SMTP settings and credentials.'
+                    'Faculty added successfully, but the invitation email could not be queued. '
+                    'Please share the credentials below with the faculty member.'
                 )
             
             # Log activity
@@ -558,7 +460,7 @@ ASSIST Administration Team'''
                 action='add',
                 entity_type='faculty',
                 entity_name=f"{first_name} {last_name}",
-                message=f'Added faculty: {first_name} {last_name} ({role}) - Email {"sent" if email_sent else "failed"}'
+                message=f'Added faculty: {first_name} {last_name} ({role}) - Email {"queued" if email_sent else "failed"}'
             )
             
             return JsonResponse({
@@ -581,6 +483,38 @@ ASSIST Administration Team'''
     
     return JsonResponse({'success': False})
 
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def import_faculty(request):
+    """Bulk onboard faculty from a roster file (CSV/XLSX) and queue their invitations"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Invalid request method']})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'errors': ['Please choose a CSV or XLSX roster to import.']})
+
+    try:
+        rows = importers.read_rows(upload, upload.name)
+    except importers.ImportFileError as e:
+        return JsonResponse({'success': False, 'errors': [str(e)]})
+
+    if not rows:
+        return JsonResponse({'success': False, 'errors': ['The roster does not contain any faculty rows.']})
+
+    with activity.summarized(request.user, 'add', 'faculty', '{count} faculty',
+                             f'Imported {{count}} faculty from {upload.name} - invitation emails queued') as summary:
+        result = importers.import_faculty_roster(rows, request.build_absolute_uri)
+        if result['errors']:
+            return JsonResponse({'success': False, 'errors': result['errors']})
+        summary.count += result['created']
+
+    return JsonResponse({
+        'success': True,
+        'created': result['created'],
+        'message': f"Added {result['created']} faculty. Invitation emails will be sent shortly."
+    })
+
 @login_required(login_url='admin_login')
 @user_passes_test(is_admin, login_url='admin_login')
 def edit_faculty(request, faculty_id):
@@ -685,10 +619,9 @@ def delete_faculty(request, faculty_id):
         # Remember linked user (if any) so we can clean up that specific account
         linked_user = getattr(faculty, 'user', None)
 
-        # Unassign faculty from any schedules (preserve schedule records)
-        Schedule.objects.filter(faculty=faculty).update(faculty=None)
-
-        # Delete the Faculty record
+        # Delete the Faculty record; its schedules are kept and left
+        # unassigned (on_delete=SET_NULL), which also lets the delete
+        # signals see them for cache invalidation
         faculty.delete()
 
         # Clean up all User accounts associated with this email
@@ -721,6 +654,16 @@ def get_faculty_schedule(request, faculty_id):
             'course', 'section', 'room'
         ).order_by('day', 'start_time')
         
+        if compact.requested(request):
+            payload = compact.encode_schedules(schedules)
+            payload.update({
+                'success': True,
+                'specializations': list(faculty.specialization.values('course_code', 'descriptive_title', 'color')),
+                'total_units': faculty.total_units,
+                'calendar_url': calendar_feeds.feed_url(request, 'faculty', faculty.id),
+            })
+            return compact.render(request, payload)
+
         # Format schedule data
         schedule_data = []
         for schedule in schedules:
@@ -750,7 +693,8 @@ def get_faculty_schedule(request, faculty_id):
             'success': True,
             'schedules': schedule_data,
             'specializations': specializations,
-            'total_units': faculty.total_units
+            'total_units': faculty.total_units,
+            'calendar_url': calendar_feeds.feed_url(request, 'faculty', faculty.id),
         })
     except Exception as e:
         import traceback
@@ -773,11 +717,8 @@ def room_view(request):
     # Get all rooms
     rooms = Room.objects.all().order_by('campus', 'room_number')
     
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
+    # Faculty profile for current user (may not exist for pure admin accounts)
+    current_faculty = reference.faculty_for_user(request.user)
     
     context = {
         'user': request.user,
@@ -895,6 +836,22 @@ def get_room_schedule(request, room_id):
             'course', 'section', 'faculty'
         ).order_by('day', 'start_time')
         
+        if compact.requested(request):
+            # Course details for the sidebar are in tables['courses']
+            payload = compact.encode_schedules(schedules)
+            payload.update({
+                'success': True,
+                'room_info': {
+                    'name': room.name,
+                    'room_number': room.room_number,
+                    'campus': room.get_campus_display(),
+                    'room_type': room.get_room_type_display(),
+                    'capacity': room.capacity
+                },
+                'calendar_url': calendar_feeds.feed_url(request, 'room', room.id),
+            })
+            return compact.render(request, payload)
+
         # Format schedule data
         schedule_data = []
         courses_map = {}
@@ -941,7 +898,8 @@ def get_room_schedule(request, room_id):
                 'campus': room.get_campus_display(),
                 'room_type': room.get_room_type_display(),
                 'capacity': room.capacity
-            }
+            },
+            'calendar_url': calendar_feeds.feed_url(request, 'room', room.id),
         })
     except Exception as e:
         import traceback
@@ -952,6 +910,11 @@ def get_room_schedule(request, room_id):
             'error': str(e)
         }, status=500)
     
+SCHEDULE_SECTION_FIELDS = (
+    'id', 'name', 'year_level', 'semester', 'status', 'curriculum', 'curriculum_name', 'curriculum_year', 'total_units',
+)
+SCHEDULE_SECTIONS_PAGE_SIZE = 24
+
 @login_required(login_url='admin_login')
 def schedule_view(request):
     """Schedule management page - shows sections"""
@@ -959,42 +922,129 @@ def schedule_view(request):
         messages.error(request, 'You do not have permission to access this page.')
         return redirect('admin_login')
     
-    # Get all sections with their schedules
-    sections = Section.objects.select_related('curriculum').all()
-    
-    # Calculate total units for each section
-    for section in sections:
-        unique_course_ids = section.schedules.values_list('course', flat=True).distinct()
-        total = Course.objects.filter(id__in=unique_course_ids).aggregate(
-            total=Sum('credit_units')
-        )['total'] or 0
-        section.calculated_total_units = total
-    
-    # Get data needed for the create schedule modal
-    all_courses = Course.objects.all().order_by('course_code')
-    faculty_list = Faculty.objects.all().order_by('last_name', 'first_name')
-    section_list = Section.objects.all().order_by('year_level', 'semester', 'name')
-    room_list = Room.objects.all().order_by('campus', 'room_number')
-    
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
+    # Only the first screen of section cards is rendered; schedule.js pages
+    # through /api/sections/ (same fields and ordering) for the rest and
+    # for searches
+    rows, next_cursor, _ = pagination.list_rows(
+        {'fields': ','.join(SCHEDULE_SECTION_FIELDS), 'limit': SCHEDULE_SECTIONS_PAGE_SIZE},
+        _filtered_sections({}), SECTION_LIST_FIELDS, SECTION_LIST_ORDERING,
+    )
+    section_page = {
+        'results': rows,
+        'next_cursor': next_cursor,
+        'fields': ','.join(SCHEDULE_SECTION_FIELDS),
+        'page_size': SCHEDULE_SECTIONS_PAGE_SIZE,
+        'status_labels': dict(Section.STATUS_CHOICES),
+    }
     
+    # The schedule modals load their course, instructor, section and room
+    # options from /api/reference/ when opened (static/hello/js/reference.js)
     context = {
         'user': request.user,
-        'faculty': current_faculty,
-        'sections': sections,
-        'all_courses': all_courses,
-        'faculty_list': faculty_list,
-        'section_list': section_list,
-        'room_list': room_list,
-        'curricula': Curriculum.objects.all().order_by('-year'),
+        'faculty': reference.faculty_for_user(request.user),
+        'section_page': section_page,
+        'curricula': reference.get_list('curricula'),
+        # The live feed resumes from here, so edits made between rendering
+        # the page and connecting to it are not missed
+        'live_after': live.latest_id(),
     }
     
     return render(request, 'hello/schedule.html', context)
 
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def export_schedules(request):
+    """
+    Export the master timetable as CSV (streamed) or XLSX.
+    Optional filters: curriculum, year, semester, campus
+    """
+    filters = {
+        'curriculum': request.GET.get('curriculum'),
+        'year_level': request.GET.get('year'),
+        'semester': request.GET.get('semester'),
+        'campus': request.GET.get('campus'),
+    }
+    export_format = request.GET.get('format', 'csv').lower()
+    filename = f"schedules_{timezone.localdate().strftime('%Y%m%d')}"
+
+    if export_format == 'xlsx':
+        import tempfile
+        tmp = tempfile.TemporaryFile()
+        try:
+            exports.write_xlsx(exports.iter_schedule_rows(**filters), tmp)
+        except ImportError:
+            tmp.close()
+            return JsonResponse({
+                'success': False,
+                'errors': ['XLSX export requires the openpyxl package. Use format=csv instead.']
+            }, status=400)
+        tmp.seek(0)
+        return FileResponse(
+            tmp,
+            as_attachment=True,
+            filename=f'{filename}.xlsx',
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+
+    if export_format != 'csv':
+        return JsonResponse({
+            'success': False,
+            'errors': ['Unsupported export format. Use csv or xlsx.']
+        }, status=400)
+
+    response = StreamingHttpResponse(
+        exports.iter_csv(exports.iter_schedule_rows(**filters)),
+        content_type='text/csv',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+    return response
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def import_schedules(request):
+    """
+    Bulk import schedules from a CSV/XLSX file.
+    Valid rows are created together; invalid or conflicting rows are reported per row.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Invalid request method']})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'errors': ['Please choose a CSV or XLSX file to import.']})
+
+    curriculum = None
+    curriculum_id = request.POST.get('curriculum')
+    if curriculum_id:
+        try:
+            curriculum = Curriculum.objects.get(id=curriculum_id)
+        except (Curriculum.DoesNotExist, ValueError):
+            return JsonResponse({'success': False, 'errors': ['Selected curriculum does not exist.']})
+
+    try:
+        rows = importers.read_rows(upload, upload.name)
+    except importers.ImportFileError as e:
+        return JsonResponse({'success': False, 'errors': [str(e)]})
+
+    if not rows:
+        return JsonResponse({'success': False, 'errors': ['The file does not contain any schedule rows.']})
+
+    dry_run = request.POST.get('dry_run', '').lower() == 'true'
+    with activity.summarized(request.user, 'add', 'schedule', '{count} schedules',
+                             f'Imported {{count}} schedules from {upload.name}') as summary:
+        result = importers.import_schedules(rows, curriculum=curriculum, dry_run=dry_run)
+        if not dry_run:
+            summary.count += result['created']
+        if result['errors']:
+            summary.message += f" ({len(result['errors'])} rows skipped)"
+
+    return JsonResponse({
+        'success': not result['errors'],
+        'created': result['created'],
+        'errors': result['errors'],
+        'message': f"{'Validated' if dry_run else 'Imported'} {result['created']} of {len(rows)} schedules"
+    })
+
 @login_required(login_url='admin_login')
 def admin_section_schedule_print(request, section_id):
     """
@@ -1672,23 +1722,15 @@ def delete_section_schedules(request, section_id):
     """Delete all schedules for a section"""
     if request.method == 'POST':
         section = get_object_or_404(Section, id=section_id)
-        schedules_qs = Schedule.objects.filter(section=section)
-        deleted_count = schedules_qs.count()
-
-        if deleted_count == 0:
-            return JsonResponse({'success': True, 'message': 'No schedules found for this section.'})
-
-        schedules_qs.delete()
-        section.status = 'incomplete'
-        section.save()
-
-        log_activity(
-            user=request.user,
-            action='delete',
-            entity_type='schedule',
-            entity_name=f'All schedules for {section.name}',
-            message=f'Deleted {deleted_count} schedules for section {section.name}'
-        )
+        with activity.summarized(request.user, 'delete', 'schedule', f'All schedules for {section.name}',
+                                 f'Deleted {{count}} schedules for section {section.name}') as summary:
+            _, deleted = Schedule.objects.filter(section=section).delete()
+            deleted_count = deleted.get(Schedule._meta.label, 0)
+            if deleted_count == 0:
+                return JsonResponse({'success': True, 'message': 'No schedules found for this section.'})
+            summary.count += deleted_count
+            section.status = 'incomplete'
+            section.save()
 
         return JsonResponse({'success': True, 'deleted_count': deleted_count})
     return JsonResponse({'success': False})
@@ -2112,40 +2154,18 @@ def staff_schedule_print(request):
 def section_view(request):
     """Section management page"""
     # Get all sections with their related curriculum
-    sections = Section.objects.select_related('curriculum').all().order_by('year_level', 'semester', 'name')
-    
-    # Calculate total units for each section
-    for section in sections:
-        unique_course_ids = section.schedules.values_list('course', flat=True).distinct()
-        total = Course.objects.filter(id__in=unique_course_ids).aggregate(
-            total=Sum('credit_units')
-        )['total'] or 0
-        section.calculated_total_units = total
-    
-    # Get all curricula for the add/edit section forms
-    curricula = Curriculum.objects.all().order_by('-year')
-    
-    # Get all courses for schedule creation
-    all_courses = Course.objects.all().order_by('course_code')
-    
-    # Get faculty and rooms for schedule modal
-    faculty_list = Faculty.objects.all().order_by('last_name', 'first_name')
-    room_list = Room.objects.all().order_by('campus', 'room_number')
-    
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
+    # and their total units (unique courses only)
+    sections = Section.objects.select_related('curriculum').annotate(
+        calculated_total_units=Section.total_units_annotation()
+    ).order_by('year_level', 'semester', 'name')
     
+    # Curricula for the add/edit section forms (cached, see reference.py);
+    # the template has no schedule modal, so no other lists are loaded
     context = {
         'user': request.user,
-        'faculty': current_faculty,
+        'faculty': reference.faculty_for_user(request.user),
         'sections': sections,
-        'curricula': curricula,
-        'all_courses': all_courses,
-        'faculty_list': faculty_list,
-        'room_list': room_list,
+        'curricula': reference.get_list('curricula'),
     }
     
     return render(request, 'hello/section.html', context)
@@ -2342,6 +2362,23 @@ def get_section_schedule(request, section_id):
             'course', 'faculty', 'room'
         ).order_by('day', 'start_time')
         
+        if compact.requested(request):
+            # Course details for the sidebar are in tables['courses']
+            payload = compact.encode_schedules(schedules)
+            payload.update({
+                'success': True,
+                'total_units': sum(payload['tables']['courses']['credit_units']),
+                'section_info': {
+                    'name': section.name,
+                    'year_level': section.year_level,
+                    'semester': section.semester,
+                    'curriculum': str(section.curriculum),
+                    'max_students': section.max_students
+                },
+                'calendar_url': calendar_feeds.feed_url(request, 'section', section.id),
+            })
+            return compact.render(request, payload)
+
         # Format schedule data
         schedule_data = []
         courses_map = {}
@@ -2359,7 +2396,7 @@ def get_section_schedule(request, section_id):
                 'course_color': schedule.course.color,
                 'faculty': f"{schedule.faculty.first_name} {schedule.faculty.last_name}" if schedule.faculty else 'TBA',
                 'room': schedule.room.name if schedule.room else 'TBA',
-                'section_name': schedule.section.name,
+                'section_name': section.name,
             }
             schedule_data.append(schedule_item)
             
@@ -2403,7 +2440,8 @@ def get_section_schedule(request, section_id):
                 'semester': section.semester,
                 'curriculum': str(section.curriculum),
                 'max_students': section.max_students
-            }
+            },
+            'calendar_url': calendar_feeds.feed_url(request, 'section', section.id),
         })
     except Exception as e:
         import traceback
@@ -2510,11 +2548,8 @@ def course_view(request):
         except Curriculum.DoesNotExist:
             selected_curriculum = None
 
-    # Try to get faculty profile for current user (may not exist for pure admin accounts)
-    try:
-        current_faculty = Faculty.objects.get(user=request.user)
-    except Faculty.DoesNotExist:
-        current_faculty = None
+    # Faculty profile for current user (may not exist for pure admin accounts)
+    current_faculty = reference.faculty_for_user(request.user)
 
     # Provide the context expected by the template
     context = {
@@ -2694,6 +2729,48 @@ def delete_course(request, course_id):
         return JsonResponse({'success': True})
     return JsonResponse({'success': False})
 
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def import_courses(request):
+    """Bulk import courses (and their curricula) from a CSV/XLSX file"""
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'errors': ['Invalid request method']})
+
+    upload = request.FILES.get('file')
+    if not upload:
+        return JsonResponse({'success': False, 'errors': ['Please choose a CSV or XLSX file to import.']})
+
+    curriculum = None
+    curriculum_id = request.POST.get('curriculum')
+    if curriculum_id:
+        try:
+            curriculum = Curriculum.objects.get(id=curriculum_id)
+        except (Curriculum.DoesNotExist, ValueError):
+            return JsonResponse({'success': False, 'errors': ['Selected curriculum does not exist.']})
+
+    try:
+        rows = importers.read_rows(upload, upload.name)
+    except importers.ImportFileError as e:
+        return JsonResponse({'success': False, 'errors': [str(e)]})
+
+    if not rows:
+        return JsonResponse({'success': False, 'errors': ['The file does not contain any course rows.']})
+
+    target = f' into {curriculum}' if curriculum else ''
+    with activity.summarized(request.user, 'add', 'course', '{count} courses',
+                             f'Imported {{count}} courses from {upload.name}{target}') as summary:
+        result = importers.import_courses(rows, curriculum=curriculum)
+        if result['errors']:
+            return JsonResponse({'success': False, 'errors': result['errors']})
+        summary.count += result['created']
+
+    return JsonResponse({
+        'success': True,
+        'created': result['created'],
+        'curricula_created': result['curricula_created'],
+        'message': f"Imported {result['created']} courses successfully"
+    })
+
 # ===== CURRICULUM VIEWS =====
 
 @login_required(login_url='admin_login')
@@ -2898,8 +2975,28 @@ def edit_schedule(request, schedule_id):
     })
 
 
+@csrf_exempt
 @login_required(login_url='admin_login')
 def save_account_settings(request):
+    """
+    Install the streaming profile picture handler before anything reads
+    request.POST (CSRF middleware included, hence csrf_exempt here), so an
+    oversized or non-image upload is rejected without reading the rest of
+    the body. CSRF is then enforced on the actual view.
+    """
+    if request.method == 'POST':
+        request.upload_handlers.insert(0, uploads.ProfilePictureUploadHandler(request))
+        request.FILES  # parse the body now
+        if request.upload_error:
+            return JsonResponse({
+                'success': False,
+                'errors': [request.upload_error]
+            }, status=400)
+    return _save_account_settings(request)
+
+
+@csrf_protect
+def _save_account_settings(request):
     """Handle account settings update for logged-in user (admin or faculty)"""
     print(f"DEBUG: save_account_settings called with method {request.method}")
     if request.method != 'POST':
@@ -3066,7 +3163,9 @@ def save_account_settings(request):
                 print(f"DEBUG: User {request.user.username} requested to delete profile picture")
                 if faculty.profile_picture:
                     faculty.profile_picture.delete(save=False)
+                    images.delete_variants(faculty.profile_picture_variants)
                     faculty.profile_picture = None
+                    faculty.profile_picture_variants = {}
                     faculty.save()
                     print(f"DEBUG: Profile picture deleted for {request.user.username}")
 
@@ -3080,20 +3179,32 @@ def save_account_settings(request):
                         'errors': ['Only PNG and JPEG images are allowed']
                     }, status=400)
                 
-                # Validate file size (15MB)
-                if profile_picture.size > 15 * 1024 * 1024:
+                # Validate file size (also enforced while streaming, see hello/uploads.py)
+                if profile_picture.size > settings.PROFILE_PICTURE_MAX_UPLOAD_SIZE:
                     return JsonResponse({
                         'success': False,
-                        'errors': ['File size must be under 15MB']
+                        'errors': [uploads.size_limit_message(settings.PROFILE_PICTURE_MAX_UPLOAD_SIZE)]
+                    }, status=400)
+
+                # Re-encode (strips EXIF/GPS metadata) before anything is stored
+                try:
+                    normalized_picture = images.normalize_upload(profile_picture)
+                except images.ImageProcessingError:
+                    return JsonResponse({
+                        'success': False,
+                        'errors': ['The uploaded file is not a valid image']
                     }, status=400)
                 
-                # Delete old profile picture if it exists
+                # Delete old profile picture and its thumbnails if they exist
                 if faculty.profile_picture:
-                    faculty.profile_picture.delete()
+                    faculty.profile_picture.delete(save=False)
+                images.delete_variants(faculty.profile_picture_variants)
                 
-                # Save new profile picture
-                faculty.profile_picture = profile_picture
+                # Save new profile picture; thumbnails are rendered in the background
+                faculty.profile_picture = normalized_picture
+                faculty.profile_picture_variants = {}
                 faculty.save()
+                images.schedule_variants(faculty.id)
 
         messages.success(request, 'Account settings saved successfully!')
 
@@ -3227,6 +3338,7 @@ def get_user_faculty_data(request):
             'email': faculty.email,
             'gender': faculty.gender or '',
             'profile_picture_url': profile_pic_url,
+            'profile_picture_variants': images.variant_urls(request, faculty.profile_picture_variants),
             'total_units': faculty.total_units,
         }, status=status.HTTP_200_OK)
 
@@ -3237,6 +3349,7 @@ def get_user_faculty_data(request):
             'email': request.user.email,
             'gender': '',
             'profile_picture_url': None,
+            'profile_picture_variants': None,
             'total_units': 0,
         }, status=status.HTTP_200_OK)
 
@@ -3289,15 +3402,9 @@ Best regards,
 ASSIST Administration Team'''
 
             try:
-                email_message = EmailMessage(
-                    subject=subject,
-                    body=message,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[email],
-                )
-                email_message.send(fail_silently=False)
+                enqueue_email(subject, message, [email])
             except Exception as e:
-                print(f"Error sending password reset email: {str(e)}")
+                print(f"Error queueing password reset email: {str(e)}")
                 return JsonResponse({'error': 'Failed to send email'}, status=500)
 
             return JsonResponse({'message': 'If an account with this email exists, a password reset link has been sent.'})
@@ -3380,23 +3487,27 @@ def get_available_resources(request):
         except (ValueError, TypeError):
             return Response({'error': 'Invalid day format'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Filter logic
-        all_faculty = Faculty.objects.all().order_by('last_name', 'first_name')
-        all_rooms = Room.objects.all().order_by('campus', 'room_number')
+        # Filter logic: exclude anyone/anything booked in an overlapping slot
+        # (one subquery each instead of an exists() query per faculty/room)
+        overlapping = Schedule.objects.filter(day=day_val, start_time__lt=end_time, end_time__gt=start_time)
+        all_faculty = Faculty.objects.exclude(
+            id__in=overlapping.filter(faculty__isnull=False).values('faculty_id')
+        ).order_by('last_name', 'first_name')
+        all_rooms = Room.objects.exclude(
+            id__in=overlapping.filter(room__isnull=False).values('room_id')
+        ).order_by('campus', 'room_number')
 
         available_faculty = []
         for f in all_faculty:
-            if not Schedule.objects.filter(faculty=f, day=day_val, start_time__lt=end_time, end_time__gt=start_time).exists():
-                available_faculty.append({'id': f.id, 'name': f"{f.last_name}, {f.first_name}", 'email': f.email})
+            available_faculty.append({'id': f.id, 'name': f"{f.last_name}, {f.first_name}", 'email': f.email})
 
         available_rooms = []
         for r in all_rooms:
-            if not Schedule.objects.filter(room=r, day=day_val, start_time__lt=end_time, end_time__gt=start_time).exists():
-                available_rooms.append({
-                    'id': r.id, 
-                    'name': f"{r.get_room_type_display()}: {'A' if r.campus == 'arlegui' else 'C'}-{r.room_number}",
-                    'capacity': r.capacity
-                })
+            available_rooms.append({
+                'id': r.id, 
+                'name': f"{r.get_room_type_display()}: {'A' if r.campus == 'arlegui' else 'C'}-{r.room_number}",
+                'capacity': r.capacity
+            })
 
         return Response({
             'success': True,
@@ -3423,59 +3534,154 @@ def get_curriculums(request):
     data = [{"id": c.id, "name": c.name, "year": c.year} for c in curriculums]
     return Response(data)
 
+def _int_param(params, name):
+    """Integer query parameter, or None when missing/invalid"""
+    try:
+        return int(params.get(name))
+    except (TypeError, ValueError):
+        return None
+
+def _list_response(request, queryset, field_map, ordering, transform=None, always_paginate=False,
+                   default_fields=None):
+    """
+    Shared list API response: ?fields= projection with values() and opt-in
+    keyset pagination (?limit=&cursor=). Without limit/cursor the plain list
+    is returned as before, unless always_paginate is set.
+    """
+    try:
+        rows, next_cursor, paginated = pagination.list_rows(
+            request.query_params, queryset, field_map, ordering, transform, always_paginate, default_fields
+        )
+    except pagination.ListQueryError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if paginated:
+        return Response({'results': rows, 'next_cursor': next_cursor})
+    return Response(rows)
+
+SECTION_LIST_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'year_level': 'year_level',
+    'semester': 'semester',
+    'status': 'status',
+    'curriculum': 'curriculum_id',
+    # Opt-in (?fields=): a join and a subquery per row
+    'curriculum_name': 'curriculum__name',
+    'curriculum_year': 'curriculum__year',
+    'total_units': 'calculated_total_units',
+}
+SECTION_LIST_DEFAULT_FIELDS = ('id', 'name', 'year_level', 'semester', 'status', 'curriculum')
+SECTION_LIST_ORDERING = ('year_level', 'semester', 'name', 'id')
+
+def _filtered_sections(params):
+    """Sections matching ?q= (name prefix), curriculum, year, semester and status"""
+    sections = Section.objects.annotate(calculated_total_units=Section.total_units_annotation())
+    if _int_param(params, 'curriculum') is not None:
+        sections = sections.filter(curriculum_id=_int_param(params, 'curriculum'))
+    if _int_param(params, 'year') is not None:
+        sections = sections.filter(year_level=_int_param(params, 'year'))
+    if _int_param(params, 'semester') is not None:
+        sections = sections.filter(semester=_int_param(params, 'semester'))
+    if params.get('status'):
+        sections = sections.filter(status=params.get('status'))
+    query = (params.get('q') or '').strip()
+    if query:
+        sections = sections.filter(name__istartswith=query)
+    return sections
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_sections(request):
-    sections = Section.objects.all()
-    data = [{
-        "id": s.id, 
-        "name": s.name, 
-        "year_level": s.year_level, 
-        "semester": s.semester, 
-        "status": s.status,
-        "curriculum": s.curriculum.id
-    } for s in sections]
-    return Response(data)
+    return _list_response(
+        request, _filtered_sections(request.query_params), SECTION_LIST_FIELDS, SECTION_LIST_ORDERING,
+        default_fields=SECTION_LIST_DEFAULT_FIELDS,
+    )
+
+ROOM_LIST_FIELDS = {
+    'id': 'id',
+    'name': 'name',
+    'room_number': 'room_number',
+    'capacity': 'capacity',
+    'campus': 'campus',
+    'room_type': 'room_type',
+}
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_rooms(request):
-    rooms = Room.objects.all().order_by('campus', 'room_number')
-    data = [{
-        "id": r.id,
-        "name": r.name,
-        "room_number": r.room_number,
-        "capacity": r.capacity,
-        "campus": r.campus,
-        "room_type": r.room_type,
-    } for r in rooms]
-    return Response(data)
+    params = request.query_params
+    rooms = Room.objects.all()
+    if params.get('campus'):
+        rooms = rooms.filter(campus=params.get('campus'))
+    if params.get('room_type'):
+        rooms = rooms.filter(room_type=params.get('room_type'))
+    return _list_response(request, rooms, ROOM_LIST_FIELDS, ('campus', 'room_number', 'id'))
+
+FACULTY_LIST_FIELDS = {
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'gender': 'gender',
+    'employment_status': 'employment_status',
+    'department': 'department',
+    'profile_picture_url': 'profile_picture',
+    'profile_picture_variants': 'profile_picture_variants',
+    'highest_degree': 'highest_degree',
+    'prc_licensed': 'prc_licensed',
+    'total_units': 'units_total',
+}
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_faculty_list(request):
-    faculty = Faculty.objects.all().order_by('last_name', 'first_name')
-    data = []
-    for f in faculty:
+    params = request.query_params
+    faculty = Faculty.objects.all()
+    if params.get('employment_status'):
+        faculty = faculty.filter(employment_status=params.get('employment_status'))
+
+    fields = [f.strip() for f in params.get('fields', '').split(',') if f.strip()]
+    if not fields or 'total_units' in fields:
+        # One correlated subquery instead of a total_units query per faculty
+        faculty = faculty.annotate(units_total=Faculty.total_units_annotation())
+
+    def transform(row):
         # Build full URL for profile picture if it exists
-        profile_pic_url = None
-        if f.profile_picture:
-            profile_pic_url = request.build_absolute_uri(f.profile_picture.url)
-        
-        data.append({
-            "id": f.id,
-            "first_name": f.first_name,
-            "last_name": f.last_name,
-            "email": f.email,
-            "gender": f.gender,
-            "employment_status": f.employment_status,
-            "department": f.department,
-            "profile_picture_url": profile_pic_url,
-            "highest_degree": f.highest_degree,
-            "prc_licensed": f.prc_licensed,
-            "total_units": f.total_units,
-        })
-    return Response(data)
+        if 'profile_picture_url' in row:
+            path = row['profile_picture_url']
+            row['profile_picture_url'] = request.build_absolute_uri(default_storage.url(path)) if path else None
+        if 'profile_picture_variants' in row:
+            row['profile_picture_variants'] = images.variant_urls(request, row['profile_picture_variants'])
+
+    return _list_response(request, faculty, FACULTY_LIST_FIELDS, ('last_name', 'first_name', 'id'), transform)
+
+ACTIVITY_LIST_FIELDS = {
+    'id': 'id',
+    'timestamp': 'timestamp',
+    'user': 'user_id',
+    'username': 'user__username',
+    'action': 'action',
+    'entity_type': 'entity_type',
+    'entity_name': 'entity_name',
+    'message': 'message',
+}
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_activity_history(request):
+    """
+    Activity history for admins, newest first and always paginated:
+    ?user=&entity_type=&action=&from=&to=&q= plus ?limit=&cursor=.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Admin access required'}, status=status.HTTP_403_FORBIDDEN)
+    try:
+        activities = activity.filter_activities(request.query_params)
+    except pagination.ListQueryError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return _list_response(
+        request, activities, ACTIVITY_LIST_FIELDS, ('-timestamp', '-id'), always_paginate=True
+    )
 
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
@@ -3518,25 +3724,37 @@ def get_courses(request):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
-    # GET request handling (existing logic)
-    # Get filters from URL (e.g. ?curriculum=1)
-    curr_id = request.query_params.get('curriculum')
+    # GET request handling
+    # Get filters from URL (e.g. ?curriculum=1&year=2&semester=1)
+    params = request.query_params
     courses = Course.objects.all()
-    if curr_id:
-        courses = courses.filter(curriculum_id=curr_id)
-        
-    data = [{
-        "id": c.id,
-        "course_code": c.course_code,
-        "descriptive_title": c.descriptive_title,
-        "lecture_hours": c.lecture_hours,
-        "laboratory_hours": c.laboratory_hours,
-        "credit_units": c.credit_units,
-        "year_level": c.year_level,
-        "semester": c.semester,
-        "color": c.color or "#000000"
-    } for c in courses]
-    return Response(data)
+    if _int_param(params, 'curriculum') is not None:
+        courses = courses.filter(curriculum_id=_int_param(params, 'curriculum'))
+    if _int_param(params, 'year') is not None:
+        courses = courses.filter(year_level=_int_param(params, 'year'))
+    if _int_param(params, 'semester') is not None:
+        courses = courses.filter(semester=_int_param(params, 'semester'))
+
+    def transform(row):
+        if 'color' in row:
+            row['color'] = row['color'] or "#000000"
+
+    return _list_response(
+        request, courses, COURSE_LIST_FIELDS, ('year_level', 'semester', 'course_code', 'id'), transform
+    )
+
+COURSE_LIST_FIELDS = {
+    'id': 'id',
+    'course_code': 'course_code',
+    'descriptive_title': 'descriptive_title',
+    'lecture_hours': 'lecture_hours',
+    'laboratory_hours': 'laboratory_hours',
+    'credit_units': 'credit_units',
+    'year_level': 'year_level',
+    'semester': 'semester',
+    'color': 'color',
+    'curriculum': 'curriculum_id',
+}
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
@@ -3659,6 +3877,7 @@ def api_add_course(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@renderer_classes(compact.SCHEDULE_RENDERERS)
 @permission_classes([IsAuthenticated])
 def api_faculty_schedule(request, faculty_id):
     """API endpoint to get schedule data for a specific faculty member"""
@@ -3670,6 +3889,14 @@ def api_faculty_schedule(request, faculty_id):
             'course', 'section', 'room'
         ).order_by('day', 'start_time')
         
+        if compact.requested(request):
+            payload = compact.encode_schedules(schedules)
+            payload.update({
+                'specializations': list(faculty.specialization.values('course_code', 'descriptive_title', 'color')),
+                'total_units': faculty.total_units,
+            })
+            return compact.render(request, payload)
+
         # Format schedule data
         schedule_data = []
         for schedule in schedules:
@@ -3707,6 +3934,7 @@ def api_faculty_schedule(request, faculty_id):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
+@renderer_classes(compact.SCHEDULE_RENDERERS)
 @permission_classes([IsAuthenticated])
 def api_my_schedule(request):
     """API endpoint to get the logged-in user's own schedule"""
@@ -3719,6 +3947,16 @@ def api_my_schedule(request):
             'course', 'section', 'room'
         ).order_by('day', 'start_time')
         
+        if compact.requested(request):
+            payload = compact.encode_schedules(schedules)
+            payload.update({
+                'faculty_id': faculty.id,
+                'specializations': list(faculty.specialization.values('course_code', 'descriptive_title', 'color')),
+                'total_units': faculty.total_units,
+                'calendar_url': calendar_feeds.feed_url(request, 'faculty', faculty.id),
+            })
+            return compact.render(request, payload)
+
         # Format schedule data
         schedule_data = []
         for schedule in schedules:
@@ -3748,7 +3986,8 @@ def api_my_schedule(request):
             'faculty_id': faculty.id,
             'schedules': schedule_data,
             'specializations': specializations,
-            'total_units': faculty.total_units
+            'total_units': faculty.total_units,
+            'calendar_url': calendar_feeds.feed_url(request, 'faculty', faculty.id),
         }, status=status.HTTP_200_OK)
         
     except Faculty.DoesNotExist:
@@ -3756,7 +3995,212 @@ def api_my_schedule(request):
             'faculty_id': None,
             'schedules': [],
             'specializations': [],
-            'total_units': 0
+            'total_units': 0,
+            'calendar_url': None,
         }, status=status.HTTP_200_OK)
     except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_bootstrap(request):
+    """
+    Everything the mobile app needs on login in one response: profile,
+    own schedule, specializations, unit totals, stats and curricula.
+    Cached per user under the all-schedules tag; answers 304 to a matching ETag.
+    """
+    cache_key = bootstrap.cache_key(request)
+    etag = calendar_feeds.feed_etag(cache_key)
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    payload = caching.get_or_build(
+        'bootstrap', cache_key, lambda: bootstrap.build_payload(request), settings.BOOTSTRAP_CACHE_SECONDS
+    )
+
+    response = Response(payload)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_reference(request):
+    """
+    Dropdown lists for the schedule, section and faculty modals in one
+    cached response: ?lists=courses,rooms picks lists (default: all of
+    reference.LISTS). Staff only; answers 304 to a matching ETag.
+    """
+    if not (request.user.is_staff or request.user.is_superuser):
+        return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    requested = [name.strip() for name in request.query_params.get('lists', '').split(',') if name.strip()]
+    unknown = [name for name in requested if name not in reference.LISTS]
+    if unknown:
+        return Response({'error': f"Unknown list(s): {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+    names = sorted(set(requested)) if requested else sorted(reference.LISTS)
+
+    cache_key = reference.payload_key(names)
+    etag = calendar_feeds.feed_etag(cache_key)
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    response = Response(reference.payload(names, cache_key))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+# ===== SYNC / LIVE FEED =====
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_sync(request):
+    """
+    Delta sync for the mobile app: rows created/updated and ids deleted
+    since ?since=<token> (everything when omitted), plus the next token.
+    """
+    since = None
+    token = request.query_params.get('since')
+    if token:
+        try:
+            since = sync.parse_token(token)
+        except sync.SyncTokenError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(sync.changes_since(since))
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def api_live_changes(request):
+    """
+    Schedule change events after ?after=<event id> (see hello/live.py), for
+    pages without a live stream. Without ?after= only the latest id is
+    returned, to start polling from.
+    """
+    after = live.parse_last_id(request.query_params.get('after'))
+    if after is None:
+        events, last_id = [], live.latest_id()
+    else:
+        events, last_id = live.changes_after(after)
+    return Response({
+        'events': events,
+        'last_id': last_id,
+        'more': len(events) == live.BATCH_SIZE,
+        'poll_seconds': settings.LIVE_CLIENT_POLL_SECONDS,
+    })
+
+async def live_stream(request):
+    """
+    Server-Sent Events feed of schedule changes. Only streamed under ASGI;
+    a WSGI worker answers 204 so the browser stops reconnecting and polls
+    api_live_changes instead.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    last_id = live.parse_last_id(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+    if last_id is None:
+        last_id = await sync_to_async(live.latest_id)()
+    response = StreamingHttpResponse(live.stream(last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+# ===== CALENDAR FEEDS =====
+
+def calendar_feed(request, token):
+    """
+    iCalendar feed for a faculty, room or section (tokenized, no login).
+    Served from the cache under the object's tag, so calendar clients
+    polling the feed do not hit the database.
+    """
+    parsed = calendar_feeds.parse_feed_token(token)
+    if parsed is None:
+        raise Http404('Invalid calendar link')
+    kind, obj_id = parsed
+
+    term_start, term_end = calendar_feeds.term_range()
+    cache_key = calendar_feeds.feed_cache_key(kind, obj_id, term_start, term_end)
+    etag = calendar_feeds.feed_etag(cache_key)
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    # Deleted objects are cached too ('' sentinel) so polls stay off the DB
+    body = caching.get_or_build(
+        'calendar_feed', cache_key,
+        lambda: calendar_feeds.build_feed(kind, obj_id, term_start, term_end) or '',
+        settings.CALENDAR_FEED_CACHE_SECONDS,
+    )
+    if not body:
+        raise Http404('Calendar not found')
+
+    response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=3600'
+    response['Content-Disposition'] = f'inline; filename="{kind}-{obj_id}.ics"'
+    return response
+
+# ===== PERFORMANCE METRICS =====
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def perf_dashboard(request):
+    """Per-view latency and query stats collected by perf.PerfMiddleware plus
+    cache hit rates (POST resets both)"""
+    if request.method == 'POST':
+        perf.reset()
+        caching.reset_stats()
+        return redirect('perf_dashboard')
+    return render(request, 'hello/perf.html', {'stats': perf.snapshot(), 'cache_stats': caching.stats()})
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def perf_json(request):
+    """Same stats as /admin/perf/ as JSON"""
+    return JsonResponse(perf.snapshot())
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def cache_stats(request):
+    """Cache hit rates and tag invalidations (caching.stats) as JSON"""
+    return JsonResponse(caching.stats())
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def profile_list(request):
+    """Saved request profiles (see profiling.ProfileMiddleware), newest first"""
+    return JsonResponse({'profiles': profiling.saved_reports()})
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def profile_report(request, profile_id):
+    """Top functions and spans of one saved profile"""
+    report = profiling.load_report(profile_id)
+    if report is None:
+        raise Http404('Profile not found')
+    return JsonResponse(report)
+
+@login_required(login_url='admin_login')
+@user_passes_test(is_admin, login_url='admin_login')
+def profile_download(request, profile_id):
+    """The raw cProfile dump, for pstats or snakeviz"""
+    try:
+        fh = open(profiling.prof_path(profile_id), 'rb')
+    except OSError:
+        raise Http404('Profile not found')
+    return FileResponse(fh, as_attachment=True, filename=f'{profile_id}.prof')